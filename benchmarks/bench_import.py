@@ -0,0 +1,67 @@
+"""
+Measures the time taken to import the wrappers package in a fresh
+interpreter, alone and followed by the first fit of a model or t-test,
+against importing NumPy alone (the floor) and NumPy along with the SciPy
+submodules that the wrappers used to import eagerly.
+
+Usage: python benchmarks/bench_import.py [repeat]
+
+"""
+
+from __future__ import division, print_function
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CASES = [
+    ("numpy", "import numpy"),
+    ("numpy + scipy (eager)",
+     "import numpy, scipy.linalg, scipy.special, scipy.sparse.csgraph, "
+     "scipy.stats"),
+    ("import wrappers", "import wrappers"),
+    ("wrappers.ttest_1samp", "from wrappers import ttest_1samp"),
+    ("first ols fit",
+     "import numpy as np; from wrappers import ols; "
+     "ols(np.random.rand(100, 3), np.random.rand(100))"),
+    ("first ttest_1samp",
+     "import numpy as np; from wrappers import ttest_1samp; "
+     "ttest_1samp(np.random.rand(100), 0.5)"),
+]
+
+TEMPLATE = ("import time; start = time.perf_counter(); {0}; "
+            "print(time.perf_counter() - start)")
+
+
+def measure(statement, repeat):
+    """
+
+    Returns the median time (in seconds) taken by `statement` over `repeat`
+    fresh interpreters.
+
+    """
+
+    times = []
+
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", TEMPLATE.format(statement)], cwd=rootDir)
+        times.append(float(output))
+
+    return np.median(times)
+
+
+def run(repeat=10):
+    print("%-28s %12s" % ("case", "time"))
+
+    for name, statement in CASES:
+        print("%-28s %10.1fms" % (name, measure(statement, repeat) * 1e3))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
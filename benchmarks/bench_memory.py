@@ -0,0 +1,78 @@
+"""
+Measures the memory held per result object when many results are kept
+around for reporting, with and without the observations being kept.
+
+Usage: python benchmarks/bench_memory.py [nresults] [nobs] [ncols]
+
+"""
+
+from __future__ import division, print_function
+
+import os
+import sys
+import tracemalloc
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.ols import ols
+from wrappers.ttest import ttest_1samp, ttest_2samp
+
+import numpy as np
+
+
+def measure(make, count):
+    """
+
+    Returns the average number of bytes still allocated per result after
+    creating `count` results with `make` and keeping all of them.
+
+    """
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    results = [make(i) for i in range(count)]
+    held = tracemalloc.get_traced_memory()[0] - start
+
+    tracemalloc.stop()
+    del results
+
+    return held / count
+
+
+def run(count, n, p):
+    rng = np.random.RandomState(1234567890)
+
+    # The inputs are generated for each result so that the memory
+    # of any input kept alive by a result is attributed to it.
+    def x(i):
+        return rng.rand(n, p)
+
+    def a(i):
+        return rng.rand(n)
+
+    cases = [
+        ("ols", lambda i: ols(x(i), a(i))),
+        ("ols (keep_data=False)", lambda i: ols(x(i), a(i), keep_data=False)),
+        ("ttest_1samp", lambda i: ttest_1samp(a(i), 0.5)),
+        ("ttest_1samp (keep_data=False)",
+         lambda i: ttest_1samp(a(i), 0.5, keep_data=False)),
+        ("ttest_2samp", lambda i: ttest_2samp(a(i), a(i))),
+        ("ttest_2samp (keep_data=False)",
+         lambda i: ttest_2samp(a(i), a(i), keep_data=False)),
+    ]
+
+    print("nresults = %d, nobs = %d, ncols = %d" % (count, n, p))
+    print("%-32s %16s" % ("result", "bytes / result"))
+
+    for name, make in cases:
+        print("%-32s %16.0f" % (name, measure(make, count)))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    p = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    run(count, n, p)
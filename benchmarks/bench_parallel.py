@@ -0,0 +1,59 @@
+"""
+Measures how the sharded OLS fit scales with the number of worker
+processes, compared against a single-process fit of the same data.
+
+Usage: python benchmarks/bench_parallel.py [nobs] [ncols] [max_workers]
+
+"""
+
+from __future__ import division, print_function
+
+import os
+import sys
+import timeit
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from concurrent.futures import ProcessPoolExecutor
+
+from wrappers.ols import ols
+from wrappers.parallel import ols_sharded
+
+import numpy as np
+
+
+def run(n, p, max_workers, repeat=3):
+    rng = np.random.RandomState(1234567890)
+
+    x = rng.rand(n, p)
+    y = rng.rand(n)
+
+    def time(func):
+        return min(timeit.repeat(func, number=1, repeat=repeat))
+
+    baseline = time(lambda: ols(x, y, method='cholesky').dw())
+
+    print("nobs = %d, ncols = %d" % (n, p))
+    print("%-10s %12s %10s" % ("workers", "seconds", "speedup"))
+    print("%-10s %12.6f %10.2f" % ("serial", baseline, 1.0))
+
+    workers = 1
+
+    while workers <= max_workers:
+        # The pool is created up front so that only the fit is timed.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            elapsed = time(lambda: ols_sharded(x, y, method='cholesky',
+                                               shards=workers,
+                                               executor=executor).dw())
+
+        print("%-10d %12.6f %10.2f" % (workers, elapsed, baseline / elapsed))
+        workers *= 2
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    p = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+    run(n, p, max_workers)
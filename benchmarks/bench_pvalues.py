@@ -0,0 +1,62 @@
+"""
+Compares the time per call of the p-value functions against the
+scipy.stats distribution methods that were used before, for a scalar
+statistic (as in a single t-test) and for an array of statistics (as in
+the coefficients of a model), with and without the cache.
+
+Usage: python benchmarks/bench_pvalues.py [number]
+
+"""
+
+from __future__ import division, print_function
+
+import os
+import sys
+import timeit
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.pvalues import chi2_sf, f_sf, set_cache, t_two_sided
+
+import numpy as np
+from scipy import stats
+
+
+def run(number=20000):
+    t = np.linspace(-4, 4, 20)
+
+    cases = [
+        ("t, scalar", lambda: (1 - stats.t.cdf(abs(1.5), 28)) * 2,
+         lambda: t_two_sided(1.5, 28)),
+        ("t, array", lambda: (1 - stats.t.cdf(abs(t), 28)) * 2,
+         lambda: t_two_sided(t, 28)),
+        ("F, scalar", lambda: 1 - stats.f.cdf(3.2, 4, 28),
+         lambda: f_sf(3.2, 4, 28)),
+        ("chi2, scalar", lambda: stats.chi2.sf(5.1, 2),
+         lambda: chi2_sf(5.1, 2)),
+    ]
+
+    def time(func):
+        return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+    print("%-14s %14s %14s %14s %10s" % ("case", "scipy.stats", "special",
+                                         "cached", "speedup"))
+
+    for name, old, new in cases:
+        baseline = time(old)
+
+        set_cache(None)
+        direct = time(new)
+
+        set_cache(1024)
+        cached = time(new)
+        set_cache(None)
+
+        print("%-14s %12.2fus %12.2fus %12.2fus %10.1f" % (
+            name, baseline * 1e6, direct * 1e6, cached * 1e6,
+            baseline / min(direct, cached)))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
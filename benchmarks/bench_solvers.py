@@ -0,0 +1,92 @@
+"""
+Compares the wall-clock time and approximate floating point operation
+counts of the OLS solvers against the original explicit inverse path.
+
+Usage: python benchmarks/bench_solvers.py [nobs] [ncols]
+
+"""
+
+from __future__ import division, print_function
+
+import os
+import sys
+import timeit
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.solvers import SOLVERS, std_errors
+
+import numpy as np
+from scipy.linalg import inv
+
+
+def legacy(x, y):
+    """
+
+    The estimation path used by the OLS wrapper before the solver layer
+    was introduced: explicitly invert dot(x.T, x) and multiply.
+
+    """
+
+    inv_xx = inv(np.dot(x.T, x))
+    b = np.dot(inv_xx, np.dot(x.T, y))
+    se = np.sqrt(np.diagonal(inv_xx))
+
+    return b, se
+
+
+def flops(method, n, p):
+    """
+
+    Returns the leading-order floating point operation count of the
+    coefficient and standard error computation for `method`.
+
+    """
+
+    counts = {
+        'legacy': n * p ** 2 + 2 * p ** 3,
+        'normal': n * p ** 2 + 2 * p ** 3 + p ** 3 / 3,
+        'cholesky': n * p ** 2 + p ** 3 / 3 + p ** 3 / 3,
+        'qr': 2 * n * p ** 2 - 2 * p ** 3 / 3 + 4 * n * p + p ** 3 / 3,
+        'svd': 4 * n * p ** 2 + 22 * p ** 3,
+    }
+
+    return counts[method]
+
+
+def run(n, p, repeat=3):
+    rng = np.random.RandomState(1234567890)
+
+    x = np.column_stack((np.ones(n), rng.rand(n, p - 1)))
+    y = rng.rand(n)
+
+    def time(func):
+        return min(timeit.repeat(lambda: func(x, y), number=1, repeat=repeat))
+
+    def solve(solver):
+        def inner(x, y):
+            b, r_inv = solver(x, y)
+            return b, std_errors(r_inv, 1.0)
+
+        return inner
+
+    baseline = time(legacy)
+
+    print("nobs = %d, ncols = %d" % (n, p))
+    print("%-10s %12s %10s %14s" % ("method", "seconds", "speedup", "GFLOP"))
+    print("%-10s %12.6f %10.2f %14.3f" % ("legacy", baseline, 1.0,
+                                          flops('legacy', n, p) / 1e9))
+
+    for method in ('normal', 'cholesky', 'qr', 'svd'):
+        elapsed = time(solve(SOLVERS[method]))
+        print("%-10s %12.6f %10.2f %14.3f" % (method, elapsed,
+                                              baseline / elapsed,
+                                              flops(method, n, p) / 1e9))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    p = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    run(n, p)
@@ -0,0 +1,277 @@
+"""
+Benchmark suite for the OLS and t-test wrappers, which times the fit of
+`ols`, its `summary`, `to_file`, and diagnostic methods, and the single and
+batch t-tests over a grid of numbers of observations, columns, and t-tests
+per batch, and records the peak memory allocated by each case.
+
+The results can be saved as a baseline and later compared against, so that
+a branch can be checked for regressions against master:
+
+    git checkout master
+    python benchmarks/bench_suite.py --save baseline.json
+    git checkout my-branch
+    python benchmarks/bench_suite.py --compare baseline.json
+
+The comparison exits with a status of 1 if any case is slower than its
+baseline by more than `--threshold`. Baselines are specific to the machine
+on which they are recorded, so both runs should be on the same machine.
+The baseline of the quick grid at the latest benchmarked commit is kept in
+benchmarks/baselines/quick.json (along with the machine, Python, and NumPy
+versions it was recorded with) as a reference, and it should be re-recorded
+with `--save` whenever a change is expected to move the timings:
+
+    python benchmarks/bench_suite.py --compare benchmarks/baselines/quick.json
+
+Usage: python benchmarks/bench_suite.py [--grid quick|full] [--filter name]
+                                        [--save file] [--compare file]
+                                        [--threshold ratio]
+
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from contextlib import redirect_stdout
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.ols import ols
+from wrappers.ttest import ttest_1samp, ttest_2samp, ttest_1samp_batch, \
+    ttest_2samp_batch
+
+import numpy as np
+
+
+# The numbers of observations, of columns of the design matrix, and of
+# t-tests per batch of each grid. The full grid takes a while and several
+# GB of memory.
+GRIDS = {
+    'quick': {'nobs': (10, 1000, 100000), 'ncols': (1, 10, 100),
+              'batch': (10, 1000)},
+    'full': {'nobs': (10, 1000, 100000, 10 ** 7), 'ncols': (1, 10, 100, 500),
+             'batch': (10, 1000, 100000)},
+}
+
+# Cases whose inputs would have more elements than this are skipped.
+MAX_ELEMENTS = 10 ** 8
+
+
+def cases(grid, tmpdir):
+    """
+
+    Yields the name of each case in `grid` along with a function that
+    generates its inputs and returns the callable that is benchmarked.
+
+    """
+
+    rng = np.random.RandomState(1234567890)
+    filename = os.path.join(tmpdir, 'result.json')
+
+    for n in grid['nobs']:
+        for p in grid['ncols']:
+            if p >= n or n * p > MAX_ELEMENTS:
+                continue
+
+            def fitted(n=n, p=p):
+                return ols(rng.rand(n, p), rng.rand(n))
+
+            def fit(n=n, p=p):
+                x, y = rng.rand(n, p), rng.rand(n)
+                return lambda: ols(x, y)
+
+            def summary(fitted=fitted):
+                reg = fitted()
+
+                def call():
+                    with redirect_stdout(io.StringIO()):
+                        reg.summary()
+
+                return call
+
+            def to_file(fitted=fitted):
+                reg = fitted()
+                return lambda: reg.to_file(filename)
+
+            def diagnostics(fitted=fitted):
+                reg = fitted()
+
+                # The moments of the residuals are cached by the first
+                # call, so they are cleared to be computed on every call.
+                def call():
+                    reg._moments = None
+                    return reg.dw(), reg.omni(), reg.JB(), reg.ll()
+
+                return call
+
+            label = "[nobs=%d,ncols=%d]" % (n, p)
+
+            yield "ols" + label, fit
+            yield "ols.summary" + label, summary
+            yield "ols.to_file" + label, to_file
+            yield "ols.diagnostics" + label, diagnostics
+
+    for n in grid['nobs']:
+        if n < 2:
+            continue
+
+        def single_1samp(n=n):
+            a = rng.rand(n)
+            return lambda: ttest_1samp(a, 0.5)
+
+        def single_2samp(n=n):
+            a, b = rng.rand(n), rng.rand(n)
+            return lambda: ttest_2samp(a, b)
+
+        label = "[nobs=%d]" % n
+
+        yield "ttest_1samp" + label, single_1samp
+        yield "ttest_2samp" + label, single_2samp
+
+        for k in grid['batch']:
+            if 2 * n * k > MAX_ELEMENTS:
+                continue
+
+            def batch_1samp(n=n, k=k):
+                a = rng.rand(k, n)
+                return lambda: ttest_1samp_batch(a, 0.5)
+
+            def batch_2samp(n=n, k=k):
+                a, b = rng.rand(k, n), rng.rand(k, n)
+                return lambda: ttest_2samp_batch(a, b)
+
+            label = "[nobs=%d,batch=%d]" % (n, k)
+
+            yield "ttest_1samp_batch" + label, batch_1samp
+            yield "ttest_2samp_batch" + label, batch_2samp
+
+
+def measure(setup):
+    """
+
+    Returns the best time per call (in seconds) of the callable returned by
+    `setup`, over three repeats of as many calls as take at least 0.2s, and
+    the peak memory (in bytes) allocated during one call, not counting the
+    inputs.
+
+    """
+
+    call = setup()
+
+    timer = timeit.Timer(call)
+    number = timer.autorange()[0]
+    best = min(timer.repeat(repeat=3, number=number)) / number
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    call()
+    peak = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+
+    return best, peak
+
+
+def run(grid='quick', pattern=None):
+    """
+
+    Runs the cases of `grid` whose names contain `pattern` and returns the
+    results keyed by the name of each case, printing them as they come in.
+
+    """
+
+    tmpdir = tempfile.mkdtemp()
+    results = {}
+
+    print("%-44s %14s %14s" % ("case", "time", "peak memory"))
+
+    try:
+        for name, setup in cases(GRIDS[grid], tmpdir):
+            if pattern and pattern not in name:
+                continue
+
+            best, peak = measure(setup)
+            results[name] = {'time': best, 'peak': peak}
+
+            print("%-44s %12.3fms %12.1fMB" % (name, best * 1e3, peak / 2 ** 20))
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+
+    Prints the ratio of the time and peak memory of each case to those of
+    its baseline, and returns the names of the cases whose time ratio exceeds
+    `threshold`.
+
+    """
+
+    regressions = []
+
+    print("\n%-44s %10s %10s" % ("case", "time", "memory"))
+
+    for name in sorted(results):
+        if name not in baseline:
+            print("%-44s %10s %10s" % (name, "new", "new"))
+            continue
+
+        time = results[name]['time'] / baseline[name]['time']
+        peak = (results[name]['peak'] + 1) / (baseline[name]['peak'] + 1)
+
+        flag = ""
+
+        if time > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        print("%-44s %9.2fx %9.2fx%s" % (name, time, peak, flag))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--grid', choices=sorted(GRIDS), default='quick')
+    parser.add_argument('--filter', default=None,
+                        help="only run the cases whose names contain this")
+    parser.add_argument('--save', default=None,
+                        help="save the results as a baseline in this file")
+    parser.add_argument('--compare', default=None,
+                        help="compare the results to the baseline in this file")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="the time ratio above which a case regressed")
+
+    args = parser.parse_args(argv)
+    results = run(args.grid, args.filter)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'machine': platform.platform(),
+                       'python': platform.python_version(),
+                       'numpy': np.__version__,
+                       'results': results}, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
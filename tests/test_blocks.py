@@ -0,0 +1,85 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers import blocks
+from wrappers.blocks import block_bounds
+from wrappers.ols import ols
+from wrappers.ttest import ttest_1samp, ttest_2samp
+
+import numpy as np
+
+
+class TestBlocks(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.block_bytes = blocks.BLOCK_BYTES
+
+        seed = 1234567890
+        np.random.seed(seed)
+
+        self.x = np.random.rand(103, 3)
+        self.y = np.random.rand(103)
+
+        for name in ('x', 'y'):
+            np.save(self.path(name), getattr(self, name))
+
+    def tearDown(self):
+        blocks.BLOCK_BYTES = self.block_bytes
+        shutil.rmtree(self.tmpdir)
+
+    def path(self, name):
+        return os.path.join(self.tmpdir, name + '.npy')
+
+    def test_block_bounds(self):
+        self.assertEqual(block_bounds(10, 8, 4), [(0, 4), (4, 8), (8, 10)])
+        self.assertEqual(block_bounds(10, 40), [(0, 10)])
+
+    def test_ols(self):
+        expected = ols(self.x, self.y)
+
+        x = np.load(self.path('x'), mmap_mode='r')
+        y = np.load(self.path('y'), mmap_mode='r')
+
+        for reg in (ols(x, y, block_size=10),
+                    ols(self.path('x'), self.path('y'), block_size=7)):
+            self.assertIsNone(reg.x)
+            self.assertEqual(reg.nobs, 103)
+
+            for attr in ('b', 'se', 't', 'p', 'R2', 'R2adj', 'F', 'Fpv'):
+                self.assertTrue(np.allclose(getattr(reg, attr),
+                                            getattr(expected, attr)))
+
+            self.assertTrue(np.allclose(reg.dw(), expected.dw()))
+            self.assertTrue(np.allclose(reg.JB(), expected.JB()))
+            self.assertTrue(np.allclose(reg.omni(), expected.omni()))
+            self.assertEqual(reg.unavailable_stats(), [])
+
+    def test_ttests(self):
+        blocks.BLOCK_BYTES = 80
+
+        a, b = self.x[:, 0], self.y
+        np.save(self.path('a'), a)
+
+        mapped = ttest_1samp(self.path('a'), 0.4)
+        expected = ttest_1samp(a, 0.4)
+
+        self.assertEqual(mapped.size, 103)
+        self.assertAlmostEqual(mapped.t_stat, expected.t_stat)
+        self.assertAlmostEqual(mapped.p_val, expected.p_val)
+
+        for test_type in ('ind', 'rel'):
+            mapped = ttest_2samp(self.path('a'), self.path('y'),
+                                 test_type=test_type)
+            expected = ttest_2samp(a, b, test_type=test_type)
+
+            self.assertAlmostEqual(mapped.t_stat, expected.t_stat)
+            self.assertAlmostEqual(mapped.p_val, expected.p_val)
+
+if __name__ == '__main__':
+    unittest.main()
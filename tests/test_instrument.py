@@ -0,0 +1,84 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers import instrument
+from wrappers.instrument import add_hook, recording, remove_hook, summarize
+from wrappers.ols import ols
+from wrappers.ttest import ttest_1samp, ttest_2samp
+
+import numpy as np
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        self.x = np.random.rand(50, 3)
+        self.y = np.random.rand(50)
+
+    def test_disabled(self):
+        self.assertIs(instrument.clock('ols.estimate'), instrument.NULL_CLOCK)
+
+        records = []
+        add_hook(records.append)
+        remove_hook(records.append)
+
+        ols(self.x, self.y)
+        self.assertEqual(records, [])
+
+    def test_ols(self):
+        with recording() as records:
+            reg = ols(self.x, self.y, keep_data=False)
+
+            with redirect_stdout(io.StringIO()):
+                reg.summary()
+
+        stages = [(record['event'], record['stage']) for record in records]
+
+        self.assertEqual(stages, [('ols.estimate', 'solve'),
+                                  ('ols.estimate', 'residuals'),
+                                  ('ols.estimate', 'std_errors'),
+                                  ('ols.estimate', 'p_values'),
+                                  ('ols.estimate', 'model_stats'),
+                                  ('ols.estimate', 'moments'),
+                                  ('ols.summary', 'diagnostics'),
+                                  ('ols.summary', 'print')])
+
+        for record in records:
+            self.assertEqual(record['nobs'], 50)
+            self.assertEqual(record['ncoef'], 4)
+            self.assertTrue(record['seconds'] >= 0)
+            self.assertIsNone(record['bytes'])
+            self.assertIsNone(record['blocks'])
+
+        self.assertEqual(len(set(record['call'] for record in records)), 2)
+
+    def test_ttests_and_memory(self):
+        with recording(memory=True) as records:
+            ttest_1samp(self.y, 0.5)
+            ttest_2samp(self.y, self.x[:, 0], test_type='rel')
+
+        self.assertEqual([record['stage'] for record in records],
+                         ['stats', 'p_value'] * 2)
+        self.assertEqual(records[-1]['test_type'], 'rel')
+
+        for record in records:
+            self.assertEqual(record['size'], 50)
+            self.assertIsNotNone(record['peak_bytes'])
+            self.assertIsInstance(record['blocks'], int)
+
+        totals = summarize(records)
+
+        self.assertEqual(totals[('ttest_1samp.test', 'stats')]['count'], 1)
+        self.assertEqual(sorted(set(event for event, _ in totals)),
+                         ['ttest_1samp.test', 'ttest_2samp.test'])
+
+if __name__ == '__main__':
+    unittest.main()
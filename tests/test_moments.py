@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.moments import residual_moments
+
+import scipy.stats as stats
+import numpy as np
+
+
+class TestResidualMoments(unittest.TestCase):
+    def test_matches_scipy(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        e = stats.t.rvs(4, size=(100, 3))
+        moments = residual_moments(e)
+
+        JB, JBpv, skew, kurtosis = moments.JB()
+
+        self.assertTrue(np.allclose(skew, stats.skew(e)))
+        self.assertTrue(np.allclose(kurtosis, 3 + stats.kurtosis(e)))
+        self.assertTrue(np.allclose(moments.omni(), stats.normaltest(e)))
+
+        de = np.diff(e, axis=0)
+        expected_dw = (de * de).sum(axis=0) / (e * e).sum(axis=0)
+        self.assertTrue(np.allclose(moments.dw(), expected_dw))
+
+    def test_omni_too_few_observations(self):
+        moments = residual_moments(np.array([1.0, -2.0, 0.5, 3.0]))
+        self.assertTrue(np.all(np.isnan(moments.omni())))
+
+    def test_merge(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        e = np.random.rand(100)
+
+        expected = residual_moments(e)
+        merged = residual_moments()
+
+        for start in range(0, 100, 7):
+            merged.merge(residual_moments(e[start:start + 7]))
+
+        for attr in ('nobs', 'mean', 'm2', 'm3', 'm4', 'ssr', 'dsq'):
+            self.assertTrue(np.allclose(getattr(merged, attr),
+                                        getattr(expected, attr)))
+
+if __name__ == '__main__':
+    unittest.main()
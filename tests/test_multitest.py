@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.multitest import adjust_p_values
+from wrappers.ttest import ttest_1samp, ttest_2samp, ttest_1samp_batch, ttest_results
+
+import numpy as np
+
+
+class TestMultitest(unittest.TestCase):
+    def test_adjust_p_values(self):
+        p_val = [0.01, 0.04, 0.03, 0.005]
+
+        expected = {'holm': [0.03, 0.06, 0.06, 0.02],
+                    'fdr_bh': [0.02, 0.04, 0.04, 0.02],
+                    'bonferroni': [0.04, 0.16, 0.12, 0.02]}
+
+        for correction in expected:
+            self.assertTrue(np.allclose(adjust_p_values(p_val, correction),
+                                        expected[correction]))
+
+    def test_nan_and_invalid(self):
+        adjusted = adjust_p_values([0.01, np.nan, 0.02], 'bonferroni')
+
+        self.assertTrue(np.isnan(adjusted[1]))
+        self.assertTrue(np.allclose(adjusted[[0, 2]], [0.02, 0.04]))
+
+        self.assertRaises(ValueError, adjust_p_values, [0.01], 'bad')
+
+    def test_results(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        tests = [ttest_1samp(np.random.randn(30) + shift, 0.0, alpha=0.05)
+                 for shift in (0.0, 0.1, 0.5, 1.0)]
+        tests.append(ttest_2samp(np.random.randn(30),
+                                 np.random.randn(30) + 1.0, alpha=0.05))
+
+        results = ttest_results(tests, correction='holm')
+        p_adj = adjust_p_values([test.p_val for test in tests], 'holm')
+
+        self.assertEqual(len(results), 5)
+        self.assertTrue(np.allclose(results.p_adj, p_adj))
+
+        reject_null, accept_alt = results.decisions()
+
+        for i, test in enumerate(tests):
+            self.assertIs(results[i], test)
+            self.assertEqual(test.correction, 'holm')
+
+            data = test.to_dict()
+
+            self.assertAlmostEqual(data['p_adj'], p_adj[i])
+            self.assertEqual(data['reject_null'], reject_null[i])
+            self.assertEqual(data['accept_alt'], accept_alt[i])
+
+        # At least one of the t-tests is significant before the correction
+        # but not after it.
+        self.assertTrue(np.any((results.p_val < 0.05) & ~reject_null))
+
+    def test_results_alpha(self):
+        tests = [ttest_1samp.from_stats(0.2, 1.0, 30, 0.0, alpha=alpha)
+                 for alpha in (0.05, 0.1)]
+
+        self.assertRaises(ValueError, ttest_results, tests)
+
+        results = ttest_results(tests, alpha=0.01)
+        self.assertEqual([test.alpha for test in tests], [0.01, 0.01])
+        self.assertFalse(np.any(results.decisions()[0]))
+
+    def test_batch_correct(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        a = np.random.randn(10, 20) + np.linspace(0, 1, 10)[:, None]
+        batch = ttest_1samp_batch(a, 0.0, alpha=0.05)
+
+        uncorrected = batch.decisions()[0]
+        batch.correct('fdr_bh')
+
+        self.assertTrue(np.allclose(batch.p_adj,
+                                    adjust_p_values(batch.p_val, 'fdr_bh')))
+        self.assertTrue(np.all(uncorrected >= batch.decisions()[0]))
+        self.assertEqual(batch.to_dict()['correction'], 'fdr_bh')
+
+if __name__ == '__main__':
+    unittest.main()
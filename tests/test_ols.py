@@ -3,11 +3,11 @@ import sys
 import warnings
 import unittest
 
-wrapperDir = os.path.abspath(os.path.join(
-    os.path.dirname(__file__), "..", "wrappers"))
-sys.path.insert(0, wrapperDir)
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
 
-from ols import ols
+from wrappers.fixed_effects import demean
+from wrappers.ols import ols
 
 import numpy as np
 
@@ -87,6 +87,476 @@ class TestOLS(unittest.TestCase):
             self.assertTrue(np.all(reg.p > alpha))
             self.assertTrue(np.all(abs(reg.t) < tStatMax))
 
+    def test_invalid_method(self):
+        x = np.random.rand(10)
+        y = np.random.rand(10)
+
+        self.assertRaises(ValueError, ols, x, y, method='bad_method')
+
+    def test_singular_matrix_all_methods(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(10, 2)
+        x = np.column_stack((x, 2 * x[:, 0]))
+        y = np.random.rand(10)
+
+        for method in ('qr', 'cholesky', 'svd', 'normal'):
+            self.assertRaises(np.linalg.LinAlgError, ols,
+                              x, y, method=method)
+
+    def test_methods_agree(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(50, 3)
+        y = np.random.rand(50)
+
+        expected = ols(x, y, method='normal')
+        expected_inv_xx = np.linalg.inv(np.dot(expected.x.T, expected.x))
+
+        for method in ('qr', 'cholesky', 'svd'):
+            reg = ols(x, y, method=method)
+
+            self.assertTrue(np.allclose(reg.b, expected.b))
+            self.assertTrue(np.allclose(reg.se, expected.se))
+            self.assertTrue(np.allclose(reg.p, expected.p))
+            self.assertTrue(np.allclose(reg.inv_xx, expected_inv_xx))
+
+    def test_multi_response(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(50, 3)
+        y = np.random.rand(50, 4)
+
+        batch = ols(x, y)
+        self.assertEqual(batch.y_varnm, ['y1', 'y2', 'y3', 'y4'])
+
+        for j in range(y.shape[1]):
+            reg = ols(x, y[:, j])
+
+            self.assertTrue(np.allclose(batch.b[:, j], reg.b))
+            self.assertTrue(np.allclose(batch.se[:, j], reg.se))
+            self.assertTrue(np.allclose(batch.t[:, j], reg.t))
+            self.assertTrue(np.allclose(batch.p[:, j], reg.p))
+            self.assertTrue(np.allclose(batch.R2[j], reg.R2))
+            self.assertTrue(np.allclose(batch.F[j], reg.F))
+            self.assertTrue(np.allclose(batch.dw()[j], reg.dw()))
+            self.assertTrue(np.allclose(batch.ll()[0][j], reg.ll()[0]))
+
+    def test_single_column_response(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(50, 2)
+        y = np.random.rand(50)
+
+        expected = ols(x, y)
+
+        for reg in (ols(x, y[:, None]), ols().partial_fit(x, y[:, None]),
+                    ols.from_frame({'y': y, 'a': x[:, 0], 'b': x[:, 1]},
+                                   y=['y'])):
+            self.assertEqual(reg.nresp, 1)
+            self.assertEqual(reg.y_varnm, 'y')
+
+            for attr in ('b', 'se', 't', 'p', 'R2', 'F'):
+                self.assertEqual(np.shape(getattr(reg, attr)),
+                                 np.shape(getattr(expected, attr)))
+                self.assertTrue(np.allclose(getattr(reg, attr),
+                                            getattr(expected, attr)))
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                reg.summary()
+                reg.to_dict()
+
+    def test_partial_fit(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(100, 3)
+        y = np.random.rand(100)
+
+        for method in ('qr', 'cholesky', 'svd', 'normal'):
+            expected = ols(x, y, method=method)
+            reg = ols(x_varnm=['a', 'b', 'c'], method=method)
+
+            for start in range(0, 100, 30):
+                reg.partial_fit(x[start:start + 30], y[start:start + 30])
+
+            self.assertEqual(reg.nobs, 100)
+            self.assertEqual(reg.x_varnm, ['const', 'a', 'b', 'c'])
+
+            for attr in ('b', 'se', 't', 'p', 'R2', 'R2adj', 'F', 'Fpv'):
+                self.assertTrue(np.allclose(getattr(reg, attr),
+                                            getattr(expected, attr)))
+
+            self.assertTrue(np.allclose(reg.ll(), expected.ll()))
+            self.assertTrue(np.isnan(reg.dw()))
+
+    def test_partial_fit_with_data(self):
+        x = np.random.rand(10)
+        y = np.random.rand(10)
+
+        reg = ols(x, y)
+        self.assertRaises(ValueError, reg.partial_fit, x, y)
+
+    def test_partial_fit_small_chunks(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(20, 2)
+        y = np.random.rand(20)
+
+        reg = ols()
+        self.assertEqual(str(reg), "OLS Regression on 0 Observations")
+
+        # Fewer observations than coefficients so far.
+        reg.partial_fit(x[:2], y[:2])
+        self.assertEqual(reg.nobs, 2)
+
+        for method in (reg.summary, reg.to_dict, reg.ll):
+            self.assertRaises(ValueError, method)
+
+        reg.partial_fit(x[2:], y[2:])
+        expected = ols(x, y)
+
+        self.assertEqual(reg.nobs, 20)
+        self.assertTrue(np.allclose(reg.b, expected.b))
+        self.assertTrue(np.allclose(reg.se, expected.se))
+
+    def test_partial_fit_perfect_fit(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(1000, 2) * 1e3
+        y = 1e6 + np.dot(x, [3.0, -2.0])
+
+        reg = ols().partial_fit(x, y)
+
+        self.assertTrue(np.all(reg.ssr >= 0))
+        self.assertFalse(np.any(np.isnan(reg.se)))
+
+    def test_cached_moments(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(50, 2)
+        y = np.random.rand(50)
+
+        reg = ols(x, y)
+        moments = reg.moments
+
+        self.assertTrue(reg.moments is moments)
+
+        reg.estimate()
+        self.assertFalse(reg.moments is moments)
+
+    def test_drop_data(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(50, 2)
+        y = np.random.rand(50)
+
+        expected = ols(x, y)
+        reg = ols(x, y, keep_data=False)
+
+        self.assertTrue(reg.x is None and reg.y is None and reg.e is None)
+        self.assertTrue(np.allclose(reg.b, expected.b))
+        self.assertTrue(np.allclose(reg.dw(), expected.dw()))
+        self.assertTrue(np.allclose(reg.JB(), expected.JB()))
+        self.assertTrue(np.allclose(reg.omni(), expected.omni()))
+
+        self.assertRaises(ValueError, reg.estimate)
+        self.assertRaises(AttributeError, setattr, reg, 'extra', None)
+
+    def test_from_gram(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(40, 2)
+        y = np.random.rand(40)
+
+        design = np.column_stack((np.ones(40), x))
+        expected = ols(x, y)
+
+        reg = ols.from_gram(np.dot(design.T, design), np.dot(design.T, y),
+                            np.dot(y, y), y.sum(), 40, x_varnm=['a', 'b'])
+
+        self.assertEqual(reg.x_varnm, ['const', 'a', 'b'])
+
+        for attr in ('b', 'se', 't', 'p', 'R2', 'R2adj', 'F', 'Fpv'):
+            self.assertTrue(np.allclose(getattr(reg, attr),
+                                        getattr(expected, attr)))
+
+        self.assertTrue(np.allclose(reg.ll(), expected.ll()))
+        self.assertTrue(np.isnan(reg.dw()))
+
+        self.assertEqual(expected.unavailable_stats(), [])
+        self.assertIn('durbin_watson', reg.unavailable_stats())
+        self.assertEqual(reg.to_dict()['unavailable_stats'],
+                         reg.unavailable_stats())
+
+        self.assertRaises(ValueError, ols.from_gram, np.dot(x.T, x),
+                          np.dot(x.T, y), np.dot(y, y), y.sum(), 40)
+        self.assertRaises(ValueError, ols.from_gram, np.dot(design.T, design),
+                          np.dot(x.T, y), np.dot(y, y), y.sum(), 40)
+
+    def test_frequency_weights(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(20, 2)
+        y = np.random.rand(20, 2)
+        counts = np.random.randint(1, 5, 20)
+
+        expected = ols(np.repeat(x, counts, axis=0),
+                       np.repeat(y, counts, axis=0))
+        reg = ols(x, y, weights=counts)
+
+        self.assertEqual(reg.nobs, counts.sum())
+        self.assertEqual(reg.df_e, expected.df_e)
+
+        for attr in ('b', 'se', 't', 'p', 'R2', 'R2adj', 'F', 'Fpv'):
+            self.assertTrue(np.allclose(getattr(reg, attr),
+                                        getattr(expected, attr)))
+
+        for stat in ('ll', 'dw', 'JB', 'omni'):
+            self.assertTrue(np.allclose(getattr(reg, stat)(),
+                                        getattr(expected, stat)()))
+
+    def test_analytic_weights(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(30, 2)
+        y = np.random.rand(30)
+        weights = np.random.rand(30) + 0.5
+
+        reg = ols(x, y, weights=weights, weight_type='analytic')
+        scaled = ols(x, y, weights=weights * 10, weight_type='analytic')
+
+        root = np.sqrt(weights)
+        design = np.column_stack((np.ones(30), x))
+        b = np.linalg.lstsq(design * root[:, None], y * root, rcond=None)[0]
+
+        self.assertEqual(reg.nobs, 30)
+        self.assertTrue(np.allclose(reg.b, b))
+
+        for attr in ('b', 'se', 'R2', 'F'):
+            self.assertTrue(np.allclose(getattr(reg, attr),
+                                        getattr(scaled, attr)))
+
+        self.assertTrue(np.allclose(reg.JB(), scaled.JB()))
+        self.assertEqual(reg.to_dict()['weight_type'], 'analytic')
+
+        self.assertRaises(ValueError, ols, x, y, weights=weights,
+                          weight_type='bad_type')
+        self.assertRaises(ValueError, ols, x, y, weights=weights[:10])
+        self.assertRaises(ValueError, ols, x, y, weights=-weights)
+
+    def test_fixed_effects(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        firms = np.random.randint(0, 8, 200)
+        years = np.random.randint(0, 5, 200)
+
+        x = np.random.rand(200, 2)
+        y = np.dot(x, [1, -2]) + firms + 0.5 * years + np.random.rand(200)
+
+        def dummies(codes):
+            return (codes[:, None] == np.unique(codes)[1:]).astype(float)
+
+        for groups, columns in ((firms, [dummies(firms)]),
+                                ([firms, years], [dummies(firms),
+                                                  dummies(years)])):
+            expected = ols(np.column_stack([x] + columns), y)
+            reg = ols(x, y, groups=groups, x_varnm=['a', 'b'])
+
+            self.assertEqual(reg.x_varnm, ['a', 'b'])
+            self.assertEqual(reg.df_e, expected.df_e)
+
+            for attr in ('b', 'se', 't', 'p'):
+                self.assertTrue(np.allclose(getattr(reg, attr),
+                                            getattr(expected, attr)[1:3]))
+
+            for attr in ('R2', 'R2adj'):
+                self.assertTrue(np.allclose(getattr(reg, attr),
+                                            getattr(expected, attr)))
+
+            self.assertTrue(np.allclose(reg.ll()[0], expected.ll()[0]))
+            self.assertTrue(np.allclose(reg.dw(), expected.dw()))
+
+            within = ols(reg.x, reg.y)
+            self.assertTrue(np.allclose(reg.R2_within, within.R2))
+
+        self.assertRaises(ValueError, ols, x, y, groups=firms[:10])
+
+    def test_fixed_effects_not_converged(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        codes = [np.random.randint(0, 8, 200), np.random.randint(0, 5, 200)]
+        a = np.random.rand(200, 2)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            demean(a, codes)
+            self.assertEqual(len(caught), 0)
+
+            demean(a, codes, max_iter=1)
+            self.assertEqual(len(caught), 1)
+            self.assertTrue(issubclass(caught[0].category, RuntimeWarning))
+
+    def test_robust_se(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(60, 2)
+        y = np.dot(x, [1, 2]) + x[:, 0] * np.random.randn(60)
+        clusters = np.random.randint(0, 7, 60)
+
+        design = np.column_stack((np.ones(60), x))
+        inv_xx = np.linalg.inv(np.dot(design.T, design))
+        h = np.einsum('ij,jk,ik->i', design, inv_xx, design)
+        e = y - np.dot(design, ols(x, y).b)
+
+        def reference(c):
+            meat = np.dot(design.T * c, design)
+            return np.sqrt(np.diag(np.dot(np.dot(inv_xx, meat), inv_xx)))
+
+        expected = {
+            'HC0': reference(e ** 2),
+            'HC1': reference(e ** 2) * np.sqrt(60 / 57.0),
+            'HC2': reference(e ** 2 / (1 - h)),
+            'HC3': reference(e ** 2 / (1 - h) ** 2),
+        }
+
+        meat = np.zeros((3, 3))
+        for cluster in np.unique(clusters):
+            score = np.dot(design[clusters == cluster].T,
+                           e[clusters == cluster])
+            meat += np.outer(score, score)
+
+        meat *= (7 / 6.0) * (59 / 57.0)
+        expected['cluster'] = np.sqrt(np.diag(
+            np.dot(np.dot(inv_xx, meat), inv_xx)))
+
+        for cov_type, se in expected.items():
+            reg = ols(x, y, cov_type=cov_type,
+                      clusters=clusters if cov_type == 'cluster' else None)
+
+            self.assertTrue(np.allclose(reg.se, se))
+            self.assertTrue(np.allclose(reg.t, reg.b / se))
+
+            slopes = reg.b[1:]
+            wald = np.dot(slopes, np.linalg.solve(reg.cov[1:, 1:], slopes))
+            self.assertTrue(np.allclose(reg.F, wald / 2))
+
+        self.assertRaises(ValueError, ols, x, y, cov_type='bad_type')
+        self.assertRaises(ValueError, ols, x, y, cov_type='cluster')
+        self.assertRaises(ValueError, ols, x, y, clusters=clusters)
+
+    def test_robust_se_fixed_effects(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        groups = np.repeat(np.arange(6), 10)
+        x = np.random.rand(60, 2)
+        y = np.dot(x, [1, 2]) + groups + x[:, 0] * np.random.randn(60)
+        clusters = np.random.randint(0, 7, 60)
+        weights = np.random.rand(60) + 0.5
+
+        dummies = (groups[:, None] == np.arange(1, 6)).astype(float)
+        design = np.column_stack((x, dummies))
+
+        for cov_type in ('nonrobust', 'HC0', 'HC1', 'HC2', 'HC3', 'cluster'):
+            for kwargs in ({}, {'weights': weights,
+                                'weight_type': 'analytic'}):
+                if cov_type == 'cluster':
+                    kwargs = dict(kwargs, clusters=clusters)
+
+                expected = ols(design, y, cov_type=cov_type, **kwargs)
+                reg = ols(x, y, groups=groups, cov_type=cov_type, **kwargs)
+
+                for attr in ('b', 'se', 't', 'p'):
+                    self.assertTrue(np.allclose(getattr(reg, attr),
+                                                getattr(expected, attr)[1:3]))
+
+        self.assertRaises(ValueError, ols, x, y, groups=[groups, clusters],
+                          cov_type='HC3')
+
+    def test_robust_se_frequency_weights(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(20, 2)
+        y = np.random.rand(20, 2)
+        clusters = np.random.randint(0, 5, 20)
+        counts = np.random.randint(1, 4, 20)
+
+        for cov_type in ('HC1', 'HC3', 'cluster'):
+            kwargs = {'cov_type': cov_type}
+
+            if cov_type == 'cluster':
+                kwargs['clusters'] = np.repeat(clusters, counts)
+
+            expected = ols(np.repeat(x, counts, axis=0),
+                           np.repeat(y, counts, axis=0), **kwargs)
+
+            if cov_type == 'cluster':
+                kwargs['clusters'] = clusters
+
+            reg = ols(x, y, weights=counts, **kwargs)
+
+            for attr in ('se', 't', 'p', 'F', 'Fpv'):
+                self.assertTrue(np.allclose(getattr(reg, attr),
+                                            getattr(expected, attr)))
+
+    def test_from_frame(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        frame = {'y': np.random.rand(30), 'a': np.random.rand(30),
+                 'b': np.random.randint(0, 3, 30),
+                 'c': np.array(['lo', 'hi', None] * 10, dtype=object)}
+        frame['a'][4] = np.nan
+
+        # Rows with a missing value in 'a' or 'c' are dropped, and
+        # 'c' is expanded into one dummy column ('lo') next to 'hi'.
+        keep = ~np.isnan(frame['a']) & (frame['c'] != None)
+        b = frame['b'][keep]
+
+        x = np.column_stack([frame['a'][keep], b == 1, b == 2,
+                             frame['c'][keep] == 'lo'])
+        expected = ols(x, frame['y'][keep])
+
+        reg = ols.from_frame(frame, formula='y ~ a + C(b) + c')
+        self.assertEqual(reg.x_varnm, ['const', 'a', 'b[1]', 'b[2]', 'c[lo]'])
+        self.assertEqual(reg.y_varnm, 'y')
+        self.assertTrue(reg.x.flags['F_CONTIGUOUS'])
+        self.assertEqual(reg.nobs, keep.sum())
+
+        for attr in ('b', 'se', 'R2', 'F'):
+            self.assertTrue(np.allclose(getattr(reg, attr),
+                                        getattr(expected, attr)))
+
+        reg = ols.from_frame(frame, y='y', categorical=['b'])
+        self.assertTrue(np.allclose(reg.b, expected.b))
+
+        table = np.zeros(10, dtype=[('y', 'f8'), ('x', 'f8')])
+        table['x'] = np.arange(10)
+        table['y'] = np.arange(10) * 2 + 1 + np.random.rand(10) * 1e-3
+        self.assertTrue(np.allclose(ols.from_frame(table, y='y').b, [1, 2],
+                                    atol=1e-2))
+
+        for formula in ('y + a', 'y ~ a - 1', 'y ~ a + 0', 'y ~ bad'):
+            self.assertRaises(ValueError, ols.from_frame, frame,
+                              formula=formula)
+
     def test_str_object(self):
         seed = 1234567890
         np.random.seed(seed)
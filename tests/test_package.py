@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+import wrappers
+from wrappers.ols import ols
+from wrappers.ttest import ttest_1samp
+
+
+class TestPackage(unittest.TestCase):
+    def test_exports(self):
+        self.assertIs(wrappers.ols, ols)
+        self.assertIs(wrappers.ttest_1samp, ttest_1samp)
+
+        self.assertIn('ttest_2samp', dir(wrappers))
+        self.assertRaises(AttributeError, getattr, wrappers, 'bad_name')
+
+    def test_lazy_scipy(self):
+        # The check is run in a fresh interpreter, since SciPy has
+        # already been loaded by the other tests in this one.
+        script = ("import sys, wrappers; "
+                  "print(sorted(name for name in ('scipy.linalg', "
+                  "'scipy.special', 'scipy.sparse', 'scipy.stats') "
+                  "if type(sys.modules.get(name)).__name__ == 'module'))")
+
+        output = subprocess.check_output([sys.executable, "-c", script],
+                                         cwd=rootDir)
+        self.assertEqual(output.decode().strip(), "[]")
+
+if __name__ == '__main__':
+    unittest.main()
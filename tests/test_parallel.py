@@ -0,0 +1,51 @@
+import os
+import sys
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from concurrent.futures import ThreadPoolExecutor
+
+from wrappers.ols import ols
+from wrappers.parallel import ols_sharded
+
+import numpy as np
+
+
+class TestOLSSharded(unittest.TestCase):
+    def assert_same_fit(self, reg, expected):
+        for attr in ('b', 'se', 't', 'p', 'R2', 'R2adj', 'F', 'Fpv'):
+            self.assertTrue(np.allclose(getattr(reg, attr),
+                                        getattr(expected, attr)))
+
+        self.assertTrue(np.allclose(reg.ll(), expected.ll()))
+        self.assertTrue(np.allclose(reg.dw(), expected.dw()))
+        self.assertTrue(np.allclose(reg.JB(), expected.JB()))
+        self.assertTrue(np.allclose(reg.omni(), expected.omni()))
+
+    def test_process_pool(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(1000, 3)
+        y = np.random.rand(1000)
+
+        reg = ols_sharded(x, y, shards=3)
+        self.assert_same_fit(reg, ols(x, y))
+
+    def test_user_executor_multi_response(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(1000)
+        y = np.random.rand(1000, 2)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reg = ols_sharded(x, y, shards=5, executor=executor)
+
+        self.assertEqual(reg.x_varnm, ['const', 'x'])
+        self.assert_same_fit(reg, ols(x, y))
+
+if __name__ == '__main__':
+    unittest.main()
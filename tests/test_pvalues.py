@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers import pvalues
+from wrappers.pvalues import cache_info, chi2_sf, f_sf, set_cache, t_sf, t_two_sided
+
+import numpy as np
+from scipy import stats
+
+
+class TestPvalues(unittest.TestCase):
+    def tearDown(self):
+        set_cache(None)
+
+    def test_matches_scipy(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.randn(50) * 3
+        df = np.random.randint(1, 100, 50) + np.random.rand(50)
+
+        self.assertTrue(np.allclose(t_sf(x, df), stats.t.sf(x, df)))
+        self.assertTrue(np.allclose(t_two_sided(x, df),
+                                    2 * stats.t.sf(abs(x), df)))
+        self.assertTrue(np.allclose(f_sf(x ** 2, 3, df),
+                                    stats.f.sf(x ** 2, 3, df)))
+        self.assertTrue(np.allclose(chi2_sf(x ** 2, 2),
+                                    stats.chi2.sf(x ** 2, 2)))
+
+        self.assertAlmostEqual(t_two_sided(-2.0, 10),
+                               2 * stats.t.sf(2.0, 10))
+
+    def test_cache(self):
+        self.assertIsNone(cache_info())
+
+        set_cache(16)
+
+        first = t_two_sided(1.5, 20)
+        second = t_two_sided(np.float64(1.5), 20)
+
+        self.assertEqual(first, second)
+        self.assertEqual(cache_info().hits, 1)
+        self.assertEqual(cache_info().misses, 1)
+
+        # Arrays bypass the cache.
+        t_two_sided(np.array([1.5, 2.5]), 20)
+        self.assertEqual(cache_info().currsize, 1)
+
+        set_cache(0)
+        self.assertIsNone(pvalues._cached)
+
+if __name__ == '__main__':
+    unittest.main()
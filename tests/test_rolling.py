@@ -0,0 +1,110 @@
+import os
+import sys
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.ols import ols
+from wrappers.rolling import rolling_ols
+
+import numpy as np
+
+
+class TestRollingOls(unittest.TestCase):
+    def setUp(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        self.x = np.random.rand(60, 2)
+        self.y = 1 + np.dot(self.x, [2, -3]) + np.random.randn(60)
+
+    def check_window(self, reg, i, start):
+        expected = ols(self.x[start:i + 1], self.y[start:i + 1])
+
+        self.assertEqual(reg.nobs[i], expected.nobs)
+        self.assertTrue(np.allclose(reg.b[i], expected.b))
+        self.assertTrue(np.allclose(reg.se[i], expected.se))
+        self.assertTrue(np.allclose(reg.t[i], expected.t))
+        self.assertTrue(np.allclose(reg.p[i], expected.p))
+        self.assertTrue(np.allclose(reg.R2[i], expected.R2))
+
+    def test_rolling(self):
+        reg = rolling_ols(self.x, self.y, window=10, refresh=7)
+
+        self.assertTrue(np.all(np.isnan(reg.b[:9])))
+
+        for i in range(9, 60):
+            self.check_window(reg, i, i - 9)
+
+    def test_expanding(self):
+        reg = rolling_ols(self.x, self.y)
+
+        self.assertEqual(reg.x_varnm, ['const', 'x1', 'x2'])
+        self.assertTrue(np.all(np.isnan(reg.b[:3])))
+
+        for i in range(3, 60):
+            self.check_window(reg, i, 0)
+
+    def test_min_nobs(self):
+        reg = rolling_ols(self.x, self.y, window=10, min_nobs=5)
+
+        self.assertTrue(np.all(np.isnan(reg.b[:4])))
+
+        for i in range(4, 60):
+            self.check_window(reg, i, max(0, i - 9))
+
+        self.assertRaises(ValueError, rolling_ols, self.x, self.y,
+                          window=10, min_nobs=3)
+        self.assertRaises(ValueError, rolling_ols, self.x, self.y,
+                          window=10, min_nobs=11)
+
+    def test_rank_deficient_windows(self):
+        x = self.x.copy()
+
+        # The inverse is refreshed both within the degenerate stretch
+        # and outside of it, and the first window is degenerate too.
+        for refresh, start in ((100, 20), (3, 20), (3, 0)):
+            x[start:40, 1] = 0
+            reg = rolling_ols(x, self.y, window=10, refresh=refresh)
+
+            for i in range(9, 60):
+                rows = slice(i - 9, i + 1)
+
+                try:
+                    expected = ols(x[rows], self.y[rows])
+
+                except np.linalg.LinAlgError:
+                    self.assertEqual(reg.nobs[i], 10)
+                    self.assertTrue(np.all(np.isnan(reg.b[i])))
+                    self.assertTrue(np.all(np.isnan(reg.p[i])))
+                    continue
+
+                self.assertTrue(np.allclose(reg.b[i], expected.b))
+                self.assertTrue(np.allclose(reg.se[i], expected.se))
+                self.assertTrue(np.allclose(reg.p[i], expected.p))
+                self.assertTrue(np.allclose(reg.R2[i], expected.R2))
+
+    def test_multi_response(self):
+        y = np.column_stack((self.y, 2 * self.y + np.random.randn(60)))
+        reg = rolling_ols(self.x, y, window=15)
+
+        self.assertEqual(reg.b.shape, (60, 3, 2))
+        self.assertEqual(reg.R2.shape, (60, 2))
+
+        for j in range(2):
+            single = rolling_ols(self.x, y[:, j], window=15)
+
+            self.assertTrue(np.allclose(reg.b[14:, :, j], single.b[14:]))
+            self.assertTrue(np.allclose(reg.p[14:, :, j], single.p[14:]))
+            self.assertTrue(np.allclose(reg.R2[14:, j], single.R2[14:]))
+
+    def test_window_model(self):
+        reg = rolling_ols(self.x, self.y, window=10)
+        model = reg.ols(20)
+
+        self.assertTrue(np.allclose(model.b, reg.b[20]))
+        self.assertEqual(model.nobs, 10)
+
+if __name__ == '__main__':
+    unittest.main()
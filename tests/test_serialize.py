@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.ols import ols
+from wrappers.ttest import ttest_1samp, ttest_2samp_batch
+from wrappers.serialize import async_writer, default_filename, load, \
+    load_all, numpy_encoder, result_writer
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class TestSerialize(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def path(self, filename):
+        return os.path.join(self.tmpdir, filename)
+
+    def test_numpy_encoder(self):
+        data = {'int': np.int64(3), 'bool': np.bool_(True),
+                'array': np.arange(3.0)}
+        expected = {'int': 3, 'bool': True, 'array': [0.0, 1.0, 2.0]}
+
+        self.assertEqual(json.loads(json.dumps(data, cls=numpy_encoder)),
+                         expected)
+
+    def test_default_filename_unique(self):
+        filenames = set(default_filename() for _ in range(1000))
+        self.assertEqual(len(filenames), 1000)
+
+    def test_ols_round_trip(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        reg = ols(np.random.rand(20, 2), np.random.rand(20),
+                  x_varnm=['a', 'b'])
+
+        for format in ('json', 'npz'):
+            filename = self.path('ols.' + format)
+            reg.to_file(filename, format=format)
+            data = load(filename)
+
+            self.assertEqual(data['obs_count'], 20)
+            self.assertEqual(data['dependent_var'], 'y')
+            self.assertTrue(np.allclose(data['estimates']['b']['estimate'],
+                                        reg.b[2]))
+            self.assertTrue(np.allclose(data['durbin_watson'], reg.dw()))
+
+    def test_npz_matches_json(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        # '/' in a name must not nest the keys, and the statistics
+        # that are 'None' (e.g. 'weight_type') must be kept.
+        reg = ols(np.random.rand(20, 2), np.random.rand(20),
+                  x_varnm=['a/b', '100%'])
+
+        for result in (reg, ttest_1samp(np.random.rand(10), 0.5)):
+            data = {}
+
+            for format in ('json', 'npz'):
+                filename = self.path('result.' + format)
+                result.to_file(filename, format=format)
+                data[format] = load(filename)
+
+            np.testing.assert_equal(data['npz'], data['json'])
+
+            if result is reg:
+                self.assertIn('a/b', data['npz']['estimates'])
+                self.assertIsNone(data['npz']['weight_type'])
+
+    def test_ttest_round_trip(self):
+        test = ttest_1samp(np.array([1, 2, 3, 4, 5, 6, 7, 8, 9]), 4.5)
+
+        for format in ('json', 'npz'):
+            filename = self.path('ttest.' + format)
+            test.to_file(filename, format=format)
+            data = load(filename)
+
+            self.assertTrue(np.allclose(data['t_stat'], test.t_stat))
+            self.assertEqual(data['null_hyp'], "Mean 1 == 4.5")
+
+    def test_result_writer(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        tests = [ttest_1samp(np.random.rand(10), 0.5) for _ in range(5)]
+        batch = ttest_2samp_batch(np.random.rand(3, 10), np.random.rand(3, 10))
+
+        for format in ('json', 'npz'):
+            filename = self.path('results.' + format)
+
+            with result_writer(filename, format=format) as writer:
+                for test in tests:
+                    writer.write(test)
+
+                writer.write(batch)
+
+            results = load_all(filename)
+            self.assertEqual(len(results), 6)
+
+            for test, data in zip(tests, results):
+                self.assertTrue(np.allclose(data['p_val'], test.p_val))
+
+            self.assertTrue(np.allclose(results[-1]['p_val'], batch.p_val))
+
+    def test_async_writer(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        tests = [ttest_1samp(np.random.rand(10), 0.5) for _ in range(50)]
+
+        for format in ('json', 'npz'):
+            filename = self.path('async.' + format)
+
+            # A small queue and batches make the submitting
+            # threads wait on the writer some of the time.
+            with async_writer(filename, format=format, maxsize=4,
+                              batch_size=3) as writer:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    list(executor.map(writer.write, tests))
+
+                writer.flush()
+                self.assertEqual(writer.count, 50)
+
+            self.assertRaises(ValueError, writer.write, tests[0])
+
+            p_vals = sorted(data['p_val'] for data in load_all(filename))
+            self.assertTrue(np.allclose(p_vals,
+                                        sorted(test.p_val for test in tests)))
+
+    def test_async_writer_error(self):
+        writer = async_writer(self.path('error.json'))
+        writer.write({'bad': set([1])})
+
+        self.assertRaises(TypeError, writer.close)
+
+    def test_invalid_format(self):
+        test = ttest_1samp(np.array([1, 2, 3, 4, 5, 6, 7, 8, 9]), 4.5)
+
+        self.assertRaises(ValueError, test.to_file,
+                          self.path('ttest.csv'), format='csv')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.solvers import GRAM_SOLVERS, SOLVERS, cross_products, \
+    get_solver, inv_diagonal
+
+import numpy as np
+
+EPSILON = 1e-10
+
+
+class TestSolvers(unittest.TestCase):
+    def test_invalid_method(self):
+        self.assertRaises(ValueError, get_solver, 'bad_method')
+
+    def test_r_inv_factors_inverse(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.column_stack((np.ones(30), np.random.rand(30, 3)))
+        y = np.random.rand(30)
+
+        expected = np.linalg.inv(np.dot(x.T, x))
+
+        for method, solver in SOLVERS.items():
+            b, r_inv = solver(x, y)
+
+            self.assertTrue(np.allclose(np.dot(r_inv, r_inv.T), expected))
+            self.assertTrue(np.allclose(inv_diagonal(r_inv),
+                                        np.diagonal(expected)))
+
+    def test_exact_solution(self):
+        x = np.column_stack((np.ones(5), np.arange(5.0)))
+        y = 3 + 2 * np.arange(5.0)
+
+        for method, solver in SOLVERS.items():
+            b, r_inv = solver(x, y)
+            self.assertTrue(np.all(abs(b - [3, 2]) < EPSILON))
+
+    def test_gram_solvers(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(30, 3)
+        y = np.random.rand(30)
+
+        design = np.column_stack((np.ones(30), x))
+        expected, _ = SOLVERS['qr'](design, y)
+
+        xtx, xty, yty, ysum, nobs = cross_products(x, y)
+
+        self.assertTrue(np.allclose(xtx, np.dot(design.T, design)))
+        self.assertTrue(np.allclose(xty, np.dot(design.T, y)))
+        self.assertTrue(np.allclose(yty, np.dot(y, y)))
+        self.assertTrue(np.allclose(ysum, y.sum()))
+        self.assertEqual(nobs, 30)
+
+        for method, solver in GRAM_SOLVERS.items():
+            b, r_inv = solver(xtx, xty, nobs)
+
+            self.assertTrue(np.allclose(b, expected))
+            self.assertTrue(np.allclose(np.dot(r_inv, r_inv.T),
+                                        np.linalg.inv(xtx)))
+
+if __name__ == '__main__':
+    unittest.main()
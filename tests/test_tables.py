@@ -0,0 +1,101 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
+
+from wrappers.ols import ols
+from wrappers.tables import coefficient_table, model_table, to_parquet, \
+    ttest_table
+from wrappers.ttest import ttest_1samp, ttest_2samp, ttest_1samp_batch, \
+    ttest_results
+
+import numpy as np
+
+try:
+    import pyarrow.parquet
+
+except ImportError:
+    pyarrow = None
+
+
+class TestTables(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+        seed = 1234567890
+        np.random.seed(seed)
+
+        x = np.random.rand(40, 2)
+        self.models = [ols(x, np.random.rand(40), x_varnm=['a', 'b']),
+                       ols(x, np.random.rand(40, 2), x_varnm=['a', 'b'],
+                           y_varnm=['y1', 'y2'])]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_model_table(self):
+        table = model_table(self.models)
+
+        self.assertEqual(len(table), 3)
+        self.assertEqual(list(table['dependent_var']), ['y', 'y1', 'y2'])
+        self.assertEqual(list(table['model']), [0, 1, 1])
+        self.assertTrue(np.allclose(table['r_squared'][1:],
+                                    self.models[1].R2))
+        self.assertTrue(np.allclose(table['durbin_watson'][0],
+                                    self.models[0].dw()))
+
+    def test_coefficient_table(self):
+        table = coefficient_table(self.models)
+
+        self.assertEqual(len(table), 9)
+        self.assertEqual(list(table['variable'][:3]), ['const', 'a', 'b'])
+        self.assertTrue(np.allclose(table['estimate'][:3], self.models[0].b))
+        self.assertTrue(np.allclose(table['p_val'][6:], self.models[1].p[:, 1]))
+
+        filename = os.path.join(self.tmpdir, 'coefficients.npy')
+        np.save(filename, table)
+        self.assertTrue(np.array_equal(np.load(filename), table))
+
+    def test_ttest_table(self):
+        a = np.random.rand(3, 20)
+
+        tests = [ttest_1samp(a[0], 0.3, alpha=0.05),
+                 ttest_2samp(a[1], a[2], alt_hyp='less', alpha=0.05),
+                 ttest_1samp_batch(a, 0.5, alpha=0.05)]
+        ttest_results(tests[:2], correction='holm')
+
+        table = ttest_table(tests)
+
+        self.assertEqual(len(table), 5)
+        self.assertEqual(list(table['test']), [0, 1, 2, 2, 2])
+        self.assertTrue(np.allclose(table['p_val'][2:], tests[2].p_val))
+        self.assertTrue(np.all(np.isnan(table['p_adj'][2:])))
+
+        for i in range(2):
+            data = tests[i].to_dict()
+
+            self.assertEqual(table['p_adj'][i], data['p_adj'])
+            self.assertEqual(table['reject_null'][i], data['reject_null'])
+            self.assertEqual(table['accept_alt'][i], data['accept_alt'])
+
+        reject_null, accept_alt = tests[2].decisions()
+        self.assertTrue(np.array_equal(table['reject_null'][2:], reject_null))
+        self.assertTrue(np.array_equal(table['accept_alt'][2:], accept_alt))
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_to_parquet(self):
+        table = coefficient_table(self.models)
+        filename = os.path.join(self.tmpdir, 'coefficients.parquet')
+
+        to_parquet(table, filename)
+        loaded = pyarrow.parquet.read_table(filename)
+
+        self.assertEqual(loaded.column_names, list(table.dtype.names))
+        self.assertEqual(loaded.num_rows, len(table))
+
+if __name__ == '__main__':
+    unittest.main()
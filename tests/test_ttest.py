@@ -1,11 +1,11 @@
 import os
 import sys
 
-wrapperDir = os.path.abspath(os.path.join(
-    os.path.dirname(__file__), "..", "wrappers"))
-sys.path.insert(0, wrapperDir)
+rootDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, rootDir)
 
-from ttest import ttest_1samp, ttest_2samp
+from wrappers.ttest import ttest_1samp, ttest_2samp, \
+    ttest_1samp_batch, ttest_2samp_batch, running_stats
 
 import scipy.stats as stats
 import numpy as np
@@ -113,6 +113,39 @@ class TestTtest1Samp(unittest.TestCase):
         test = ttest_1samp(a, popmean, alt_hyp='less', alpha=alpha)
         self.assertTrue(alpha > test.p_val)
 
+    def test_from_stats(self):
+        a = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+        popmean = 4.5
+
+        for alt_hyp in ('unequal', 'less', 'greater'):
+            expected = ttest_1samp(a, popmean, alt_hyp=alt_hyp)
+            test = ttest_1samp.from_stats(a.mean(), a.var(ddof=1), len(a),
+                                          popmean, alt_hyp=alt_hyp)
+
+            self.assertTrue(abs(test.t_stat - expected.t_stat) <= EPSILON)
+            self.assertTrue(abs(test.p_val - expected.p_val) <= EPSILON)
+            self.assertEqual(str(test), str(expected))
+
+    def test_drop_data(self):
+        a = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+        popmean = 4.5
+
+        expected = ttest_1samp(a, popmean)
+        test = ttest_1samp(a, popmean, keep_data=False)
+
+        self.assertTrue(test.a is None)
+        self.assertEqual(test.p_val, expected.p_val)
+        self.assertEqual(str(test), str(expected))
+        self.assertEqual(test.to_dict()['data_size'], 9)
+
+        test.alt_hyp = 'greater'
+        test.test()
+        self.assertEqual(test.p_val, expected.p_val / 2.0)
+
+        test = ttest_1samp(a, popmean, keep_data=False, method='permutation',
+                           n_resamples=99)
+        self.assertRaises(ValueError, test.test)
+
     def test_str_object(self):
         seed = 1234567890
         np.random.seed(seed)
@@ -261,6 +294,38 @@ class TestTtest2Samp(unittest.TestCase):
                     self.assertTrue(abs(test.p_val -
                                         expected_p_val) <= EPSILON)
 
+    def test_from_stats(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        a = stats.norm.rvs(loc=5, scale=10, size=500)
+        b = stats.norm.rvs(loc=5, scale=10, size=300)
+
+        for equal_var in (True, False):
+            expected = ttest_2samp(a, b, equal_var=equal_var)
+            test = ttest_2samp.from_stats(a.mean(), a.var(ddof=1), len(a),
+                                          b.mean(), b.var(ddof=1), len(b),
+                                          equal_var=equal_var)
+
+            self.assertTrue(abs(test.t_stat - expected.t_stat) <= EPSILON)
+            self.assertTrue(abs(test.p_val - expected.p_val) <= EPSILON)
+
+    def test_drop_data(self):
+        a = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+        b = np.array([2, 4, 1, 5, 8, 6, 9, 3, 7])
+
+        expected = ttest_2samp(a, b)
+        test = ttest_2samp(a, b, keep_data=False)
+
+        self.assertTrue(test.a is None and test.b is None)
+
+        test.test()
+        self.assertEqual(test.t_stat, expected.t_stat)
+        self.assertEqual(test.p_val, expected.p_val)
+
+        test = ttest_2samp(a, b, test_type='rel', keep_data=False)
+        self.assertRaises(ValueError, test.test)
+
     def test_no_reject_null_hyp(self):
         alpha = 0.1
         diff = 0.1
@@ -312,5 +377,194 @@ class TestTtest2Samp(unittest.TestCase):
         expected = "2-Sample T-Test on Data of Size 500"
         self.assertTrue(str(test) == expected, "Strings don't match")
 
+class TestTtest1SampBatch(unittest.TestCase):
+    def test_invalid_alt_hyp(self):
+        a = np.random.rand(3, 10)
+        alt_hyp = ['unequal', 'bad_alt_hyp', 'less']
+
+        self.assertRaises(ValueError, ttest_1samp_batch, a, 0.5,
+                          alt_hyp=alt_hyp)
+
+    def test_matches_single_tests(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        a = stats.norm.rvs(loc=5, scale=10, size=(20, 6))
+        popmean = np.linspace(0, 10, 6)
+        alt_hyp = ['unequal', 'less', 'greater'] * 2
+        alpha = 0.5
+
+        batch = ttest_1samp_batch(a, popmean, alt_hyp=alt_hyp,
+                                  alpha=alpha, axis=0)
+        self.assertEqual(len(batch), 6)
+
+        for i in range(6):
+            test = ttest_1samp(a[:, i], popmean[i], alt_hyp=alt_hyp[i],
+                               alpha=alpha)
+
+            self.assertTrue(abs(test.t_stat - batch.t_stat[i]) <= EPSILON)
+            self.assertTrue(abs(test.p_val - batch.p_val[i]) <= EPSILON)
+
+    def test_ragged_samples(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        a = [np.random.rand(size) for size in (5, 10, 15)]
+
+        batch = ttest_1samp_batch(a, 0.5)
+        flat = ttest_1samp_batch(np.concatenate(a), 0.5, lengths=[5, 10, 15])
+
+        for i in range(3):
+            test = ttest_1samp(a[i], 0.5)
+
+            self.assertTrue(abs(test.p_val - batch.p_val[i]) <= EPSILON)
+            self.assertTrue(abs(test.p_val - flat.p_val[i]) <= EPSILON)
+
+class TestTtest2SampBatch(unittest.TestCase):
+    def test_invalid_test_type(self):
+        a = np.random.rand(3, 10)
+        b = np.random.rand(3, 10)
+
+        self.assertRaises(ValueError, ttest_2samp_batch, a, b,
+                          test_type='bad_test_type')
+
+    def test_matches_single_tests(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        a = stats.norm.rvs(loc=5, scale=10, size=(6, 50))
+        b = stats.norm.rvs(loc=6, scale=10, size=(6, 50))
+        alt_hyp = ['unequal', 'less', 'greater'] * 2
+        alpha = 0.5
+
+        for test_type in ('ind', 'rel'):
+            for equal_var in (True, False):
+                batch = ttest_2samp_batch(a, b, test_type=test_type,
+                                          equal_var=equal_var,
+                                          alt_hyp=alt_hyp, alpha=alpha)
+                reject_null, accept_alt = batch.decisions()
+
+                for i in range(6):
+                    test = ttest_2samp(a[i], b[i], test_type=test_type,
+                                       equal_var=equal_var,
+                                       alt_hyp=alt_hyp[i], alpha=alpha)
+
+                    self.assertTrue(abs(test.t_stat -
+                                        batch.t_stat[i]) <= EPSILON)
+                    self.assertTrue(abs(test.p_val -
+                                        batch.p_val[i]) <= EPSILON)
+                    self.assertEqual(reject_null[i], test.p_val < alpha)
+
+class TestRunningStats(unittest.TestCase):
+    def test_update_and_merge(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        a = stats.norm.rvs(loc=1e6, scale=10, size=1000)
+
+        events = running_stats()
+        for x in a[:100]:
+            events.update(x)
+
+        chunks = running_stats()
+        for start in range(100, 1000, 90):
+            chunks.update(a[start:start + 90])
+
+        events.merge(chunks)
+
+        self.assertEqual(events.n, 1000)
+        self.assertTrue(np.allclose(events.mean, a.mean(), rtol=1e-14))
+        self.assertTrue(np.allclose(events.var, a.var(ddof=1), rtol=1e-9))
+
+    def test_ttests(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        a = stats.norm.rvs(loc=5, scale=10, size=500)
+        b = stats.norm.rvs(loc=5, scale=10, size=300)
+
+        acc_a = running_stats().update(a)
+        acc_b = running_stats().update(b)
+
+        expected = ttest_1samp(a, 4.5, alt_hyp='less', alpha=0.1)
+        test = acc_a.ttest_1samp(4.5, alt_hyp='less', alpha=0.1)
+
+        self.assertTrue(abs(test.t_stat - expected.t_stat) <= EPSILON)
+        self.assertTrue(abs(test.p_val - expected.p_val) <= EPSILON)
+
+        expected = ttest_2samp(a, b, equal_var=False)
+        test = acc_a.ttest_2samp(acc_b, equal_var=False)
+
+        self.assertTrue(abs(test.t_stat - expected.t_stat) <= EPSILON)
+        self.assertTrue(abs(test.p_val - expected.p_val) <= EPSILON)
+
+    def test_too_few_observations(self):
+        empty = running_stats()
+        single = running_stats().update(1.0)
+        full = running_stats().update(np.arange(10.0))
+
+        self.assertRaises(ValueError, empty.ttest_1samp, 0.5)
+        self.assertRaises(ValueError, single.ttest_1samp, 0.5)
+        self.assertRaises(ValueError, empty.ttest_2samp, full)
+        self.assertRaises(ValueError, full.ttest_2samp, empty)
+
+class TestResampling(unittest.TestCase):
+    def setUp(self):
+        seed = 1234567890
+        np.random.seed(seed)
+
+        self.a = stats.norm.rvs(loc=5.5, scale=2, size=30)
+        self.b = stats.norm.rvs(loc=5, scale=2, size=30)
+
+    def test_invalid_method(self):
+        self.assertRaises(ValueError, ttest_1samp, self.a, 5,
+                          method='bad_method')
+        self.assertRaises(ValueError, ttest_2samp, self.a, self.b,
+                          method='bad_method')
+
+    def test_invalid_workers(self):
+        for workers in (0, -1):
+            self.assertRaises(ValueError, ttest_1samp, self.a, 5,
+                              method='permutation', workers=workers)
+            self.assertRaises(ValueError, ttest_2samp, self.a, self.b,
+                              method='bootstrap', workers=workers)
+
+    def test_close_to_t_distribution(self):
+        for method in ('permutation', 'bootstrap'):
+            for test_type in ('ind', 'rel'):
+                expected = ttest_2samp(self.a, self.b, test_type=test_type)
+                test = ttest_2samp(self.a, self.b, test_type=test_type,
+                                   method=method, seed=1)
+
+                self.assertEqual(test.t_stat, expected.t_stat)
+                self.assertEqual(test.resamples, 9999)
+                self.assertTrue(abs(test.p_val - expected.p_val) < 0.03)
+
+            expected = ttest_1samp(self.a, 5, alt_hyp='greater')
+            test = ttest_1samp(self.a, 5, alt_hyp='greater', method=method,
+                               seed=1)
+
+            self.assertTrue(abs(test.p_val - expected.p_val) < 0.03)
+
+    def test_reproducible(self):
+        test = ttest_2samp(self.a, self.b, method='permutation', seed=7)
+
+        same = ttest_2samp(self.a, self.b, method='permutation', seed=7,
+                           workers=2)
+        self.assertEqual(test.p_val, same.p_val)
+
+        other = ttest_2samp(self.a, self.b, method='permutation', seed=8)
+        self.assertNotEqual(test.p_val, other.p_val)
+
+    def test_early_stopping(self):
+        test = ttest_1samp(self.a + 2, 5, alpha=0.05, method='permutation',
+                           seed=1)
+
+        self.assertTrue(test.resamples < test.n_resamples)
+        self.assertTrue(test.p_val < 0.05)
+        self.assertEqual(test.to_dict()['sig_test'],
+                         "Permutation T-Test (two-sided)")
+        self.assertEqual(test.to_dict()['resamples'], test.resamples)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+"""
+Useful wrapper classes around Python stat library functionality.
+
+Only `ols` is imported along with the package. The other wrappers are
+imported from their modules the first time they are accessed as attributes
+of the package (e.g. `wrappers.ttest_1samp`), and the heavy SciPy submodules
+are only loaded once they are actually needed (see the `lazy` module), so
+that short-lived jobs do not pay for the parts of the package they never
+use (see benchmarks/bench_import.py).
+
+"""
+
+import sys
+from importlib import import_module
+
+# The module of the same name is bound to the package attribute `ols` when it
+# is first imported, which `from .ols import ols` then replaces with the
+# class. Importing it later on would leave the module there instead.
+from .ols import ols
+
+
+# The public names of the package, and the modules from which they are
+# imported on first access.
+EXPORTS = {
+    'rolling_ols': 'rolling',
+    'ttest_1samp': 'ttest',
+    'ttest_2samp': 'ttest',
+    'ttest_1samp_batch': 'ttest',
+    'ttest_2samp_batch': 'ttest',
+    'ttest_results': 'ttest',
+    'running_stats': 'ttest',
+    'ols_sharded': 'parallel',
+    'adjust_p_values': 'multitest',
+    'residual_moments': 'moments',
+    'recording': 'instrument',
+    'dump': 'serialize',
+    'load': 'serialize',
+    'load_all': 'serialize',
+    'result_writer': 'serialize',
+    'async_writer': 'serialize',
+    'model_table': 'tables',
+    'coefficient_table': 'tables',
+    'ttest_table': 'tables',
+    'to_parquet': 'tables',
+}
+
+__all__ = ['ols'] + sorted(EXPORTS)
+
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError("module '" + __name__ + "' has no " +
+                             "attribute '" + name + "'")
+
+    value = getattr(import_module('.' + EXPORTS[name], __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(EXPORTS))
+
+
+# Python < 3.7 does not look up module attributes with __getattr__,
+# in which case everything is imported right away instead.
+if sys.version_info < (3, 7):
+    for _name in EXPORTS:
+        __getattr__(_name)
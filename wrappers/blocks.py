@@ -0,0 +1,77 @@
+"""
+Block-wise processing of observations that do not fit in memory.
+
+Observations stored in .npy files can be passed to the OLS and t-test
+wrappers as a `numpy.memmap` (e.g. from `numpy.load(..., mmap_mode='r')`)
+or directly as the path to the file. Such observations are never copied as
+a whole. Instead, they are read in blocks of consecutive rows, each of which
+is reduced to mergeable statistics (cross-product matrices, residual
+moments, or sample moments) before the next one is read.
+
+"""
+
+from __future__ import division
+
+import numpy as np
+
+try:
+    string_types = (str, unicode)
+
+# Python 3, in which all strings are unicode.
+except NameError:
+    string_types = (str,)
+
+
+# The default number of bytes of observations read in each block.
+BLOCK_BYTES = 2 ** 26
+
+
+def open_mapped(a):
+    """
+
+    Returns the array stored in the .npy file at `a`, memory-mapped in
+    read-only mode, if `a` is a path. Otherwise, `a` is returned untouched.
+
+    """
+
+    if isinstance(a, string_types):
+        return np.load(a, mmap_mode='r')
+
+    return a
+
+
+def is_mapped(a):
+    """
+
+    Returns whether `a` is a memory-mapped array, which should be processed
+    in blocks instead of as a whole.
+
+    """
+
+    return isinstance(a, np.memmap)
+
+
+def block_bounds(nrows, row_bytes, block_size=None):
+    """
+
+    Returns the bounds `(start, stop)` of the blocks of consecutive rows in
+    which `nrows` rows of `row_bytes` bytes each are processed. By default,
+    each block holds about BLOCK_BYTES bytes.
+
+    """
+
+    block_size = block_size or max(1, BLOCK_BYTES // max(row_bytes, 1))
+
+    return [(start, min(start + block_size, nrows))
+            for start in range(0, nrows, block_size)]
+
+
+def read_block(a, start, stop):
+    """
+
+    Reads the rows of `a` between `start` and `stop` into memory as an array
+    of floats.
+
+    """
+
+    return np.asarray(a[start:stop], dtype=float)
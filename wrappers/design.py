@@ -0,0 +1,309 @@
+"""
+Design matrices of the OLS wrapper built from data frames and formulas.
+
+A data frame is anything whose columns are accessed by name with
+`frame[name]`, e.g. a pandas DataFrame, a dictionary of arrays, or a NumPy
+structured array (such as the tables of the `tables` module). The design
+matrix is allocated once, in Fortran order (i.e. column by column, as LAPACK
+expects), with the constant as its first column, and each column of the frame
+is written directly into its column(s) of the matrix. Rows with a missing
+value in any of the columns used are dropped while the columns are written,
+so the data is never copied as a whole before that.
+
+Columns that are not numeric (or that are listed as categorical) are
+expanded into one dummy column per level but the first, which is the
+reference level absorbed by the constant. The dummy columns of a variable are
+filled in with a single scatter of ones, without forming an indicator matrix.
+
+The formulas are a light version of those of R and statsmodels:
+
+    'y ~ x1 + x2 + C(group)'
+
+where C() marks a numeric column as categorical. The constant is always
+included, so it cannot be removed with '- 1' or '+ 0'.
+
+"""
+
+from __future__ import division
+
+import re
+
+import numpy as np
+
+
+CATEGORICAL = re.compile(r'^C\((.+)\)$')
+
+
+def parse_formula(formula):
+    """
+
+    Parses `formula` into the name of the dependent variable, the names of
+    the independent variables, and the names of those among them marked as
+    categorical with C(). Throws a ValueError if the formula is invalid.
+
+    """
+
+    if formula.count('~') != 1:
+        raise ValueError("Invalid formula. Expected one '~' between the " +
+                         "dependent and independent variables " +
+                         "but got: '" + formula + "'")
+
+    lhs, rhs = formula.split('~')
+    y = lhs.strip()
+
+    if '-' in rhs:
+        raise ValueError("Invalid formula. The constant is always " +
+                         "included and no term can be removed " +
+                         "but got: '" + formula + "'")
+
+    x, categorical = [], []
+
+    for term in rhs.split('+'):
+        term = term.strip()
+
+        if term == '1':
+            continue
+
+        if term == '0':
+            raise ValueError("Invalid formula. The constant is always " +
+                             "included and cannot be removed " +
+                             "but got: '" + formula + "'")
+
+        match = CATEGORICAL.match(term)
+
+        if match:
+            term = match.group(1).strip()
+            categorical.append(term)
+
+        if not term or not y:
+            raise ValueError("Invalid formula. Expected variable names " +
+                             "on both sides of '~' " +
+                             "but got: '" + formula + "'")
+
+        x.append(term)
+
+    return y, x, categorical
+
+
+def column_names(frame):
+    """
+
+    Returns the names of the columns of `frame`.
+
+    """
+
+    if hasattr(frame, 'columns'):
+        return [str(name) for name in frame.columns]
+
+    if getattr(frame, 'dtype', None) is not None and frame.dtype.names:
+        return list(frame.dtype.names)
+
+    return list(frame.keys())
+
+
+def codes(column, keep=None):
+    """
+
+    Returns the levels of the categorical `column` present in the rows
+    selected by `keep` (all of them if None), sorted, along with the level
+    code of each of those rows. Pandas categorical columns are expanded from
+    their codes, without converting their values.
+
+    """
+
+    categories = getattr(getattr(column, 'cat', None), 'categories', None)
+
+    if categories is not None:
+        values = np.asarray(column.cat.codes)
+        values = values if keep is None else values[keep]
+
+        present, code = np.unique(values, return_inverse=True)
+
+        return [str(categories[i]) for i in present], code
+
+    values = np.asarray(column)
+    values = values if keep is None else values[keep]
+
+    levels, code = np.unique(values.astype(str) if values.dtype == object
+                             else values, return_inverse=True)
+
+    return [str(level) for level in levels], code
+
+
+def is_categorical(column):
+    """
+
+    Returns whether `column` is expanded into dummy columns by default, i.e.
+    if it is a pandas categorical column or if it is not numeric.
+
+    """
+
+    if getattr(column, 'cat', None) is not None:
+        return True
+
+    return np.asarray(column).dtype.kind not in 'biuf'
+
+
+def missing(column):
+    """
+
+    Returns a boolean array marking the missing values of `column`: NaN,
+    None, or the code -1 of a pandas categorical column.
+
+    """
+
+    if getattr(column, 'cat', None) is not None:
+        return np.asarray(column.cat.codes) == -1
+
+    values = np.asarray(column)
+
+    if values.dtype.kind == 'f':
+        return np.isnan(values)
+
+    if values.dtype == object:
+        return np.array([value is None or value != value for value in values],
+                        dtype=bool)
+
+    return np.zeros(len(values), dtype=bool)
+
+
+def design_matrix(frame, y, x, categorical=()):
+    """
+
+    Builds the design matrix of the regression of the column(s) `y` of
+    `frame` on its columns `x`, dropping the rows with missing values.
+    Returns the design matrix (constant first), the observations of the
+    dependent variable(s), and the names of the independent variables (not
+    including the constant).
+
+    Parameters
+    ----------
+    frame : data frame
+        See the module docstring.
+
+    y : string or list
+        The name of the dependent variable, or a list of names in which case
+        the observations are returned as a matrix with one column per name.
+
+    x : list
+        The names of the independent variables.
+
+    categorical : list, optional
+        The names of the numeric variables to expand into dummy columns.
+
+    """
+
+    names = column_names(frame)
+    y_names = y if isinstance(y, list) else [y]
+
+    for name in y_names + list(x):
+        if name not in names:
+            raise ValueError("Invalid variable. Expected the name of a " +
+                             "column of the frame but got: '" + name + "'")
+
+    columns = [frame[name] for name in x]
+    y_columns = [frame[name] for name in y_names]
+
+    drop = np.zeros(len(y_columns[0]), dtype=bool)
+
+    for column in columns + y_columns:
+        drop |= missing(column)
+
+    keep = ~drop if drop.any() else None
+    nobs = len(drop) if keep is None else int(keep.sum())
+
+    # The levels of each variable are needed to know the
+    # width of the design matrix before allocating it.
+    expanded = []
+    width = 1
+
+    for name, column in zip(x, columns):
+        if name in categorical or is_categorical(column):
+            levels, code = codes(column, keep)
+            expanded.append((levels, code))
+            width += len(levels) - 1
+
+        else:
+            expanded.append(None)
+            width += 1
+
+    design = np.zeros((nobs, width), order='F')
+    design[:, 0] = 1.0
+
+    x_varnm = []
+    start = 1
+
+    for name, column, levels in zip(x, columns, expanded):
+        if levels is None:
+            values = np.asarray(column)
+            design[:, start] = values if keep is None else values[keep]
+
+            x_varnm.append(name)
+            start += 1
+            continue
+
+        levels, code = levels
+        rows = np.flatnonzero(code)
+
+        design[rows, start + code[rows] - 1] = 1.0
+
+        x_varnm.extend(name + '[' + level + ']' for level in levels[1:])
+        start += len(levels) - 1
+
+    y_values = np.empty((nobs, len(y_names)), order='F')
+
+    for j, column in enumerate(y_columns):
+        values = np.asarray(column, dtype=float)
+        y_values[:, j] = values if keep is None else values[keep]
+
+    if not isinstance(y, list):
+        y_values = y_values[:, 0]
+
+    return design, y_values, x_varnm
+
+
+def variable_names(nvars, nresp, x_varnm=None, y_varnm='y', const=True):
+    """
+
+    Returns the names of the `nvars` independent variables, preceded by the
+    name of the constant if `const` is True, and of the `nresp` dependent
+    variables, generated from the names `x_varnm` and `y_varnm` passed into
+    the __init__ method of the `ols` class.
+
+    """
+
+    if not x_varnm:
+        if nvars == 1:
+            x_varnm = ['x']
+
+        else:
+            x_varnm = ['x' + str(i) for i in range(1, nvars + 1)]
+
+    if const:
+        x_varnm = ['const'] + x_varnm
+
+    if nresp > 1 and not isinstance(y_varnm, list):
+        y_varnm = [y_varnm + str(i) for i in range(1, nresp + 1)]
+
+    elif nresp == 1 and isinstance(y_varnm, list):
+        y_varnm = y_varnm[0]
+
+    return x_varnm, y_varnm
+
+
+def add_constant(x):
+    """
+
+    Returns the design matrix made of a column of ones followed by the
+    columns of `x`, allocated once in Fortran order.
+
+    """
+
+    x = np.asarray(x)
+    x = x.reshape(x.shape[0], -1)
+
+    design = np.empty((x.shape[0], x.shape[1] + 1), order='F')
+    design[:, 0] = 1.0
+    design[:, 1:] = x
+
+    return design
@@ -0,0 +1,173 @@
+"""
+Within transformation for OLS models with fixed effects.
+
+Instead of appending one dummy column per level of each group to the
+observations, the effects are absorbed by subtracting the group means from
+the observations (the within transformation), after which the slopes are
+estimated on the demeaned observations without a constant. With several
+effects, the observations are demeaned by each of them in turn until
+convergence (the method of alternating projections), which converges to
+the same slopes as a regression on all of the dummy columns.
+
+The group sums are computed as the product of a sparse matrix mapping the
+observations to their groups with the observations, so that the dummy
+matrix is never formed and every pass is linear in the number of rows.
+
+"""
+
+from __future__ import division
+
+import warnings
+
+import numpy as np
+
+from .lazy import lazy_import
+
+sparse = lazy_import('scipy.sparse')
+
+
+def group_codes(groups, nobs):
+    """
+
+    Converts `groups`, which is either an array with the group of each of
+    the `nobs` observations or a list of such arrays (one per effect), into
+    a list of integer codes arrays, each with the levels numbered from 0.
+    Throws a ValueError if any of the arrays does not have `nobs` entries.
+
+    """
+
+    if not isinstance(groups, (list, tuple)):
+        groups = [groups]
+
+    codes = []
+
+    for group in groups:
+        group = np.asarray(group)
+
+        if group.shape != (nobs,):
+            raise ValueError("Invalid groups. Expected one group " +
+                             "per observation (" + str(nobs) + ") " +
+                             "but got an array of shape: " + str(group.shape))
+
+        codes.append(np.unique(group, return_inverse=True)[1])
+
+    return codes
+
+
+def absorbed_levels(codes):
+    """
+
+    Returns the number of parameters absorbed by the fixed effects whose
+    levels are given by `codes`, i.e. the number of linearly independent
+    dummy columns (the constant included). For two effects, the levels
+    that are redundant are counted exactly from the connected components of
+    the bipartite graph of their levels. For more effects, one level of each
+    effect but the first is assumed to be redundant, which is exact whenever
+    all of the effects are connected.
+
+    """
+
+    levels = [int(code.max()) + 1 for code in codes]
+
+    if len(codes) == 2:
+        from scipy.sparse.csgraph import connected_components
+
+        # The nodes of the graph are the levels of both effects, and
+        # each observation links its level of one to that of the other.
+        nodes = sum(levels)
+        graph = sparse.csr_matrix((np.ones(len(codes[0])),
+                                   (codes[0], levels[0] + codes[1])),
+                                  shape=(nodes, nodes))
+
+        return nodes - connected_components(graph, directed=False)[0]
+
+    return sum(levels) - (len(codes) - 1)
+
+
+def group_sums(a, code, weights=None):
+    """
+
+    Returns the (weighted) sums of the observations `a` within each of the
+    groups given by `code`, with one row per group, along with the (weighted)
+    number of observations in each group.
+
+    """
+
+    nobs = len(code)
+    weights = np.ones(nobs) if weights is None else weights
+
+    indicator = sparse.csr_matrix((weights, (code, np.arange(nobs))),
+                                  shape=(int(code.max()) + 1, nobs))
+
+    return indicator.dot(a), np.asarray(indicator.sum(axis=1)).ravel()
+
+
+def group_means(a, code, weights=None):
+    """
+
+    Returns the (weighted) mean of the observations `a` within each of the
+    groups given by `code`, repeated for each observation.
+
+    """
+
+    sums, totals = group_sums(a, code, weights)
+
+    return (sums.T / totals).T[code]
+
+
+def demean(a, codes, weights=None, tol=1e-10, max_iter=1000):
+    """
+
+    Subtracts the (weighted) group means of the fixed effects given by
+    `codes` from the observations `a` (one column per variable), by
+    alternating projections if there are several effects. Returns the
+    demeaned observations as a new array.
+
+    Parameters
+    ----------
+    a : numpy.ndarray
+        The observations, as an array or a matrix.
+
+    codes : list of numpy.ndarray
+        The levels of each of the effects, as returned by `group_codes`.
+
+    weights : numpy.ndarray, optional
+        The weights of the observations.
+
+    tol : float, optional
+        The convergence tolerance of the alternating projections, relative to
+        the largest observation. The default is 1e-10.
+
+    max_iter : int, optional
+        The maximum number of sweeps over all of the effects, after which a
+        RuntimeWarning is issued if the projections have not converged. The
+        default is 1000.
+
+    """
+
+    a = np.array(a, dtype=float)
+
+    if len(codes) == 1:
+        return a - group_means(a, codes[0], weights)
+
+    scale = tol * max(np.abs(a).max(), 1.0)
+
+    for _ in range(max_iter):
+        change = 0.0
+
+        for code in codes:
+            means = group_means(a, code, weights)
+            a -= means
+
+            change = max(change, np.abs(means).max())
+
+        if change <= scale:
+            break
+
+    else:
+        warnings.warn("The alternating projections did not converge " +
+                      "within " + str(max_iter) + " sweeps, so the " +
+                      "observations are only partially demeaned",
+                      RuntimeWarning)
+
+    return a
@@ -0,0 +1,248 @@
+"""
+Opt-in instrumentation of the hot paths of the wrappers, i.e. the estimate
+and summary of `ols` models and the `test` methods of the single t-tests.
+
+Each instrumented call is divided into stages (e.g. 'solve', 'residuals',
+and 'p_values' when estimating an OLS model), and once the call is done,
+one record per stage is passed to each of the registered hooks. A record is
+a flat dictionary, so that records from many calls can be aggregated (see
+`summarize`) or saved with the `serialize` module:
+
+    event       : the instrumented call (e.g. 'ols.estimate')
+    call        : a number identifying the call, shared by its stages
+    stage       : the name of the stage
+    seconds     : the wall-clock time spent in the stage
+    bytes       : the memory still allocated at the end of the stage
+    peak_bytes  : the peak memory allocated during the stage
+    blocks      : the number of memory blocks allocated during the stage
+                  and still allocated at its end, net of those freed
+
+along with the sizes of the inputs of the call (e.g. `nobs` and `ncoef`).
+The memory fields are only filled in while `tracemalloc` is tracing (see
+`recording`) and are None otherwise. `tracemalloc` does not count the
+allocations themselves, so `blocks` is the difference between the numbers
+of blocks in snapshots taken at the beginning and end of the stage (e.g. the
+new arrays kept by the stage), which misses the blocks that were allocated
+and freed within it.
+
+When no hook is registered, which is the default, the instrumented calls
+get a clock that does nothing, so the overhead is that of a few no-op
+method calls per call.
+
+"""
+
+from __future__ import division
+
+import tracemalloc
+from itertools import count
+from time import perf_counter
+
+
+_hooks = []
+_calls = count()
+
+
+def reset_peak():
+    """
+
+    Resets the peak memory traced by `tracemalloc` to the current memory,
+    which is only possible on Python >= 3.9. On older versions, the peaks of
+    the stages are those since tracing started, i.e. upper bounds.
+
+    """
+
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+
+def traced_blocks():
+    """
+
+    Returns the number of memory blocks currently traced by `tracemalloc`.
+
+    """
+
+    return len(tracemalloc.take_snapshot().traces)
+
+
+def add_hook(hook):
+    """
+
+    Registers `hook`, which is then called with each record (see the module
+    docstring) of the instrumented calls.
+
+    """
+
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """
+
+    Unregisters `hook`, which must have been registered with `add_hook`.
+
+    """
+
+    _hooks.remove(hook)
+
+
+class null_clock(object):
+    __slots__ = ()
+
+    def lap(self, stage):
+        pass
+
+    def done(self, **sizes):
+        pass
+
+NULL_CLOCK = null_clock()
+
+
+class stage_clock(object):
+    __slots__ = ('event', 'laps', 'last', 'memory', 'start', 'blocks')
+
+    def __init__(self, event):
+        """
+
+        Starts timing the stages of a call to `event`. Note that instances
+        are only meant to be created through `clock`.
+
+        """
+
+        self.event = event
+        self.laps = []
+        self.memory = tracemalloc.is_tracing()
+
+        if self.memory:
+            self.blocks = traced_blocks()
+            self.start = tracemalloc.get_traced_memory()[0]
+            reset_peak()
+
+        self.last = perf_counter()
+
+    def lap(self, stage):
+        """
+
+        Ends the stage named `stage`, which began at the end of the previous
+        stage (or when the clock was created), and begins the next one.
+
+        """
+
+        seconds = perf_counter() - self.last
+        nbytes = peak = blocks = None
+
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            nbytes, peak = current - self.start, peak - self.start
+
+            # The snapshot is freed before the memory of the next stage
+            # is measured, so it does not count towards either stage.
+            blocks = traced_blocks()
+            blocks, self.blocks = blocks - self.blocks, blocks
+
+            self.start = tracemalloc.get_traced_memory()[0]
+            reset_peak()
+
+        self.laps.append((stage, seconds, nbytes, peak, blocks))
+        self.last = perf_counter()
+
+    def done(self, **sizes):
+        """
+
+        Ends the call and passes the records of its stages, along with the
+        sizes of its inputs given as keyword arguments, to the hooks.
+
+        """
+
+        call = next(_calls)
+
+        for stage, seconds, nbytes, peak, blocks in self.laps:
+            record = {'event': self.event, 'call': call, 'stage': stage,
+                      'seconds': seconds, 'bytes': nbytes,
+                      'peak_bytes': peak, 'blocks': blocks}
+            record.update(sizes)
+
+            for hook in list(_hooks):
+                hook(record)
+
+
+def clock(event):
+    """
+
+    Returns the clock with which the stages of a call to `event` are timed,
+    which does nothing if no hook is registered.
+
+    """
+
+    if not _hooks:
+        return NULL_CLOCK
+
+    return stage_clock(event)
+
+
+class recording(object):
+
+    def __init__(self, memory=False):
+        """
+
+        Context manager that collects the records of the instrumented calls
+        made within it into a list, which is returned when entering it.
+
+        Parameters
+        ----------
+        memory : bool, optional
+            Indicates whether the memory allocated in each stage should be
+            recorded, in which case `tracemalloc` is started (if it is not
+            already tracing) until the context manager exits. Note that this
+            slows down the calls considerably. The default is 'False'.
+
+        """
+
+        self.memory = memory
+        self.records = []
+        self.started = False
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+
+        add_hook(self.records.append)
+
+        return self.records
+
+    def __exit__(self, *exc_info):
+        remove_hook(self.records.append)
+
+        if self.started:
+            tracemalloc.stop()
+            self.started = False
+
+
+def summarize(records):
+    """
+
+    Aggregates `records` by event and stage, and returns a dictionary that
+    maps each (event, stage) pair to the number of records, along with the
+    total, mean, and maximum of their `seconds`.
+
+    """
+
+    totals = {}
+
+    for record in records:
+        key = (record['event'], record['stage'])
+        seconds = record['seconds']
+
+        if key not in totals:
+            totals[key] = {'count': 0, 'total': 0.0, 'max': 0.0}
+
+        stats = totals[key]
+        stats['count'] += 1
+        stats['total'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+
+    for stats in totals.values():
+        stats['mean'] = stats['total'] / stats['count']
+
+    return totals
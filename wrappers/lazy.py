@@ -0,0 +1,36 @@
+"""
+Deferred imports of the heavy SciPy submodules used by the wrappers.
+
+Importing scipy.linalg, scipy.special, or scipy.sparse takes several times
+longer than a typical fit, and most jobs only ever need some of them (e.g. a
+single t-test never touches scipy.linalg). The modules of this package
+therefore bind those submodules with `lazy_import`, which returns a module
+object whose contents are only loaded the first time one of its attributes
+is accessed, after which it behaves like the module imported normally.
+
+"""
+
+import sys
+from importlib.util import LazyLoader, find_spec, module_from_spec
+
+
+def lazy_import(name):
+    """
+
+    Returns the module `name`, which is loaded on first attribute access
+    unless it has already been imported. Note that its parent packages are
+    imported right away.
+
+    """
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = find_spec(name)
+    spec.loader = LazyLoader(spec.loader)
+
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    return module
@@ -0,0 +1,240 @@
+"""
+Moments of regression model residuals, from which all of the residual
+diagnostics reported by the OLS wrapper (the Durbin-Watson statistic, the
+skew and kurtosis, and the JB and Omnibus normality tests) are derived.
+
+The moments are computed together in a single sweep over the residuals
+instead of letting each diagnostic rescan them on its own, and they can be
+merged, so residuals that are split into consecutive chunks can also be
+summarized chunk by chunk.
+
+"""
+
+from __future__ import division
+
+from numpy import diff, errstate, log, nan, sign, sqrt, square, where
+from numpy import abs as np_abs
+from numpy import sum as np_sum
+
+from .pvalues import chi2_sf
+
+
+class residual_moments(object):
+    __slots__ = ('nobs', 'mean', 'm2', 'm3', 'm4', 'dsq', 'first', 'last')
+
+    def __init__(self, e=None, weights=None):
+        """
+
+        Computes the moments of a set of regression model residuals.
+
+        Parameters
+        ----------
+        e : numpy.ndarray, optional
+            An array of residuals. If a matrix is passed in, each of its
+            columns is considered to be the residuals of a separate model.
+            If no residuals are passed in, the moments of an empty set of
+            residuals are initialized, which can then be merged with others.
+
+        weights : numpy.ndarray, optional
+            Frequency weights of the residuals, i.e. the number of times that
+            each of them occurs. The moments are those of the residuals with
+            each of them repeated as many times as its weight, with repeated
+            residuals considered to be consecutive, so repetitions do not add
+            to the squared differences between consecutive residuals.
+
+        The moments computed are stored as attributes of the instance.
+        They are as follows:
+
+        nobs : number of residuals
+
+        mean : mean of the residuals
+
+        m2, m3, m4 : sums of the 2nd, 3rd, and 4th powers of the deviations
+                     of the residuals from their mean
+
+        ssr : sum of the residuals squared
+
+        dsq : sum of the squared differences between consecutive residuals
+
+        first, last : the first and last residuals, which are needed to
+                      account for the difference across chunks when merging
+
+        """
+
+        if e is None:
+            self.nobs = 0
+            self.mean = self.m2 = self.m3 = self.m4 = 0.0
+            self.dsq = 0.0
+            self.first = self.last = None
+
+            return
+
+        if weights is None:
+            self.nobs = e.shape[0]
+            self.mean = e.mean(axis=0)
+
+        else:
+            weights = weights.reshape((-1,) + (1,) * (len(e.shape) - 1))
+
+            self.nobs = weights.sum()
+            self.mean = np_sum(weights * e, axis=0) / self.nobs
+
+        d = e - self.mean
+        d2 = d * d
+        wd2 = d2 if weights is None else weights * d2
+
+        self.m2 = np_sum(wd2, axis=0)
+        self.m3 = np_sum(wd2 * d, axis=0)
+        self.m4 = np_sum(wd2 * d2, axis=0)
+
+        de = diff(e, 1, axis=0)
+        self.dsq = np_sum(de * de, axis=0)
+
+        # Copies are made so that the residuals can be freed.
+        self.first = e[0].copy()
+        self.last = e[-1].copy()
+
+    @property
+    def ssr(self):
+        return self.m2 + self.nobs * square(self.mean)
+
+    def merge(self, other):
+        """
+
+        Merges the moments of `other` into these moments, where the residuals
+        of `other` are considered to directly follow these residuals. The
+        merge uses the pairwise update formulas of Chan et al. and Pebay,
+        which remain numerically stable for large chunks. Returns itself.
+
+        """
+
+        if other.nobs == 0:
+            return self
+
+        if self.nobs == 0:
+            for attr in self.__slots__:
+                setattr(self, attr, getattr(other, attr))
+
+            return self
+
+        na, nb = self.nobs, other.nobs
+        n = na + nb
+
+        delta = other.mean - self.mean
+        delta_n = delta / n
+
+        m2 = self.m2 + other.m2 + delta * delta_n * na * nb
+        m3 = (self.m3 + other.m3 +
+              delta * delta_n * delta_n * na * nb * (na - nb) +
+              3 * delta_n * (na * other.m2 - nb * self.m2))
+        m4 = (self.m4 + other.m4 +
+              delta * square(delta_n) * delta_n * na * nb *
+              (na * na - na * nb + nb * nb) +
+              6 * square(delta_n) * (na * na * other.m2 + nb * nb * self.m2) +
+              4 * delta_n * (na * other.m3 - nb * self.m3))
+
+        self.dsq = self.dsq + other.dsq + square(other.first - self.last)
+        self.last = other.last
+
+        self.mean = self.mean + delta_n * nb
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.nobs = n
+
+        return self
+
+    def skew(self):
+        """
+
+        Returns the (biased) sample skewness of the residuals, which is the
+        same as the default computed by the stats.skew method from SciPy.
+
+        """
+
+        with errstate(divide='ignore', invalid='ignore'):
+            return (self.m3 / self.nobs) / (self.m2 / self.nobs) ** 1.5
+
+    def kurtosis(self):
+        """
+
+        Returns the (biased) sample kurtosis of the residuals, using
+        Pearson's definition (i.e. 3.0 for normally distributed data).
+
+        """
+
+        with errstate(divide='ignore', invalid='ignore'):
+            return (self.m4 / self.nobs) / square(self.m2 / self.nobs)
+
+    def dw(self):
+        """
+
+        Returns the Durbin-Watson statistic of the residuals.
+
+        """
+
+        with errstate(divide='ignore', invalid='ignore'):
+            return self.dsq / self.ssr
+
+    def JB(self):
+        """
+
+        Performs the JB test for normality on the residuals. Returns the JB
+        statistic and its associated p-value as well as the skew and kurtosis.
+
+        """
+
+        skew = self.skew()
+        kurtosis = self.kurtosis()
+
+        JB = (self.nobs / 6) * (square(skew) + (1 / 4) * square(kurtosis - 3))
+        JBpv = chi2_sf(JB, 2)
+
+        return JB, JBpv, skew, kurtosis
+
+    def omni(self):
+        """
+
+        Performs the Omnibus (D'Agostino-Pearson) test for normality on the
+        residuals, which combines the skew and kurtosis tests in the same way
+        as the stats.normaltest method from SciPy. Returns the Omnibus
+        statistic and its associated p-value. Note that this test requires
+        at least eight residuals, and 'nan' is returned otherwise.
+
+        """
+
+        n = self.nobs
+
+        if n < 8:
+            nans = self.m2 * nan
+            return nans, nans
+
+        with errstate(divide='ignore', invalid='ignore'):
+            # skew test
+            y = self.skew() * sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+            beta2 = (3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) /
+                     ((n - 2.0) * (n + 5) * (n + 7) * (n + 9)))
+            W2 = -1 + sqrt(2 * (beta2 - 1))
+            delta = 1 / sqrt(0.5 * log(W2))
+            alpha = sqrt(2.0 / (W2 - 1))
+            y = where(y == 0, 1, y)
+            zs = delta * log(y / alpha + sqrt(square(y / alpha) + 1))
+
+            # kurtosis test
+            E = 3.0 * (n - 1) / (n + 1)
+            varb2 = (24.0 * n * (n - 2) * (n - 3) /
+                     ((n + 1) * (n + 1.) * (n + 3) * (n + 5)))
+            x = (self.kurtosis() - E) / sqrt(varb2)
+            sqrtbeta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9)) *
+                         sqrt((6.0 * (n + 3) * (n + 5)) /
+                              (n * (n - 2) * (n - 3))))
+            A = 6.0 + 8.0 / sqrtbeta1 * (2.0 / sqrtbeta1 +
+                                         sqrt(1 + 4.0 / (sqrtbeta1 ** 2)))
+            term1 = 1 - 2 / (9.0 * A)
+            denom = 1 + x * sqrt(2 / (A - 4.0))
+            term2 = sign(denom) * where(denom == 0.0, nan,
+                                        ((1 - 2.0 / A) /
+                                         np_abs(denom)) ** (1 / 3.0))
+            zk = (term1 - term2) / sqrt(2 / (9.0 * A))
+
+        omni = square(zs) + square(zk)
+
+        return omni, chi2_sf(omni, 2)
@@ -0,0 +1,93 @@
+"""
+Corrections of the p-values of many t-tests for multiple testing.
+
+When many null hypotheses are tested at once, comparing each p-value to
+`alpha` rejects far more true null hypotheses than `alpha` suggests. The
+corrections below adjust the p-values so that comparing the adjusted
+p-values to `alpha` instead controls the family-wise error rate ('holm' and
+'bonferroni') or the false discovery rate ('fdr_bh') at `alpha`.
+
+The step-down (Holm) and step-up (Benjamini-Hochberg) procedures are computed
+from a single sort of the p-values followed by a cumulative maximum or
+minimum, so the cost is O(n log n) in the number of p-values.
+
+"""
+
+from __future__ import division
+
+import numpy as np
+
+
+CORRECTIONS = ('holm', 'fdr_bh', 'bonferroni')
+
+
+def check_correction(correction):
+    """
+
+    Throws a ValueError if `correction` is not one of the supported
+    corrections for multiple testing.
+
+    """
+
+    if correction not in CORRECTIONS:
+        raise ValueError("Invalid correction. " +
+                         "Expected 'holm', 'fdr_bh', or 'bonferroni' " +
+                         "but got: '" + str(correction) + "'")
+
+
+def adjust_p_values(p_val, correction='fdr_bh'):
+    """
+
+    Returns the p-values `p_val` adjusted for multiple testing, as an array
+    of the same shape. NaN p-values (e.g. of t-tests on constant samples)
+    are not counted as tests and are left as NaN.
+
+    Parameters
+    ----------
+    p_val : array_like
+        The p-values of the t-tests.
+
+    correction : string, optional
+        The correction applied. Allowed options are 'holm', 'fdr_bh', and
+        'bonferroni'. 'holm' is Holm's step-down procedure and 'bonferroni'
+        the Bonferroni correction, both of which control the family-wise
+        error rate. 'fdr_bh' is the Benjamini-Hochberg step-up procedure,
+        which controls the false discovery rate. The default is 'fdr_bh'.
+
+    """
+
+    check_correction(correction)
+
+    p_val = np.asarray(p_val, dtype=float)
+    adjusted = np.full(p_val.shape, np.nan)
+
+    valid = ~np.isnan(p_val)
+    p = p_val[valid]
+    m = len(p)
+
+    if m == 0:
+        return adjusted
+
+    if correction == 'bonferroni':
+        adjusted[valid] = np.minimum(p * m, 1.0)
+        return adjusted
+
+    order = np.argsort(p, kind='mergesort')
+    ranks = np.arange(1, m + 1)
+
+    if correction == 'holm':
+        # The i-th smallest p-value is multiplied by m - i + 1, and the
+        # adjusted p-values can only increase from one to the next.
+        steps = np.maximum.accumulate((m - ranks + 1) * p[order])
+
+    else:
+        # The i-th smallest p-value is multiplied by m / i, and the
+        # adjusted p-values can only decrease from the last to the first.
+        steps = np.minimum.accumulate((m / ranks * p[order])[::-1])[::-1]
+
+    sorted_adjusted = np.empty(m)
+    sorted_adjusted[order] = np.minimum(steps, 1.0)
+
+    adjusted[valid] = sorted_adjusted
+
+    return adjusted
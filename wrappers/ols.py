@@ -6,19 +6,43 @@
 
 from __future__ import division, print_function
 
-from scipy import c_, ones, dot, stats, diff
-from scipy.linalg import inv, solve, det
-
-from numpy import log, nan, pi, sqrt, square, diagonal
-from numpy.linalg import LinAlgError
-from numpy.random import randn, seed
+from numpy import array, asarray, diagonal, dot, full
+from numpy import sum as np_sum
+from numpy import log, maximum, nan, pi, sqrt, square
+from .blocks import block_bounds, is_mapped, open_mapped, read_block
+from .design import add_constant, column_names, design_matrix, \
+    parse_formula, variable_names
+from .fixed_effects import absorbed_levels, demean, group_codes
+from .instrument import clock
+from .moments import residual_moments
+from .pvalues import f_sf, t_two_sided
+from .robust import check_cov_type, sandwich, wald_f
+from .solvers import GRAM_SOLVERS, cross_products, get_solver, std_errors
 
 from time import localtime, strftime
-from json import dump
+from .serialize import default_filename, dump
+
+
+# The residual diagnostics (as named by `to_dict`), which can only be computed
+# from the residuals of the model or from their moments.
+RESIDUAL_STATS = ('durbin_watson', 'omnibus_stat', 'omnibus_p_val',
+                  'jb_stat', 'jb_stat_p_val', 'skew', 'kurtosis')
 
 
 class ols(object):
-    def __init__(self, x, y, x_varnm=None, y_varnm='y'):
+    __slots__ = ('solver', 'method', 'incremental', 'keep_data',
+                 'x', 'y', 'x_varnm', 'y_varnm', 'nresp',
+                 'weights', 'weight_type', 'groups', 'absorbed', 'yvar',
+                 'cov_type', 'clusters', 'cov',
+                 'xtx', 'xty', 'yty', 'ysum', '_moments',
+                 'b', 'r_inv', 'nobs', 'ncoef', 'df_e', 'df_r', 'e',
+                 'ssr', 'sse', 'se', 't', 'p', 'R2', 'R2adj', 'R2_within',
+                 'F', 'Fpv')
+
+    def __init__(self, x=None, y=None, x_varnm=None, y_varnm='y',
+                 method='qr', keep_data=True, block_size=None, weights=None,
+                 weight_type='frequency', groups=None, cov_type='nonrobust',
+                 clusters=None):
         """
 
         Initializes an ordinary least squares (OLS) analysis on a
@@ -26,15 +50,27 @@ class ols(object):
 
         Parameters
         ----------
-        x : numpy.ndarray
+        x : numpy.ndarray, optional
             A matrix of observations whose columns are considered
-            to be the 'independent variables' in the regression.
-
-        y : numpy.ndarray
+            to be the 'independent variables' in the regression. If
+            neither `x` nor `y` are passed in, the analysis is run in
+            incremental mode, in which observations are passed in by
+            chunks through the `partial_fit` method. If a `numpy.memmap` or
+            the path to a .npy file is passed in, the observations are read
+            in blocks and are never copied into memory as a whole (see the
+            `fit_blocks` method).
+
+        y : numpy.ndarray, optional
             An array of observations that is considered to be the
             'dependent variable'. Note that the length of this array
             must be the same length as the matrix for the independent
-            variable observations.
+            variable observations. If a matrix is passed in, each of its
+            columns is considered to be a separate dependent variable, and
+            all of them are regressed on the independent variables at once
+            using a single factorization of those observations, unless it
+            has a single column, in which case it is treated as a vector. As
+            with `x`, a `numpy.memmap` or the path to a .npy file can be
+            passed in.
 
         x_varm: list, optional
             A list of names corresponding to the independent variables.
@@ -43,30 +79,494 @@ class ols(object):
             list must be the same width as the matrix for the independent
             variable observations.
 
-        y_varnm : string, optional
-            The name of the dependent variable. The default is 'y'.
+        y_varnm : string or list, optional
+            The name of the dependent variable. The default is 'y'. If `y`
+            is a matrix, a list of names with the same length as the width
+            of `y` can be passed in. Otherwise, the names are generated by
+            appending the column number to `y_varnm`.
+
+        method : string, optional
+            The solver used to estimate the coefficients. Allowed options are
+            'qr', 'cholesky', 'svd', or 'normal'. 'qr' uses a QR decomposition
+            of the independent variable observations. 'cholesky' solves the
+            normal equations using a Cholesky decomposition, which is faster
+            but less accurate for ill-conditioned data. 'svd' uses a singular
+            value decomposition, which is the slowest but most robust option.
+            'normal' explicitly inverts the cross-product matrix. The default
+            is 'qr'. In incremental mode, the coefficients are estimated from
+            the cross-product matrices of the observations, from which a QR
+            decomposition cannot be computed, so 'qr' behaves like 'cholesky'
+            and 'svd' uses an eigenvalue decomposition instead.
+
+        keep_data : bool, optional
+            Indicates whether the observations and the residuals should be
+            kept (True) or dropped (False) once the model is estimated. The
+            residual diagnostics are computed before the residuals are dropped,
+            so `summary` and `to_file` remain available, but the model cannot
+            be estimated again. The default is 'True'.
+
+        block_size : int, optional
+            The number of rows read in each block when the observations are
+            memory-mapped. By default, each block holds about 64 MB.
+
+        weights : numpy.ndarray, optional
+            Positive weights of the observations, in which case the model is
+            estimated by weighted least squares. Weights are only supported
+            for observations held in memory.
+
+        weight_type : string, optional
+            The type of the weights. Allowed options are 'frequency' and
+            'analytic'. 'frequency' signifies that the weight of an observation
+            is the number of times that it occurs, in which case the results
+            are the same as for the observations repeated as many times (as
+            consecutive rows), so duplicate rows can be collapsed into one row
+            with a count, and `nobs` is the sum of the weights. 'analytic'
+            signifies that the weights are inversely proportional to the
+            variance of the observations, in which case they are rescaled to
+            sum to the number of rows, which is then `nobs`, and the residual
+            diagnostics are computed from the residuals scaled by the square
+            roots of the weights. The default is 'frequency'.
+
+        groups : numpy.ndarray or list, optional
+            The group of each observation, or a list of such arrays, one per
+            fixed effect to absorb. The effects are absorbed by demeaning the
+            observations within groups (see the `fixed_effects` module)
+            instead of adding a dummy column per group, so only the slopes are
+            estimated, without a constant. `df_e` accounts for the absorbed
+            levels, `R2` is the R-squared statistic of the model including
+            the effects, and `R2_within` that of the slopes on the demeaned
+            observations, on which `F` is based. Fixed effects are only
+            supported for observations held in memory, and the 'HC2' and
+            'HC3' covariance types only support one of them.
+
+        cov_type : string, optional
+            The type of covariance matrix of the estimates from which `se`,
+            `t`, `p`, `F`, and `Fpv` are computed. Allowed options are
+            'nonrobust', 'HC0', 'HC1', 'HC2', 'HC3', and 'cluster'. The 'HC'
+            options are heteroskedasticity-robust sandwich estimators, and
+            'cluster' is robust to correlations within the `clusters` (see the
+            `robust` module), in which case the p-values have G - 1 degrees
+            of freedom for G clusters. With a robust covariance matrix, `F` is
+            the Wald statistic for the slopes. Robust covariance matrices are
+            only supported for observations held in memory. The default is
+            'nonrobust'.
+
+        clusters : numpy.ndarray, optional
+            The cluster of each observation, which must be passed in if and
+            only if `cov_type` is 'cluster'.
 
         """
 
-        self.x = c_[ones(x.shape[0]), x]
+        self.solver = get_solver(method)
+        self.method = method
 
-        if not x_varnm:
-            if len(x.shape) == 1 or x.shape[1] == 1:
-                self.x_varnm = ['const', 'x']
+        self.x_varnm = x_varnm
+        self.y_varnm = y_varnm
+        self.nresp = 1
 
-            else:
-                self.x_varnm = ['const'] + \
-                               ['x' + str(i) for i in
-                                range(1, x.shape[1] + 1)]
+        # Sufficient statistics accumulated in incremental mode, in which
+        # the estimates are only set once the model can be estimated.
+        self.xtx = self.xty = self.yty = self.ysum = None
+        self.nobs = 0
+        self.b = None
+
+        self._moments = None
+        self.keep_data = keep_data
+
+        self.weights = None
+        self.weight_type = None
+
+        # Levels of the fixed effects, if any, and the variance of `y`
+        # before it is demeaned within them.
+        self.groups = self.yvar = self.R2_within = None
+        self.absorbed = 0
+
+        check_cov_type(cov_type, clusters)
+
+        self.cov_type = cov_type
+        self.clusters = self.cov = None
+
+        self.incremental = x is None and y is None
+        x, y = open_mapped(x), self.squeeze(open_mapped(y))
+
+        if weights is not None:
+            if self.incremental or is_mapped(x) or is_mapped(y):
+                raise ValueError("Weights are only supported for " +
+                                 "observations held in memory")
+
+            self.weights = self.check_weights(weights, weight_type,
+                                              x.shape[0])
+            self.weight_type = weight_type
+
+        if groups is not None and (self.incremental or is_mapped(x) or
+                                   is_mapped(y)):
+            raise ValueError("Fixed effects are only supported for " +
+                             "observations held in memory")
+
+        if cov_type != 'nonrobust' and (self.incremental or is_mapped(x) or
+                                        is_mapped(y)):
+            raise ValueError("Robust covariance matrices are only " +
+                             "supported for observations held in memory")
+
+        if clusters is not None:
+            self.clusters = group_codes(clusters, x.shape[0])[0]
+
+        if self.incremental:
+            self.x = self.y = self.e = None
+            return
+
+        if is_mapped(x) or is_mapped(y):
+            self.incremental = True
+            self.x = self.y = self.e = None
+
+            self.fit_blocks(x, y, block_size)
+            return
+
+        if groups is None:
+            self.x = add_constant(x)
+            self.y = y
 
         else:
-            self.x_varnm = ['const'] + x_varnm
+            self.groups = group_codes(groups, x.shape[0])
+
+            if cov_type in ('HC2', 'HC3') and len(self.groups) > 1:
+                raise ValueError("The 'HC2' and 'HC3' covariance types " +
+                                 "only support one absorbed fixed effect " +
+                                 "but got: " + str(len(self.groups)))
+            self.absorbed = absorbed_levels(self.groups)
+            self.yvar = self.variance(y)
+
+            self.x = demean(x.reshape(x.shape[0], -1), self.groups,
+                            self.weights)
+            self.y = demean(y, self.groups, self.weights)
+
+        self.name_variables(self.x.shape[1] - (groups is None),
+                            1 if len(y.shape) == 1 else y.shape[1],
+                            const=groups is None)
+        self.estimate()
 
-        self.y = y
-        self.y_varnm = y_varnm
+    def check_weights(self, weights, weight_type, nobs):
+        """
+
+        Checks the validity of the `weights` and `weight_type` parameters
+        passed into the __init__ method for `nobs` observations. Throws a
+        ValueError if either parameter is found to be invalid, and returns the
+        weights otherwise (rescaled if they are analytic). Note that this
+        method is only meant to be called internally to the class and not
+        externally.
+
+        """
+
+        if weight_type not in ('frequency', 'analytic'):
+            raise ValueError("Invalid weight type. " +
+                             "Expected 'frequency' or 'analytic' " +
+                             "but got: '" + str(weight_type) + "'")
+
+        weights = asarray(weights)
+
+        if weights.shape != (nobs,) or not (weights > 0).all():
+            raise ValueError("Invalid weights. Expected " + str(nobs) +
+                             " positive weights, one per observation")
+
+        if weight_type == 'analytic':
+            weights = weights * (nobs / weights.sum())
+
+        return weights
+
+    def squeeze(self, y):
+        """
+
+        Returns the observations `y` of the dependent variable as a vector if
+        they are a matrix with a single column, so that the results of a model
+        of one dependent variable have the same shapes whatever the shape of
+        `y`. Note that this method is only meant to be called internally to
+        the class and not externally.
+
+        """
+
+        if y is not None and len(y.shape) == 2 and y.shape[1] == 1:
+            return y[:, 0]
+
+        return y
+
+    def variance(self, y):
+        """
+
+        Returns the variance of the observations `y` of the dependent
+        variable(s), weighted if the model has weights. Note that this method
+        is only meant to be called internally to the class and not externally.
+
+        """
+
+        if self.weights is None:
+            return y.var(axis=0)
+
+        w = self.weights.reshape((-1,) + (1,) * (len(y.shape) - 1))
+        total = self.weights.sum()
+
+        ybar = np_sum(w * y, axis=0) / total
+
+        return np_sum(w * square(y - ybar), axis=0) / total
+
+    @classmethod
+    def from_gram(cls, xtx, xty, yty, ysum, nobs, x_varnm=None, y_varnm='y',
+                  method='qr'):
+        """
+
+        Initializes an ordinary least squares (OLS) analysis from the
+        cross-product matrices of a set of data points instead of the actual
+        observations, e.g. when they are computed by a database. All of the
+        statistics of the model (and `ll`) are computed from the matrices
+        alone, but the residual diagnostics (`dw`, `omni`, and `JB`) return
+        'nan', since the residuals are not available (see `unavailable_stats`).
+
+        Parameters
+        ----------
+        xtx : numpy.ndarray
+            The cross-product matrix of the independent variables, whose first
+            row and column correspond to the constant, i.e. `dot(X.T, X)` where
+            `X` is the matrix of observations preceded by a column of ones.
+
+        xty : numpy.ndarray
+            The cross-product of the independent variables and the dependent
+            variable(s), i.e. `dot(X.T, y)`.
 
+        yty : float or numpy.ndarray
+            The sum of squares of the dependent variable(s).
+
+        ysum : float or numpy.ndarray
+            The sum of the dependent variable(s).
+
+        nobs : int
+            The number of observations.
+
+        x_varnm, y_varnm, method :
+            See the __init__ method. Note that `x_varnm` should not include
+            the name of the constant.
+
+        """
+
+        xtx = array(xtx, dtype=float)
+        xty = array(xty, dtype=float)
+
+        if len(xtx.shape) != 2 or xtx.shape[0] != xtx.shape[1] or \
+           xty.shape[0] != xtx.shape[0]:
+            raise ValueError("Invalid cross-product matrices. Expected a " +
+                             "square `xtx` with as many rows as `xty` " +
+                             "but got shapes: " + str(xtx.shape) +
+                             " and " + str(xty.shape))
+
+        if abs(xtx[0, 0] - nobs) > 1e-8 * max(nobs, 1):
+            raise ValueError("Invalid cross-product matrices. Expected the " +
+                             "first row and column of `xtx` to correspond " +
+                             "to the constant (i.e. xtx[0, 0] == nobs) " +
+                             "but got: " + str(xtx[0, 0]))
+
+        self = cls(x_varnm=x_varnm, y_varnm=y_varnm, method=method)
+
+        return self.accumulate(xtx, xty, yty, ysum, nobs)
+
+    @classmethod
+    def from_frame(cls, frame, y=None, x=None, formula=None,
+                   categorical=None, method='qr', keep_data=True,
+                   cov_type='nonrobust'):
+        """
+
+        Initializes an ordinary least squares (OLS) analysis on the columns
+        of a data frame, e.g. a pandas DataFrame, a dictionary of arrays, or
+        a NumPy structured array, selected by name or with a formula. The
+        names of the variables are taken from the columns, and the design
+        matrix is built directly from the columns (see the `design` module)
+        instead of being copied once more with the constant.
+
+        Parameters
+        ----------
+        frame : data frame
+            The observations, with one column per variable.
+
+        y : string or list, optional
+            The name of the column of the dependent variable, or a list of
+            names of several dependent variables.
+
+        x : list, optional
+            The names of the columns of the independent variables. If neither
+            `x` nor `formula` is passed in, all of the columns but `y` are used.
+
+        formula : string, optional
+            A formula such as 'y ~ x1 + x2 + C(group)', which replaces `y`,
+            `x`, and `categorical`. C() marks a numeric column as categorical.
+
+        categorical : list, optional
+            The names of the numeric columns to expand into dummy columns,
+            one per level but the first. Columns that are not numeric (or
+            that are pandas categoricals) are always expanded.
+
+        method, keep_data :
+            See the __init__ method.
+
+        cov_type : string, optional
+            See the __init__ method. Note that 'cluster' is not supported.
+
+        Rows with a missing value (NaN or None) in any of the columns used
+        are dropped.
+
+        """
+
+        if formula is not None:
+            y, x, categorical = parse_formula(formula)
+
+        if y is None:
+            raise ValueError("The dependent variable must be passed in " +
+                             "as `y` or through `formula`")
+
+        if x is None:
+            exclude = y if isinstance(y, list) else [y]
+            x = [name for name in column_names(frame) if name not in exclude]
+
+        check_cov_type(cov_type, None)
+
+        design, y_obs, x_varnm = design_matrix(frame, y, x,
+                                               categorical or ())
+
+        self = cls(x_varnm=x_varnm, y_varnm=y, method=method,
+                   keep_data=keep_data)
+
+        # The design matrix already includes the constant, so
+        # the observations are set directly instead of through
+        # the __init__ method, which would add it again.
+        self.incremental = False
+        self.cov_type = cov_type
+        self.x, self.y = design, self.squeeze(y_obs)
+
+        self.name_variables(design.shape[1] - 1,
+                            1 if len(self.y.shape) == 1 else self.y.shape[1])
         self.estimate()
 
+        return self
+
+    def name_variables(self, nvars, nresp, const=True):
+        """
+
+        Generates the names of the `nvars` independent variables and the
+        `nresp` dependent variables from the names passed into the __init__
+        method, preceded by the name of the constant if the model has one.
+        Note that this method is only meant to be called internally to the
+        class and not externally.
+
+        """
+
+        self.x_varnm, self.y_varnm = variable_names(nvars, nresp,
+                                                    self.x_varnm,
+                                                    self.y_varnm, const)
+        self.nresp = nresp
+
+    def partial_fit(self, x, y):
+        """
+
+        Adds a chunk of observations to an analysis running in incremental
+        mode and re-estimates the model, once there are more observations
+        than coefficients (before that, the chunks are only accumulated).
+        Only the cross-product matrices of the observations are kept, so
+        memory usage does not grow with the number of observations. As a
+        result, the residuals are not available and the residual diagnostics
+        (`dw`, `omni`, and `JB`) return 'nan'.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            A chunk of observations of the independent variables.
+
+        y : numpy.ndarray
+            A chunk of observations of the dependent variable(s) with
+            the same length as `x`.
+
+        """
+
+        return self.accumulate(*cross_products(x, y))
+
+    def accumulate(self, xtx, xty, yty, ysum, nobs):
+        """
+
+        Adds the cross-product matrices of a chunk of observations, as computed
+        by `solvers.cross_products`, to an analysis running in incremental mode
+        and re-estimates the model. See the `partial_fit` method.
+
+        """
+
+        if not self.incremental:
+            raise ValueError("Observations can only be added by chunks " +
+                             "to an analysis initialized without `x` and `y`")
+
+        # The sums of a single dependent variable passed in as a matrix
+        # with one column are reduced to those of a vector, as in `squeeze`.
+        if len(xty.shape) == 2 and xty.shape[1] == 1:
+            xty, yty, ysum = (xty[:, 0], asarray(yty).reshape(()),
+                              asarray(ysum).reshape(()))
+
+        if self.xtx is None:
+            self.name_variables(xtx.shape[0] - 1,
+                                1 if len(xty.shape) == 1 else xty.shape[1])
+
+            # Copies are made since the sums are accumulated in place.
+            self.xtx, self.xty, self.yty, self.ysum = (
+                array(stat, dtype=float) for stat in (xtx, xty, yty, ysum))
+
+        else:
+            self.xtx += xtx
+            self.xty += xty
+            self.yty += yty
+            self.ysum += ysum
+
+        self.nobs += nobs
+
+        # The model cannot be estimated until there are more observations
+        # than coefficients, but the chunks are accumulated all the same.
+        if self.nobs > self.xtx.shape[0]:
+            self.estimate()
+
+        return self
+
+    def fit_blocks(self, x, y, block_size=None):
+        """
+
+        Estimates the model on observations that are read in blocks of
+        `block_size` consecutive rows, e.g. from memory-mapped files. The
+        cross-product matrices of the blocks are accumulated in a first pass,
+        as in incremental mode, and the moments of the residuals are merged
+        in a second pass once the coefficients are known, so all of the
+        residual diagnostics remain available even though neither the
+        observations nor the residuals are ever held in memory as a whole.
+
+        """
+
+        row_bytes = (x.nbytes + y.nbytes) // max(x.shape[0], 1)
+        bounds = block_bounds(x.shape[0], row_bytes, block_size)
+
+        totals = None
+
+        for start, stop in bounds:
+            stats = cross_products(read_block(x, start, stop),
+                                   read_block(y, start, stop))
+            totals = stats if totals is None else tuple(
+                total + stat for total, stat in zip(totals, stats))
+
+        self.accumulate(*totals)
+
+        # The blocks are merged in order, so the Durbin-Watson
+        # statistic accounts for the differences across blocks.
+        moments = residual_moments()
+
+        for start, stop in bounds:
+            x_block = read_block(x, start, stop).reshape(stop - start, -1)
+            e = read_block(y, start, stop) - self.b[0] - \
+                dot(x_block, self.b[1:])
+
+            moments.merge(residual_moments(e))
+
+        self.moments = moments
+
+        return self
+
     def estimate(self):
         """
 
@@ -85,9 +585,11 @@ class ols(object):
 
         df_r : degrees of freedom for the regression
 
-        e : residuals from the regression
+        e : residuals from the regression ('None' in incremental mode)
+
+        ssr : sum of the residuals squared
 
-        sse : sum of the residuals squared
+        sse : variance of the residuals (i.e. `ssr` divided by `df_e`)
 
         se : standard errors for the coefficients and the intercept estimated
 
@@ -99,10 +601,24 @@ class ols(object):
 
         R2adj : Adjusted R-squared statistic for the regression model
 
+        R2_within : R-squared statistic of the slopes on the observations
+                    demeaned within groups ('None' without fixed effects)
+
+        cov : robust covariance matrix of the estimates ('None' if `cov_type`
+              is 'nonrobust')
+
         F : F-statistic for the regression model
 
         Fpv : p-value for the F-statistic computed
 
+        r_inv : factor of the inverted cross-product matrix of the
+                independent variable observations (see `inv_xx`)
+
+        If `y` is a matrix of several dependent variables, `b`, `se`, `t`,
+        and `p` are matrices whose columns correspond to the columns of `y`,
+        and `sse`, `R2`, `R2adj`, `F`, and `Fpv` are arrays with one entry
+        per dependent variable.
+
         Further information about these statistics and values can be
         found in any standard statistics textbook or online with the
         appropriate search query.
@@ -116,46 +632,200 @@ class ols(object):
         # 'x' = column array of the coefficients to be estimated.
         #
         # The estimate is performed by solving A_T * A * x = A_T * b
-        # for 'x', where A_T is the transpose of A.
+        # for 'x', where A_T is the transpose of A. The solver chosen
+        # through `method` factorizes A (or A_T * A) instead of inverting
+        # A_T * A, and it returns a factor R_inv of the inverse such that
+        # inv(A_T * A) = R_inv * R_inv_T, from which the standard errors
+        # are computed without forming the inverse itself.
         #
         # Notes:
-        #   1) This method assumes that A_T * A has an inverse.
+        #   1) This method assumes that A has full column rank. If it does
+        #      not, the solver raises a LinAlgError with an informative
+        #      error message for the user.
         #   2) If A * x = b has a solution, the initial equation
         #      will find that solution.
+        #
+        # In incremental mode, A_T * A and A_T * b have been accumulated,
+        # and the sum of the squared residuals is computed from them as
+        # b_T * b - x_T * A_T * b, since the residuals are not available.
+
+        stages = clock('ols.estimate')
+
+        if self.incremental:
+            solver = GRAM_SOLVERS[self.method]
+            self.b, self.r_inv = solver(self.xtx, self.xty, self.nobs)
+            stages.lap('solve')
+
+            # The difference cancels out catastrophically when the fit is
+            # close to perfect (R-squared near 1), in which case it can come
+            # out slightly negative, so it is clamped at zero.
+            self.ssr = maximum(self.yty - np_sum(self.b * self.xty, axis=0),
+                               0.0)
+            yvar = self.yty / self.nobs - square(self.ysum / self.nobs)
+
+        elif self.x is None:
+            raise ValueError("The model cannot be estimated again because " +
+                             "its observations were dropped (keep_data=False)")
+
+        elif self.weights is None:
+            self.b, self.r_inv = self.solver(self.x, self.y)
+            self.nobs = self.y.shape[0]
+            stages.lap('solve')
+
+            self.e = self.y - dot(self.x, self.b)
+            self.ssr = np_sum(self.e * self.e, axis=0)
+            yvar = self.y.var(axis=0)
+
+        # With weights, the solver is applied to the observations scaled by
+        # the square roots of the weights, and all of the sums over the
+        # observations are weighted. Analytic weights have been rescaled to
+        # sum to the number of observations, so in both cases, the number of
+        # observations is the sum of the weights.
+        else:
+            root = sqrt(self.weights)
+            w = self.weights.reshape((-1,) + (1,) * (len(self.y.shape) - 1))
+
+            self.b, self.r_inv = self.solver(self.x * root[:, None],
+                                             self.y * sqrt(w))
+            self.nobs = self.weights.sum()
+            stages.lap('solve')
+
+            self.e = self.y - dot(self.x, self.b)
+            self.ssr = np_sum(w * self.e * self.e, axis=0)
+
+            yvar = self.variance(self.y)
 
-        try:
-            self.inv_xx = inv(dot(self.x.T, self.x))
-            xy = dot(self.x.T, self.y)
-            self.b = dot(self.inv_xx, xy)
-
-        # inv(dot(self.x.T, self.x)) could not be computed because
-        # dot(self.x.T, self.x) is a singular matrix. This except
-        # block raises a LinAlgError with a more informative error
-        # message for the user.
-        except LinAlgError:
-            msg = ("\n\nYour matrix of independent observations is singular!"
-                   "\nUnfortunately, that means we cannot compute an OLS"
-                   "\nmodel for your provided data. Terminating immediately.")
-
-            raise LinAlgError(msg)
-
-        self.nobs = self.y.shape[0]
-        self.ncoef = self.x.shape[1]
-        self.df_e = self.nobs - self.ncoef
-        self.df_r = self.ncoef - 1
-
-        self.e = self.y - dot(self.x, self.b)
-        self.sse = dot(self.e, self.e) / self.df_e
-        self.se = sqrt(diagonal(self.sse * self.inv_xx))
+        stages.lap('residuals')
+
+        # The residuals have changed, so their moments
+        # will have to be recomputed when next requested.
+        self._moments = None
+
+        # Fixed effects absorb the constant along with their levels.
+        self.ncoef = self.r_inv.shape[0]
+        self.df_e = self.nobs - self.ncoef - self.absorbed
+        self.df_r = self.ncoef - 1 if not self.absorbed else self.ncoef
+
+        self.sse = self.ssr / self.df_e
+        self.se = std_errors(self.r_inv, self.sse)
         self.t = self.b / self.se
-        self.p = (1 - stats.t.cdf(abs(self.t), self.df_e)) * 2
+        stages.lap('std_errors')
+
+        self.p = t_two_sided(self.t, self.df_e)
+        stages.lap('p_values')
+
+        # The residuals have mean zero because of the constant
+        # in the model, so their variance is ssr / nobs.
+        self.R2 = 1 - (self.ssr / self.nobs) / yvar
+
+        # With fixed effects, `y` has been demeaned, so the R-squared
+        # statistic computed above is that of the within model.
+        if self.absorbed:
+            self.R2_within = self.R2
+            self.R2 = 1 - (self.ssr / self.nobs) / self.yvar
+
+        self.R2adj = 1 - (1 - self.R2) * ((self.nobs - 1) / self.df_e)
+
+        fit = self.R2 if not self.absorbed else self.R2_within
+        self.F = (fit / self.df_r) / ((1 - fit) / self.df_e)
+        self.Fpv = f_sf(self.F, self.df_r, self.df_e)
+        stages.lap('model_stats')
+
+        if self.cov_type != 'nonrobust':
+            self.cov = sandwich(self.x, self.e, self.r_inv, self.cov_type,
+                                self.df_e, clusters=self.clusters,
+                                groups=self.groups, weights=self.weights,
+                                weight_type=self.weight_type)
+
+            # With G clusters, whose codes run from 0 to G - 1,
+            # the p-values have G - 1 degrees of freedom.
+            df = self.df_e if self.clusters is None else \
+                self.clusters.max()
+
+            self.se = sqrt(diagonal(self.cov, axis1=-2, axis2=-1).T)
+            self.t = self.b / self.se
+            self.p = t_two_sided(self.t, df)
 
-        self.R2 = 1 - self.e.var() / self.y.var()
-        self.R2adj = 1 - (1 - self.R2) * ((self.nobs - 1) /
-                                          (self.nobs - self.ncoef))
+            self.F = wald_f(self.b, self.cov, const=not self.absorbed)
+            self.Fpv = f_sf(self.F, self.df_r, df)
+            stages.lap('robust_cov')
+
+        # Only the residual moments are needed for the diagnostics,
+        # so they are computed before the residuals are dropped.
+        if not self.keep_data and not self.incremental:
+            self._moments = self.moments
+            self.x = self.y = self.e = self.weights = self.groups = None
+            self.clusters = None
+
+            stages.lap('moments')
+
+        stages.done(nobs=self.nobs, ncoef=self.ncoef, nresp=self.nresp,
+                    method=self.method, cov_type=self.cov_type)
+
+    @property
+    def inv_xx(self):
+        """
+
+        The inverse of the cross-product matrix of the independent variable
+        observations (constant included). It is only formed when requested,
+        as estimation itself only requires its diagonal.
+
+        """
+
+        return dot(self.r_inv, self.r_inv.T)
+
+    @property
+    def moments(self):
+        """
+
+        The moments of the regression model residuals, from which all of the
+        residual diagnostics are computed (see `moments.residual_moments`).
+        They are computed in a single sweep over the residuals the first time
+        they are requested and are then reused until the model is estimated
+        again. 'None' is returned if the residuals are not available, unless
+        their moments were computed elsewhere and assigned to this property.
+
+        """
 
-        self.F = (self.R2 / self.df_r) / ((1 - self.R2) / self.df_e)
-        self.Fpv = 1 - stats.f.cdf(self.F, self.df_r, self.df_e)
+        if self._moments is None and self.e is not None:
+            if self.weight_type == 'frequency':
+                self._moments = residual_moments(self.e, self.weights)
+
+            elif self.weight_type == 'analytic':
+                w = self.weights.reshape((-1,) + (1,) * (len(self.e.shape) - 1))
+                self._moments = residual_moments(self.e * sqrt(w))
+
+            else:
+                self._moments = residual_moments(self.e)
+
+        return self._moments
+
+    @moments.setter
+    def moments(self, moments):
+        self._moments = moments
+
+    def unavailable(self):
+        """
+
+        Returns 'nan' in place of a residual diagnostic statistic that
+        cannot be computed because the residuals are not available, with
+        one entry per dependent variable if there are several of them.
+
+        """
+
+        return full(self.nresp, nan) if self.nresp > 1 else nan
+
+    def unavailable_stats(self):
+        """
+
+        Returns the names (as in `to_dict`) of the residual diagnostics that
+        cannot be computed because neither the residuals nor their moments
+        are available, e.g. for a model fitted from cross-product matrices
+        by `from_gram` or `partial_fit`. The list is empty otherwise.
+
+        """
+
+        return [] if self.moments is not None else list(RESIDUAL_STATS)
 
     def dw(self):
         """
@@ -165,10 +835,10 @@ class ols(object):
 
         """
 
-        de = diff(self.e, 1)
-        dw = dot(de, de) / dot(self.e, self.e)
+        if self.moments is None:
+            return self.unavailable()
 
-        return dw
+        return self.moments.dw()
 
     def omni(self):
         """
@@ -176,7 +846,7 @@ class ols(object):
         Performs the Omnibus test for normality on the regression model
         residuals. Returns the Omnibus statistic and the p-value associated
         with that statistic. Note that this test requires that there are
-        at least data observations. In this case, 'nan' is returned for
+        at least eight data observations. Otherwise, 'nan' is returned for
         both values.
 
         For more information about the Omnibus normality test, please read
@@ -185,12 +855,10 @@ class ols(object):
 
         """
 
-        try:
-            return stats.normaltest(self.e)
+        if self.moments is None:
+            return self.unavailable(), self.unavailable()
 
-        # fewer than eight observations
-        except ValueError:
-            return nan, nan
+        return self.moments.omni()
 
     def JB(self):
         """
@@ -202,13 +870,26 @@ class ols(object):
 
         """
 
-        skew = stats.skew(self.e)
-        kurtosis = 3 + stats.kurtosis(self.e)
+        if self.moments is None:
+            return tuple(self.unavailable() for _ in range(4))
 
-        JB = (self.nobs / 6) * (square(skew) + (1 / 4) * square(kurtosis - 3))
-        JBpv = 1 - stats.chi2.cdf(JB, 2)
+        return self.moments.JB()
+
+    def check_estimated(self):
+        """
+
+        Checks that the model has been estimated, which is not the case for a
+        model running in incremental mode until it has been given more
+        observations than coefficients. Throws a ValueError otherwise. Note
+        that this method is only meant to be called internally to the class
+        and not externally.
+
+        """
 
-        return JB, JBpv, skew, kurtosis
+        if self.b is None:
+            raise ValueError("Not enough observations to estimate the " +
+                             "model. Expected more observations than " +
+                             "coefficients but got: " + str(self.nobs))
 
     def ll(self):
         """
@@ -221,8 +902,10 @@ class ols(object):
 
         """
 
+        self.check_estimated()
+
         ll = -(self.nobs / 2) * (1 + log(2 * pi)) - (
-            self.nobs / 2) * log(dot(self.e, self.e) / self.nobs)
+            self.nobs / 2) * log(self.ssr / self.nobs)
         aic = -2 * ll / self.nobs + (2 * self.ncoef / self.nobs)
         bic = -2 * ll / self.nobs + (self.ncoef * log(self.nobs)) / self.nobs
 
@@ -238,52 +921,78 @@ class ols(object):
 
         """
 
+        self.check_estimated()
+
         t = localtime()
+        stages = clock('ols.summary')
 
         ll, aic, bic = self.ll()
         JB, JBpv, skew, kurtosis = self.JB()
         omni, omnipv = self.omni()
-
-        print('\n==============================================================================')
-        print("Dependent Variable: " + self.y_varnm)
-        print("Method: Least Squares")
-        print("Date: ", strftime("%a, %d %b %Y", t))
-        print("Time: ", strftime("%H:%M:%S", t))
-        print('# obs:               %5.0f' % self.nobs)
-        print('# variables:     %5.0f' % self.ncoef)
-        print('==============================================================================')
-        print('variable     coefficient     std. Error      t-statistic     prob.')
-        print('==============================================================================')
-        for i in range(len(self.x_varnm)):
-            print('''% -5s          % -5.6f     % -5.6f     % -5.6f     % -5.6f''' % tuple([self.x_varnm[i], self.b[i], self.se[i], self.t[i], self.p[i]]))
-        print('==============================================================================')
-        print('Models stats                         Residual stats')
-        print('==============================================================================')
-        print('R-squared            % -5.6f         Durbin-Watson stat  % -5.6f' % tuple([self.R2, self.dw()]))
-        print('Adjusted R-squared   % -5.6f         Omnibus stat        % -5.6f' % tuple([self.R2adj, omni]))
-        print('F-statistic          % -5.6f         Prob(Omnibus stat)  % -5.6f' % tuple([self.F, omnipv]))
-        print('Prob (F-statistic)   % -5.6f			JB stat             % -5.6f' % tuple([self.Fpv, JB]))
-        print('Log likelihood       % -5.6f			Prob(JB)            % -5.6f' % tuple([ll, JBpv]))
-        print('AIC criterion        % -5.6f         Skew                % -5.6f' % tuple([aic, skew]))
-        print('BIC criterion        % -5.6f         Kurtosis            % -5.6f' % tuple([bic, kurtosis]))
-        print('==============================================================================')
-
-    def to_file(self, filename=None):
+        dw = self.dw()
+        stages.lap('diagnostics')
+
+        for j in range(self.nresp):
+            # Selects the statistics of the j-th dependent variable when
+            # several of them were regressed at once. Otherwise, the
+            # statistics are returned untouched.
+            def col(values):
+                return values[..., j] if self.nresp > 1 else values
+
+            y_varnm = self.y_varnm[j] if self.nresp > 1 else self.y_varnm
+            b, se, tstat, p = col(self.b), col(self.se), col(self.t), col(self.p)
+
+            print('\n==============================================================================')
+            print("Dependent Variable: " + y_varnm)
+            print("Method: " + ("Least Squares" if self.weight_type is None
+                                else "Weighted Least Squares (" +
+                                self.weight_type + " weights)"))
+            print("Covariance Type: " + self.cov_type)
+            print("Date: ", strftime("%a, %d %b %Y", t))
+            print("Time: ", strftime("%H:%M:%S", t))
+            print('# obs:               %5.0f' % self.nobs)
+            print('# variables:     %5.0f' % self.ncoef)
+
+            if self.absorbed:
+                print('# absorbed levels:   %5.0f' % self.absorbed)
+                print('Within R-squared:    % -5.6f' % col(self.R2_within))
+
+            print('==============================================================================')
+            print('variable     coefficient     std. Error      t-statistic     prob.')
+            print('==============================================================================')
+            for i in range(len(self.x_varnm)):
+                print('''% -5s          % -5.6f     % -5.6f     % -5.6f     % -5.6f''' % tuple([self.x_varnm[i], b[i], se[i], tstat[i], p[i]]))
+            print('==============================================================================')
+            print('Models stats                         Residual stats')
+            print('==============================================================================')
+            print('R-squared            % -5.6f         Durbin-Watson stat  % -5.6f' % tuple([col(self.R2), col(dw)]))
+            print('Adjusted R-squared   % -5.6f         Omnibus stat        % -5.6f' % tuple([col(self.R2adj), col(omni)]))
+            print('F-statistic          % -5.6f         Prob(Omnibus stat)  % -5.6f' % tuple([col(self.F), col(omnipv)]))
+            print('Prob (F-statistic)   % -5.6f			JB stat             % -5.6f' % tuple([col(self.Fpv), col(JB)]))
+            print('Log likelihood       % -5.6f			Prob(JB)            % -5.6f' % tuple([col(ll), col(JBpv)]))
+            print('AIC criterion        % -5.6f         Skew                % -5.6f' % tuple([col(aic), col(skew)]))
+            print('BIC criterion        % -5.6f         Kurtosis            % -5.6f' % tuple([col(bic), col(kurtosis)]))
+            print('==============================================================================')
+
+            if self.moments is None:
+                print('Residual stats are unavailable (nan) because the model')
+                print('was estimated from cross-product matrices alone.')
+                print('==============================================================================')
+
+        stages.lap('print')
+        stages.done(nobs=self.nobs, ncoef=self.ncoef, nresp=self.nresp)
+
+    def to_dict(self):
         """
 
         Summarizes the results of the regression performed along with many
-        relevant statistics (e.g. the Durbin-Watson statistic) and saves the
-        results out into `filename`.
-
-        Parameters
-        ----------
-        filename : string, optional
-            The location of the file where the results will be stored. If no
-            filename is provided, a default filename will be generated, and the
-            results will be stored there.
+        relevant statistics (e.g. the Durbin-Watson statistic) and returns
+        them as a dictionary, which is what `to_file` saves out.
 
         """
 
+        self.check_estimated()
+
         t = localtime()
 
         ll, aic, bic = self.ll()
@@ -292,14 +1001,17 @@ class ols(object):
 
         data = {}
 
-        data['dependent_var'] = self.y
-        data['method'] = 'least squares'
+        data['dependent_var'] = self.y_varnm
+        data['method'] = 'least squares' if self.weight_type is None else \
+            'weighted least squares'
+        data['weight_type'] = self.weight_type
+        data['cov_type'] = self.cov_type
 
         data['date'] = strftime("%a, %d %b %Y", t)
         data['time'] = strftime("%H:%M:%S", t)
 
         data['obs_count'] = self.nobs
-        data['var_count'] = self.ncoefs
+        data['var_count'] = self.ncoef
 
         estimates = {}
 
@@ -317,6 +1029,8 @@ class ols(object):
 
         data['r_squared'] = self.R2
         data['r_squared_adj'] = self.R2adj
+        data['r_squared_within'] = self.R2_within
+        data['absorbed_levels'] = self.absorbed
 
         data['durbin_watson'] = self.dw()
 
@@ -336,20 +1050,50 @@ class ols(object):
         data['bic_stat'] = bic
         data['log_likelihood'] = ll
 
-        filename = filename or strftime("%a_%d_%b_%Y_%H_%M_%S.json", t)
+        data['unavailable_stats'] = self.unavailable_stats()
+
+        return data
+
+    def to_file(self, filename=None, format='json'):
+        """
+
+        Summarizes the results of the regression performed along with many
+        relevant statistics (e.g. the Durbin-Watson statistic) and saves the
+        results out into `filename`.
+
+        Parameters
+        ----------
+        filename : string, optional
+            The location of the file where the results will be stored. If no
+            filename is provided, a default filename will be generated, and the
+            results will be stored there.
+
+        format : string, optional
+            The format of the file. Allowed options are 'json' and 'npz', the
+            latter being NumPy's binary format (see the `serialize` module).
+            The default is 'json'.
+
+        """
 
-        with open(filename, 'w') as target:
-            dump(data, target)
+        dump(self.to_dict(), filename or default_filename(format), format)
 
     def __str__(self):
-        return "OLS Regression on " + str(self.x.shape[0]) + " Observations"
+        if self.nresp > 1:
+            return "OLS Regression of " + str(self.nresp) + \
+                   " Dependent Variables on " + str(self.nobs) + \
+                   " Observations"
+
+        return "OLS Regression on " + str(self.nobs) + " Observations"
 
     __repr__ = __str__
     __bytes__ = __str__
     __unicode__ = __str__
 
 if __name__ == "__main__":
-    from numpy import array, column_stack
+    # The modules use relative imports, so the demo is run as a module
+    # from the root of the repository: python -m wrappers.ols
+    from numpy import column_stack
+    from numpy.linalg import LinAlgError
 
     x = array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
     y = array([i + 0.1 for i in x])
@@ -363,5 +1107,15 @@ if __name__ == "__main__":
 
     y = array([(-1)**(i % 2) for i in x1])
 
+    # `x2` is a linear combination of `x1` and the constant, so the
+    # design matrix is rank deficient and the model cannot be estimated.
+    try:
+        ols(x, y, x_varnm=['bad_pred', 'bad_pred2'], y_varnm='mean_var')
+
+    except LinAlgError as e:
+        print(e)
+
+    x = column_stack((x1, x1 ** 2))
+
     reg = ols(x, y, x_varnm=['bad_pred', 'bad_pred2'], y_varnm='mean_var')
     reg.summary()
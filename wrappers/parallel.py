@@ -0,0 +1,190 @@
+"""
+Parallel OLS fitting over shards of observations.
+
+The rows of the observations are split into contiguous shards, and each
+shard is reduced by a worker to its cross-product matrices (first pass)
+and, once the coefficients are known, to the moments of its residuals
+(second pass). Both reductions are mergeable, so the final model has the
+same coefficients, statistics, and residual diagnostics as a model fitted
+on all of the observations at once.
+
+The observations are placed in shared memory once, and workers only
+receive the name of the shared memory block and the bounds of their shard,
+so the observations themselves are never pickled.
+
+"""
+
+from __future__ import division
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from os import cpu_count
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+
+# Python < 3.8, in which case the shards are pickled instead.
+except ImportError:
+    shared_memory = None
+
+from .moments import residual_moments
+from .ols import ols
+from .solvers import cross_products
+
+
+def share(a):
+    """
+
+    Copies `a` into a new block of shared memory. Returns the block and a
+    description of the array that workers can use to attach to it.
+
+    """
+
+    block = shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1))
+    np.ndarray(a.shape, dtype=a.dtype, buffer=block.buf)[...] = a
+
+    return block, (block.name, a.shape, a.dtype.str)
+
+
+def attach(spec, start, stop):
+    """
+
+    Attaches to the array described by `spec`, as returned by `share`, and
+    returns the shared memory block along with the rows of the array between
+    `start` and `stop`. If `spec` is the array itself, no block is returned.
+
+    """
+
+    if not isinstance(spec, tuple):
+        return None, spec[start:stop]
+
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)[start:stop]
+
+
+def shard_cross_products(x_spec, y_spec, bounds):
+    """
+
+    Computes the cross-product matrices of the shard of observations between
+    `bounds`. This function is run by the workers during the first pass.
+
+    """
+
+    x_block, x = attach(x_spec, *bounds)
+    y_block, y = attach(y_spec, *bounds)
+
+    try:
+        return cross_products(x, y)
+
+    finally:
+        del x, y
+        for block in (x_block, y_block):
+            if block is not None:
+                block.close()
+
+
+def shard_moments(x_spec, y_spec, b, bounds):
+    """
+
+    Computes the moments of the residuals of the shard of observations
+    between `bounds` given the coefficients `b`. This function is run by
+    the workers during the second pass.
+
+    """
+
+    x_block, x = attach(x_spec, *bounds)
+    y_block, y = attach(y_spec, *bounds)
+
+    try:
+        x = x.reshape(x.shape[0], -1)
+        e = y - b[0] - np.dot(x, b[1:])
+
+        return residual_moments(e)
+
+    finally:
+        del x, y
+        for block in (x_block, y_block):
+            if block is not None:
+                block.close()
+
+
+def ols_sharded(x, y, x_varnm=None, y_varnm='y', method='qr', shards=None,
+                executor=None):
+    """
+
+    Initializes an ordinary least squares (OLS) analysis on a set of data
+    points whose rows are split into shards that are processed in parallel.
+    Returns an `ols` instance in incremental mode, whose residual diagnostics
+    are nonetheless available since the residual moments are computed by
+    the shards.
+
+    Parameters
+    ----------
+    x, y, x_varnm, y_varnm, method :
+        See the __init__ method of the `ols` class.
+
+    shards : int, optional
+        The number of shards into which the rows are split. By default,
+        there are as many shards as there are CPUs.
+
+    executor : concurrent.futures.Executor, optional
+        The executor on which the shards are processed. By default, a process
+        pool with one worker per shard is created and shut down afterwards.
+
+    """
+
+    shards = shards or cpu_count() or 1
+    edges = np.linspace(0, x.shape[0], shards + 1).astype(int)
+    bounds = [(start, stop) for start, stop in zip(edges[:-1], edges[1:])
+              if stop > start]
+
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=len(bounds))
+
+    blocks = []
+
+    try:
+        if shared_memory is None:
+            x_spec, y_spec = x, y
+
+        else:
+            for a in (x, y):
+                block, spec = share(np.ascontiguousarray(a))
+                blocks.append((block, spec))
+
+            x_spec, y_spec = blocks[0][1], blocks[1][1]
+
+        reg = ols(x_varnm=x_varnm, y_varnm=y_varnm, method=method)
+        products = executor.map(partial(shard_cross_products, x_spec, y_spec),
+                                bounds)
+
+        xtx, xty, yty, ysum, nobs = next(products)
+        for stats in products:
+            xtx, xty, yty, ysum, nobs = (
+                total + stat for total, stat in
+                zip((xtx, xty, yty, ysum, nobs), stats))
+
+        reg.accumulate(xtx, xty, yty, ysum, nobs)
+
+        # The shards are returned in order, so the Durbin-Watson
+        # statistic accounts for the differences across shards.
+        moments = residual_moments()
+        for shard in executor.map(partial(shard_moments, x_spec, y_spec,
+                                          reg.b), bounds):
+            moments.merge(shard)
+
+        reg.moments = moments
+
+        return reg
+
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+        for block, _ in blocks:
+            block.close()
+            block.unlink()
@@ -0,0 +1,153 @@
+"""
+Fast p-values for the t, F, and chi-squared distributions.
+
+The distribution objects in scipy.stats (e.g. `stats.t.sf`) validate and
+broadcast their arguments through the generic rv_continuous machinery on
+every call, which costs far more than the evaluation itself when the
+statistics are few. The functions below call the underlying special
+functions from scipy.special directly, and accept scalars as well as arrays.
+
+Repeated evaluations with the same statistic and degrees of freedom, as in
+batch jobs that test many identical designs, can be served from an LRU cache,
+which is disabled by default and enabled by calling `set_cache`. Only scalar
+arguments go through the cache, since arrays are already evaluated in a
+single vectorized call. Note that the special functions only take a few
+microseconds, so a cache lookup is not necessarily faster than evaluating
+them again (see benchmarks/bench_pvalues.py).
+
+"""
+
+from __future__ import division
+
+try:
+    from functools import lru_cache
+
+# Python < 3.2, in which case the cache is not available.
+except ImportError:
+    lru_cache = None
+
+import numpy as np
+
+from .lazy import lazy_import
+
+special = lazy_import('scipy.special')
+
+
+def t_sf(t_stat, df):
+    """
+
+    Returns the survival function (upper tail probability) of Student's
+    t-distribution with `df` degrees of freedom at `t_stat`.
+
+    """
+
+    return evaluate(_t_sf, t_stat, df)
+
+
+def t_two_sided(t_stat, df):
+    """
+
+    Returns the two-sided p-value of the t-statistic `t_stat` with `df`
+    degrees of freedom, i.e. twice the upper tail probability of |t_stat|.
+
+    """
+
+    return evaluate(_t_two_sided, t_stat, df)
+
+
+def f_sf(F, df_n, df_d):
+    """
+
+    Returns the survival function (upper tail probability) of the
+    F-distribution with `df_n` and `df_d` degrees of freedom at `F`.
+
+    """
+
+    return evaluate(_f_sf, F, df_n, df_d)
+
+
+def chi2_sf(x, df):
+    """
+
+    Returns the survival function (upper tail probability) of the
+    chi-squared distribution with `df` degrees of freedom at `x`.
+
+    """
+
+    return evaluate(_chi2_sf, x, df)
+
+
+def _t_sf(t_stat, df):
+    return special.stdtr(df, -t_stat)
+
+
+def _t_two_sided(t_stat, df):
+    return 2 * special.stdtr(df, -np.abs(t_stat))
+
+
+def _f_sf(F, df_n, df_d):
+    return special.fdtrc(df_n, df_d, F)
+
+
+def _chi2_sf(x, df):
+    return special.chdtrc(df, x)
+
+
+_cached = None
+
+
+def set_cache(maxsize=1024):
+    """
+
+    Enables an LRU cache of up to `maxsize` p-values for scalar arguments,
+    discarding any p-values cached so far. Passing 'None' or 0 disables the
+    cache, which is the default.
+
+    """
+
+    global _cached
+
+    if not maxsize:
+        _cached = None
+
+    elif lru_cache is None:
+        raise ValueError("The p-value cache requires functools.lru_cache, " +
+                         "which is only available in Python 3.2 and later")
+
+    else:
+        _cached = lru_cache(maxsize=maxsize)(_scalar)
+
+
+def cache_info():
+    """
+
+    Returns the hits, misses, and size of the p-value cache, or 'None' if
+    the cache is disabled.
+
+    """
+
+    return None if _cached is None else _cached.cache_info()
+
+
+def _scalar(func, *args):
+    return func(*args)
+
+
+def evaluate(func, *args):
+    """
+
+    Evaluates the p-value function `func` on `args`, going through the cache
+    if it is enabled and all of the arguments are scalars. Note that this
+    function is only meant to be called internally to the module.
+
+    """
+
+    if _cached is not None and all(np.ndim(arg) == 0 for arg in args):
+        try:
+            return _cached(func, *(float(arg) for arg in args))
+
+        # Arguments that cannot be converted to a float are not cached.
+        except TypeError:
+            pass
+
+    return func(*args)
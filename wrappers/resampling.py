@@ -0,0 +1,176 @@
+"""
+Resampling engine for permutation and bootstrap t-tests.
+
+Instead of comparing the t-statistic to Student's t-distribution, the
+p-value is estimated from the t-statistics of many resamples of the data
+generated under the null hypothesis. The resamples are generated and reduced
+in vectorized blocks, i.e. as the rows of a matrix, and each block draws
+from its own independent stream of random numbers spawned from a single
+seed, so the results are reproducible and do not depend on the number of
+worker processes among which the blocks are spread.
+
+The blocks are processed in rounds (one block per worker), and the
+resampling stops early once a confidence interval for the p-value lies
+entirely on one side of `alpha`, i.e. once the decision to reject the null
+hypothesis or not can no longer change.
+
+"""
+
+from __future__ import division
+
+from concurrent import futures
+
+import numpy as np
+
+from .lazy import lazy_import
+
+special = lazy_import('scipy.special')
+
+
+# The maximum number of resamples, and of observations drawn
+# for all of them, in a block of resamples.
+BLOCK_RESAMPLES = 1000
+BLOCK_ELEMENTS = 2 ** 20
+
+# The confidence level of the interval for the p-value used to stop early.
+CONFIDENCE = 0.99
+
+
+def count_block(draw, args, t_stat, size, seed):
+    """
+
+    Draws `size` resampled t-statistics with `draw(rng, size, *args)`, where
+    `rng` is a generator seeded with `seed`, and counts how many of them are
+    at least as extreme as `t_stat` in both directions (two-sided) as well
+    as in the direction of `t_stat` (one-sided). This function is run by the
+    workers if there are several of them.
+
+    """
+
+    resampled = draw(np.random.default_rng(seed), size, *args)
+
+    # Resampled statistics equal to `t_stat` up to rounding errors
+    # are counted as being at least as extreme as it is.
+    gamma = abs(t_stat) * 1e-12
+
+    two_sided = np.sum(np.abs(resampled) >= abs(t_stat) - gamma)
+
+    if t_stat >= 0:
+        one_sided = np.sum(resampled >= t_stat - gamma)
+
+    else:
+        one_sided = np.sum(resampled <= t_stat + gamma)
+
+    return two_sided, one_sided
+
+
+def interval(count, total):
+    """
+
+    Returns the Clopper-Pearson confidence interval (at CONFIDENCE) for the
+    probability of which `count` out of `total` is an estimate.
+
+    """
+
+    tail = (1 - CONFIDENCE) / 2
+
+    betaincinv = special.betaincinv
+
+    lower = 0.0 if count == 0 else betaincinv(count, total - count + 1, tail)
+    upper = 1.0 if count == total else betaincinv(count + 1, total - count,
+                                                  1 - tail)
+
+    return lower, upper
+
+
+def resampled_p_value(draw, args, t_stat, nobs, alt_hyp='unequal',
+                      alpha=None, n_resamples=9999, seed=None, workers=1):
+    """
+
+    Estimates the p-value of the t-statistic `t_stat` from resampled
+    t-statistics. Returns the p-value and the number of resamples drawn,
+    which is less than `n_resamples` if the resampling stopped early.
+
+    Parameters
+    ----------
+    draw : callable
+        A module-level function `draw(rng, size, *args)` that returns the
+        t-statistics of `size` resamples drawn with the generator `rng`.
+
+    args : tuple
+        The arguments passed to `draw` after `rng` and `size`.
+
+    t_stat : float
+        The t-statistic of the observations.
+
+    nobs : int
+        The number of observations drawn in each resample, from which the
+        number of resamples per block is derived.
+
+    alt_hyp, alpha :
+        See the t-test classes. As with the p-values from Student's
+        t-distribution, the p-value is one-sided in the direction of
+        `t_stat` whenever `alt_hyp` is not 'unequal'. If `alpha` is set,
+        the resampling can stop early.
+
+    n_resamples : int, optional
+        The maximum number of resamples. The default is 9999.
+
+    seed : int or numpy.random.SeedSequence, optional
+        The seed from which the streams of the blocks are spawned.
+
+    workers : int, optional
+        The number of worker processes among which the blocks are spread.
+        The default is 1, in which case the blocks are processed in this
+        process.
+
+    """
+
+    if np.isnan(t_stat):
+        return np.nan, 0
+
+    size = max(1, min(n_resamples, BLOCK_RESAMPLES,
+                      BLOCK_ELEMENTS // max(nobs, 1)))
+    sizes = [min(size, n_resamples - start)
+             for start in range(0, n_resamples, size)]
+
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = list(zip(sizes, seeds))
+
+    executor = futures.ProcessPoolExecutor(max_workers=workers) \
+        if workers > 1 else None
+
+    total = count = 0
+
+    try:
+        for start in range(0, len(tasks), workers):
+            round_tasks = tasks[start:start + workers]
+
+            if executor is None:
+                results = [count_block(draw, args, t_stat, block_size,
+                                       block_seed)
+                           for block_size, block_seed in round_tasks]
+
+            else:
+                results = [executor.submit(count_block, draw, args, t_stat,
+                                           block_size, block_seed)
+                           for block_size, block_seed in round_tasks]
+                results = [result.result() for result in results]
+
+            for (block_size, _), counts in zip(round_tasks, results):
+                total += block_size
+                count += counts[0] if alt_hyp == 'unequal' else counts[1]
+
+            if alpha:
+                lower, upper = interval(count, total)
+
+                if upper < alpha or lower > alpha:
+                    break
+
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # The observations themselves count as one of the resamples,
+    # so the p-value is never 0.
+    return (count + 1) / (total + 1), total
@@ -0,0 +1,185 @@
+"""
+Heteroskedasticity-robust and cluster-robust covariance matrices of the
+estimates of the OLS wrapper.
+
+The covariance matrices are sandwich estimators
+
+    inv(X_T * X) * M * inv(X_T * X)
+
+whose "meat" M is the cross-product matrix of the design matrix weighted by
+the squared residuals (HC0 to HC3), or that of the sums of the scores
+x_i * e_i within each cluster ('cluster'). Both are computed in a vectorized
+manner: the weighted cross-product with a single matrix product, and the
+cluster sums with a single sparse matrix product (see `group_sums`), so the
+cost is linear in the number of observations regardless of the number of
+clusters.
+
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from .fixed_effects import group_sums
+
+
+COV_TYPES = ('nonrobust', 'HC0', 'HC1', 'HC2', 'HC3', 'cluster')
+
+
+def check_cov_type(cov_type, clusters):
+    """
+
+    Throws a ValueError if `cov_type` is not one of the supported covariance
+    types, or if clusters are passed in (or not) inconsistently with it.
+
+    """
+
+    if cov_type not in COV_TYPES:
+        raise ValueError("Invalid covariance type. " +
+                         "Expected 'nonrobust', 'HC0', 'HC1', 'HC2', " +
+                         "'HC3', or 'cluster' " +
+                         "but got: '" + str(cov_type) + "'")
+
+    if (cov_type == 'cluster') != (clusters is not None):
+        raise ValueError("Clusters must be passed in if and only if " +
+                         "the covariance type is 'cluster'")
+
+
+def sandwich(x, e, r_inv, cov_type, df_e, clusters=None, groups=None,
+             weights=None, weight_type=None):
+    """
+
+    Computes the robust covariance matrix of the estimates of an OLS model.
+    Returns the matrix, or a stack of matrices (one per dependent variable)
+    if `e` is a matrix.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The design matrix of the model.
+
+    e : numpy.ndarray
+        The residuals of the model (unweighted).
+
+    r_inv : numpy.ndarray
+        The factor of the inverse of the (weighted) cross-product matrix of
+        `x` returned by the solver (see the `solvers` module).
+
+    cov_type : string
+        One of 'HC0', 'HC1', 'HC2', 'HC3', or 'cluster'. HC1 scales HC0 by
+        nobs / df_e, while HC2 and HC3 divide the squared residuals by
+        (1 - h) and (1 - h) ** 2, where h is the leverage of the observation.
+        'cluster' scales by G / (G - 1) * (nobs - 1) / df_e, where G is the
+        number of clusters.
+
+    df_e : int
+        The degrees of freedom for the error of the model.
+
+    clusters : numpy.ndarray, optional
+        The integer code of the cluster of each observation.
+
+    groups : list, optional
+        The integer codes of the levels of the fixed effects absorbed by
+        demeaning `x`, as for `ols`. Only one effect is supported by HC2
+        and HC3, whose leverages then include that of the absorbed dummy
+        columns.
+
+    weights, weight_type : optional
+        The weights of the observations and their type, as for `ols`.
+        Frequency weights count each observation as many times as its weight,
+        while analytic weights scale the observations by their square roots.
+
+    """
+
+    nobs = len(e) if weights is None else weights.sum()
+
+    # Leverage of each observation: the squared norm of its row of
+    # x * r_inv, whose products are the hat matrix.
+    if cov_type in ('HC2', 'HC3'):
+        h = np.sum(np.square(np.dot(x, r_inv)), axis=1)
+
+        if weight_type == 'analytic':
+            h = h * weights
+
+        # The demeaned design matrix is orthogonal to the dummy columns of
+        # the absorbed effect, so their leverage adds up with that of `x`:
+        # the weight of the observation over the total weight of its group.
+        if groups is not None:
+            w = np.ones(len(e)) if weights is None else weights
+            totals = np.bincount(groups[0], weights=w)
+
+            h = h + (w if weight_type == 'analytic' else 1.0) / \
+                totals[groups[0]]
+
+    # Each observation enters the meat with its squared residual multiplied
+    # by `m`: its frequency, or its analytic weight squared.
+    if weights is None:
+        m = 1.0
+
+    elif weight_type == 'frequency':
+        m = weights
+
+    else:
+        m = np.square(weights)
+
+    e = e.reshape(len(e), -1)
+    bread = np.dot(r_inv, r_inv.T)
+
+    covs = []
+
+    for j in range(e.shape[1]):
+        if cov_type == 'cluster':
+            # With frequency weights, the copies of an observation share its
+            # cluster, and with analytic weights, the scaled scores are the
+            # same, so in both cases the scores are weighted once.
+            w = 1.0 if weights is None else weights
+            scores, _ = group_sums(x * (w * e[:, j])[:, None], clusters)
+
+            meat = np.dot(scores.T, scores)
+            nclusters = scores.shape[0]
+
+            meat *= (nclusters / (nclusters - 1)) * ((nobs - 1) / df_e)
+
+        else:
+            c = m * np.square(e[:, j])
+
+            if cov_type == 'HC2':
+                c = c / (1 - h)
+
+            elif cov_type == 'HC3':
+                c = c / np.square(1 - h)
+
+            meat = np.dot((x * c[:, None]).T, x)
+
+            if cov_type == 'HC1':
+                meat *= nobs / df_e
+
+        covs.append(np.dot(np.dot(bread, meat), bread))
+
+    return covs[0] if len(covs) == 1 else np.array(covs)
+
+
+def wald_f(b, cov, const=True):
+    """
+
+    Computes the Wald F-statistic for the joint significance of the slopes
+    (i.e. all of the coefficients but the constant, if there is one) given
+    their covariance matrix `cov`, which replaces the F-statistic based on
+    the R-squared statistic when the covariance matrix is robust. Returns
+    one statistic per dependent variable if `b` is a matrix.
+
+    """
+
+    b = b.reshape(b.shape[0], -1)
+    covs = cov.reshape((-1,) + cov.shape[-2:])
+
+    start = 1 if const else 0
+    stats = []
+
+    for j in range(b.shape[1]):
+        slopes = b[start:, j]
+        stat = np.dot(slopes, np.linalg.solve(covs[j][start:, start:], slopes))
+
+        stats.append(stat / len(slopes))
+
+    return stats[0] if len(stats) == 1 else np.array(stats)
@@ -0,0 +1,252 @@
+"""
+Rolling and expanding window OLS regressions.
+
+Instead of estimating the model from scratch for every window, the inverse
+of the cross-product matrix is updated with the Sherman-Morrison formula
+as observations enter and leave the window, which costs O(p^2) per window
+rather than O(w * p^2). The cross-product matrix is updated alongside by
+adding and subtracting the outer products of the observations, which only
+incurs the rounding errors of those additions, so to keep the (much larger)
+rounding errors of the updated inverse from accumulating, the inverse is
+periodically recomputed from the cross-product matrix itself.
+
+A window whose design matrix is rank deficient (e.g. a column that is
+constant over the window) has no inverse to update: its entries are 'nan',
+and the inverse is recomputed from the cross-product matrix on each of the
+following windows until it is of full rank again.
+
+"""
+
+from __future__ import division
+
+from numpy import asarray, dot, empty, finfo, full, multiply, nan, outer, \
+    sqrt
+from numpy import sum as np_sum
+from numpy.linalg import LinAlgError
+
+from .design import variable_names
+from .ols import ols
+from .pvalues import t_two_sided
+from .solvers import GRAM_SOLVERS, cross_products
+
+
+# The smallest denominator of the Sherman-Morrison formula below which the
+# window is considered to have become rank deficient, in which case the
+# updated inverse would be meaningless.
+MIN_DENOMINATOR = sqrt(finfo(float).eps)
+
+
+class rolling_ols(object):
+    def __init__(self, x, y, window=None, min_nobs=None, x_varnm=None,
+                 y_varnm='y', refresh=100):
+        """
+
+        Initializes a rolling (or expanding) window ordinary least squares
+        (OLS) analysis on a set of data points, in which an OLS model is
+        estimated on each window of consecutive observations.
+
+        Parameters
+        ----------
+        x, y, x_varnm, y_varnm :
+            See the __init__ method of the `ols` class.
+
+        window : int, optional
+            The number of observations in each window. If no window is
+            provided, the windows are expanding, i.e. they all start with
+            the first observation.
+
+        min_nobs : int, optional
+            The minimum number of observations in a window for a model to be
+            estimated on it, which must exceed the number of coefficients.
+            The default is `window` if provided, and the number of
+            coefficients plus one otherwise.
+
+        refresh : int, optional
+            The number of updates after which the inverse of the cross-product
+            matrix is recomputed from scratch. The default is 100.
+
+        The results are stored as attributes of the instance, with one entry
+        along the first axis per window, indexed by the last observation of
+        the window. Entries for windows with fewer than `min_nobs` observations
+        or whose design matrix is rank deficient are 'nan'. They are as
+        follows:
+
+        nobs : number of observations in each window
+
+        b : estimates for the coefficients and intercept
+
+        se : standard errors for the coefficients and the intercept estimated
+
+        t : t-statistics for the coefficients and the intercept estimated
+
+        p : p-values for the coefficients and the intercept estimated
+
+        R2 : R-squared statistic for the regression model
+
+        """
+
+        self.x = asarray(x, dtype=float)
+        self.y = asarray(y, dtype=float)
+
+        self.window = window
+        self.refresh = refresh
+
+        ncoef = 2 if len(self.x.shape) == 1 else self.x.shape[1] + 1
+        self.min_nobs = min_nobs or window or ncoef + 1
+
+        if self.min_nobs <= ncoef or (window and self.min_nobs > window):
+            raise ValueError("Invalid minimum number of observations. " +
+                             "Expected more than " + str(ncoef) +
+                             " and at most the window size " +
+                             "but got: " + str(self.min_nobs))
+
+        # The names are generated in the same way as for a single model.
+        self.x_varnm, self.y_varnm = variable_names(
+            ncoef - 1, 1 if len(self.y.shape) == 1 else self.y.shape[1],
+            x_varnm, y_varnm)
+
+        self.estimate()
+
+    def estimate(self):
+        """
+
+        Estimates the models on all of the windows. See the __init__ method
+        for the attributes in which the results are stored.
+
+        """
+
+        nobs = self.y.shape[0]
+        x = self.x.reshape(nobs, -1)
+        ncoef = x.shape[1] + 1
+
+        self.nobs = full(nobs, nan)
+        self.b = full((nobs, ncoef) + self.y.shape[1:], nan)
+        self.se = full(self.b.shape, nan)
+        self.R2 = full((nobs,) + self.y.shape[1:], nan)
+
+        first = self.min_nobs - 1
+
+        if first >= nobs:
+            self.t = self.b.copy()
+            self.p = self.b.copy()
+            return
+
+        xtx, xty, yty, ysum, count = cross_products(self.x[:first + 1],
+                                                    self.y[:first + 1])
+        inv_xx = self.invert(xtx, xty, count)
+        updates = 0
+
+        # The row of the design matrix of each observation is filled in
+        # when it enters or leaves the window, instead of copying `x`.
+        z = empty(ncoef)
+        z[0] = 1.0
+
+        for i in range(first, nobs):
+            if i > first:
+                z[1:] = x[i]
+                inv_xx = self.update(inv_xx, z, 1)
+                xtx += outer(z, z)
+                xty += multiply.outer(z, self.y[i])
+                yty += self.y[i] * self.y[i]
+                ysum += self.y[i]
+                count += 1
+
+                if self.window and i >= self.window:
+                    z[1:] = x[i - self.window]
+                    inv_xx = self.update(inv_xx, z, -1)
+                    xtx -= outer(z, z)
+                    xty -= multiply.outer(z, self.y[i - self.window])
+                    yty -= self.y[i - self.window] * self.y[i - self.window]
+                    ysum -= self.y[i - self.window]
+                    count -= 1
+
+                updates += 1
+
+                if inv_xx is None or updates >= self.refresh:
+                    inv_xx = self.invert(xtx, xty, count)
+                    updates = 0
+
+            self.nobs[i] = count
+
+            if inv_xx is None:
+                continue
+
+            b = dot(inv_xx, xty)
+            ssr = yty - np_sum(b * xty, axis=0)
+
+            self.b[i] = b
+            self.se[i] = sqrt(multiply.outer(inv_xx.diagonal(),
+                                             ssr / (count - ncoef)))
+            self.R2[i] = 1 - ssr / (yty - ysum * ysum / count)
+
+        self.t = self.b / self.se
+
+        df_e = (self.nobs - ncoef).reshape((nobs,) + (1,) *
+                                           (len(self.t.shape) - 1))
+        self.p = t_two_sided(self.t, df_e)
+
+    def invert(self, xtx, xty, nobs):
+        """
+
+        Computes the inverse of the cross-product matrix `xtx` from scratch,
+        or returns None if the window is rank deficient. Note that this
+        method is only meant to be called internally to the class and not
+        externally.
+
+        """
+
+        try:
+            _, r_inv = GRAM_SOLVERS['cholesky'](xtx, xty, nobs)
+
+        except LinAlgError:
+            return None
+
+        return dot(r_inv, r_inv.T)
+
+    def update(self, inv_xx, z, sign):
+        """
+
+        Updates the inverse of the cross-product matrix `inv_xx` when the
+        observation `z` (constant included) enters (`sign` = 1) or leaves
+        (`sign` = -1) the window using the Sherman-Morrison formula. Returns
+        None if there is no inverse to update, or if the window has become
+        rank deficient, i.e. the denominator of the formula is about zero.
+        Note that this method is only meant to be called internally to the
+        class and not externally.
+
+        """
+
+        if inv_xx is None:
+            return None
+
+        u = dot(inv_xx, z)
+        denominator = 1 + sign * dot(z, u)
+
+        if denominator < MIN_DENOMINATOR:
+            return None
+
+        return inv_xx - sign * outer(u, u) / denominator
+
+    def ols(self, i):
+        """
+
+        Returns the full `ols` model estimated on the window ending with the
+        i-th observation, e.g. to inspect its residual diagnostics.
+
+        """
+
+        start = 0 if self.window is None else max(0, i + 1 - self.window)
+
+        return ols(self.x[start:i + 1], self.y[start:i + 1],
+                   x_varnm=self.x_varnm[1:], y_varnm=self.y_varnm)
+
+    def __str__(self):
+        kind = "Expanding" if self.window is None else \
+               "Rolling (window of " + str(self.window) + ")"
+
+        return kind + " OLS Regression on " + str(self.y.shape[0]) + \
+            " Observations"
+
+    __repr__ = __str__
+    __bytes__ = __str__
+    __unicode__ = __str__
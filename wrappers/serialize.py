@@ -0,0 +1,493 @@
+"""
+Serialization of the results of the OLS and t-test wrappers.
+
+Every result object provides a `to_dict` method returning its results as a
+(possibly nested) dictionary, which can contain NumPy scalars and arrays.
+The functions in this module write such dictionaries out in one of two
+formats:
+
+    'json' : JSON, where NumPy scalars and arrays are converted to their
+             Python equivalents by `numpy_encoder`
+
+    'npz'  : NumPy's binary .npz format, where the dictionary is flattened
+             into '/'-separated keys and arrays are stored as they are (see
+             `flatten` for how names containing '/' and 'None' values are
+             kept)
+
+`result_writer` appends the results of many objects to a single file, and
+`async_writer` does the same from a background thread, so that the threads
+computing the results do not wait on the disk. `default_filename` generates
+filenames that do not collide with each other.
+
+"""
+
+from __future__ import division
+
+import re
+from itertools import count
+from json import JSONEncoder, dump as json_dump, load as json_load, loads
+from os import getpid
+from threading import Thread
+from time import localtime, strftime
+from uuid import uuid4
+
+try:
+    from queue import Empty, Queue
+
+# Python 2, in which the module has a different name.
+except ImportError:
+    from Queue import Empty, Queue
+
+import numpy as np
+
+
+FORMATS = ('json', 'npz')
+
+
+def check_format(format):
+    """
+
+    Throws a ValueError if `format` is not one of the supported formats.
+
+    """
+
+    if format not in FORMATS:
+        raise ValueError("Invalid file format. " +
+                         "Expected 'json' or 'npz' " +
+                         "but got: '" + str(format) + "'")
+
+
+class numpy_encoder(JSONEncoder):
+    """
+
+    JSON encoder that converts NumPy scalars and arrays to the equivalent
+    Python numbers and lists. Only objects that the standard encoder does
+    not know how to serialize go through this conversion.
+
+    """
+
+    def default(self, obj):
+        if isinstance(obj, np.generic):
+            return obj.item()
+
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+
+        return JSONEncoder.default(self, obj)
+
+
+_counter = count()
+
+
+def default_filename(format='json', t=None):
+    """
+
+    Generates a filename from the local time `t` (by default, now). Unlike a
+    filename made from the time alone, the filename is unique even when many
+    results are written out within the same second (or by many processes).
+
+    """
+
+    t = t or localtime()
+
+    return "%s_%d_%d_%s.%s" % (strftime("%a_%d_%b_%Y_%H_%M_%S", t), getpid(),
+                               next(_counter), uuid4().hex[:8], format)
+
+
+# Stands in for 'None' values in .npz files, which cannot hold Python
+# objects without pickling them: a scalar of a structured type without
+# fields, which no result can otherwise contain.
+NONE = np.dtype([])
+
+ESCAPES = {'%': '%25', '/': '%2F'}
+UNESCAPES = re.compile('%(25|2F)')
+
+
+def escape(key):
+    """
+
+    Escapes the '/' (and '%') characters in `key`, so that the names of the
+    results can contain them without being mistaken for nested keys.
+
+    """
+
+    return ''.join(ESCAPES.get(char, char) for char in key)
+
+
+def unescape(key):
+    """
+
+    Inverts `escape`.
+
+    """
+
+    return UNESCAPES.sub(lambda match: '%' if match.group(1) == '25' else '/',
+                         key)
+
+
+def flatten(data, prefix=''):
+    """
+
+    Flattens a nested dictionary into a dictionary of arrays whose keys are
+    the '/'-separated paths to the values, each part of which is escaped
+    (see `escape`). 'None' values are stored as empty scalars of type
+    `NONE`.
+
+    """
+
+    flat = {}
+
+    for key, value in data.items():
+        key = prefix + escape(str(key))
+
+        if isinstance(value, dict):
+            flat.update(flatten(value, key + '/'))
+
+        elif value is None:
+            flat[key] = np.zeros((), dtype=NONE)
+
+        else:
+            flat[key] = np.asarray(value)
+
+    return flat
+
+
+def unflatten(flat):
+    """
+
+    Inverts `flatten`, turning 0-d arrays back into scalars.
+
+    """
+
+    data = {}
+
+    for key, value in flat.items():
+        path = [unescape(part) for part in key.split('/')]
+        name = path.pop()
+        node = data
+
+        for part in path:
+            node = node.setdefault(part, {})
+
+        if value.dtype == NONE:
+            node[name] = None
+
+        else:
+            node[name] = value[()] if value.ndim == 0 else value
+
+    return data
+
+
+def dump(data, filename, format='json'):
+    """
+
+    Writes out the dictionary of results `data` into `filename` in `format`.
+
+    """
+
+    check_format(format)
+
+    if format == 'json':
+        with open(filename, 'w') as target:
+            json_dump(data, target, cls=numpy_encoder)
+
+    else:
+        with open(filename, 'wb') as target:
+            np.savez(target, **flatten(data))
+
+
+def load(filename, format=None):
+    """
+
+    Reads back the dictionary of results written out into `filename` by
+    `dump`. The format is inferred from the extension unless it is passed in.
+
+    """
+
+    format = format or filename.rsplit('.', 1)[-1]
+    check_format(format)
+
+    if format == 'json':
+        with open(filename) as source:
+            return json_load(source)
+
+    with np.load(filename) as source:
+        return unflatten(dict(source.items()))
+
+
+class result_writer(object):
+    def __init__(self, filename=None, format='json'):
+        """
+
+        Initializes a writer that collects the results of many result objects
+        into a single file, which is much faster than writing one file per
+        result. It can be used as a context manager, which closes it on exit.
+
+        Parameters
+        ----------
+        filename : string, optional
+            The location of the file where the results will be stored. If no
+            filename is provided, a default filename will be generated.
+
+        format : string, optional
+            The format of the file. Allowed options are 'json' and 'npz'. With
+            'json', each result is written out on its own line as soon as it
+            is submitted (i.e. JSON Lines), and the file is appended to if it
+            already exists. With 'npz', results are collected
+            in memory and written out when the writer is closed, with the keys
+            of the i-th result prefixed by 'i/'. The default is 'json'.
+
+        """
+
+        check_format(format)
+
+        self.format = format
+        self.filename = filename or default_filename(format)
+        self.count = 0
+
+        if self.format == 'json':
+            self.target = open(self.filename, 'a')
+            self.encoder = numpy_encoder()
+
+        else:
+            self.arrays = {}
+
+    def write(self, result):
+        """
+
+        Submits `result`, which is either a result object or a dictionary of
+        results as returned by the `to_dict` method of a result object.
+
+        """
+
+        self.write_all([result])
+
+    def write_all(self, results):
+        """
+
+        Submits all of `results` at once, which with 'json' are written out
+        in a single call instead of one call per result.
+
+        """
+
+        data = [result if isinstance(result, dict) else result.to_dict()
+                for result in results]
+
+        if self.format == 'json':
+            self.target.write(''.join(self.encoder.encode(entry) + '\n'
+                                      for entry in data))
+
+        else:
+            for i, entry in enumerate(data):
+                self.arrays.update(flatten(entry, str(self.count + i) + '/'))
+
+        self.count += len(data)
+
+    def flush(self):
+        """
+
+        Flushes the results submitted so far to the file with 'json'. With
+        'npz', the results are only written out when the writer is closed.
+
+        """
+
+        if self.format == 'json':
+            self.target.flush()
+
+    def close(self):
+        """
+
+        Flushes all of the results submitted so far and closes the file.
+
+        """
+
+        if self.format == 'json':
+            self.target.close()
+
+        else:
+            with open(self.filename, 'wb') as target:
+                np.savez(target, **self.arrays)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Submitted to the queue of an `async_writer` to stop its thread.
+_CLOSE = object()
+
+
+class async_writer(object):
+    def __init__(self, filename=None, format='json', maxsize=1024,
+                 batch_size=256):
+        """
+
+        Initializes a writer that collects the results of many result objects
+        into a single file like `result_writer`, except that the results are
+        written out by a background thread. Submitting a result only converts
+        it with `to_dict` and puts it on a queue, so the submitting threads
+        only wait on the disk when the queue is full. It can be used as a
+        context manager, which closes it on exit.
+
+        Parameters
+        ----------
+        filename, format : optional
+            See `result_writer`.
+
+        maxsize : int, optional
+            The maximum number of results waiting on the queue, beyond which
+            submitting a result blocks until the thread catches up, which
+            bounds the memory held by the queue. The default is 1024.
+
+        batch_size : int, optional
+            The maximum number of queued results that the thread writes out
+            at once (see `result_writer.write_all`). The default is 256.
+
+        """
+
+        self.writer = result_writer(filename, format)
+        self.filename = self.writer.filename
+        self.batch_size = batch_size
+
+        self.queue = Queue(maxsize)
+        self.error = None
+        self.closed = False
+
+        self.thread = Thread(target=self.run, name='async_writer')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        """
+
+        Writes out the results on the queue in batches until the writer is
+        closed. If writing fails, the error is saved and raised in the
+        submitting thread, and the remaining results are discarded. Note that
+        this method is only meant to be called internally to the class and
+        not externally.
+
+        """
+
+        while True:
+            batch = [self.queue.get()]
+
+            while len(batch) < self.batch_size and batch[-1] is not _CLOSE:
+                try:
+                    batch.append(self.queue.get_nowait())
+
+                except Empty:
+                    break
+
+            done = batch[-1] is _CLOSE
+
+            if done:
+                batch.pop()
+
+            try:
+                if batch and self.error is None:
+                    self.writer.write_all(batch)
+                    self.writer.flush()
+
+            except Exception as error:
+                self.error = error
+
+            for _ in range(len(batch) + done):
+                self.queue.task_done()
+
+            if done:
+                return
+
+    def check_error(self):
+        """
+
+        Raises the error that stopped the thread from writing, if any. Note
+        that this method is only meant to be called internally to the class
+        and not externally.
+
+        """
+
+        if self.error is not None:
+            raise self.error
+
+    def write(self, result):
+        """
+
+        Submits `result`, which is either a result object or a dictionary of
+        results as returned by the `to_dict` method of a result object.
+
+        """
+
+        if self.closed:
+            raise ValueError("Cannot write to a closed writer")
+
+        self.check_error()
+        self.queue.put(result if isinstance(result, dict)
+                       else result.to_dict())
+
+    @property
+    def count(self):
+        """
+
+        The number of results written out by the thread so far.
+
+        """
+
+        return self.writer.count
+
+    def flush(self):
+        """
+
+        Waits until all of the results submitted so far have been written
+        out (but, with 'npz', not saved, as in `result_writer.flush`).
+
+        """
+
+        self.queue.join()
+        self.check_error()
+
+    def close(self):
+        """
+
+        Waits until all of the results submitted so far have been written
+        out, then stops the thread and closes the file.
+
+        """
+
+        if self.closed:
+            return
+
+        self.closed = True
+        self.queue.put(_CLOSE)
+        self.thread.join()
+
+        self.writer.close()
+        self.check_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_all(filename, format=None):
+    """
+
+    Reads back the list of dictionaries of results written out into
+    `filename` by a `result_writer`.
+
+    """
+
+    format = format or filename.rsplit('.', 1)[-1]
+    check_format(format)
+
+    if format == 'json':
+        with open(filename) as source:
+            return [loads(line) for line in source if line.strip()]
+
+    data = load(filename, format)
+
+    return [data[str(i)] for i in range(len(data))]
+
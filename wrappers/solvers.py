@@ -0,0 +1,284 @@
+"""
+Least squares solvers used by the OLS wrapper.
+
+Each solver takes the design matrix `x` (constant column included) and the
+dependent variable observations `y`, and returns a tuple `(b, r_inv)` where
+`b` holds the estimated coefficients and `r_inv` is a square factor of the
+inverse of the cross-product matrix, i.e.
+
+    inv(dot(x.T, x)) == dot(r_inv, r_inv.T)
+
+Standard errors only ever need the diagonal of that inverse, which is the
+row-wise sum of squares of `r_inv`, so the full inverse never has to be
+formed unless it is explicitly requested.
+
+When the observations themselves are not available, the same solutions can
+be computed from the cross-product matrices dot(x.T, x) and dot(x.T, y) by
+the solvers in GRAM_SOLVERS, which take `(xtx, xty, nobs)` instead.
+
+"""
+
+from __future__ import division
+
+from numpy import dot, empty, eye, finfo, multiply, sqrt
+from numpy import abs as np_abs
+from numpy import sum as np_sum
+from numpy.linalg import LinAlgError
+
+from .lazy import lazy_import
+
+linalg = lazy_import('scipy.linalg')
+
+
+SINGULAR_MSG = ("\n\nYour matrix of independent observations is singular!"
+                "\nUnfortunately, that means we cannot compute an OLS"
+                "\nmodel for your provided data. Terminating immediately.")
+
+
+def _check_rank(diag, nrows):
+    """
+
+    Raises a LinAlgError if the magnitudes in `diag` (the diagonal of a
+    triangular factor or the singular values of the design matrix) indicate
+    that the design matrix is rank deficient. The tolerance used is the same
+    as the one used by numpy.linalg.matrix_rank.
+
+    """
+
+    diag = np_abs(diag)
+    tol = diag.max() * max(nrows, len(diag)) * finfo(float).eps
+
+    if diag.min() <= tol:
+        raise LinAlgError(SINGULAR_MSG)
+
+
+def _check_shape(x):
+    """
+
+    Raises a LinAlgError if the design matrix `x` has more columns
+    than rows, in which case it is necessarily singular.
+
+    """
+
+    if x.shape[0] < x.shape[1]:
+        raise LinAlgError(SINGULAR_MSG)
+
+
+def solve_qr(x, y):
+    """
+
+    Solves the least squares problem using a Householder QR decomposition
+    of `x`. The orthogonal factor Q is never formed explicitly, as only its
+    product with `y` is needed.
+
+    """
+
+    _check_shape(x)
+
+    # qr_multiply computes dot(c, Q), so we pass in the transpose
+    # of `y` in order to get back the transpose of dot(Q.T, y).
+    qty, r = linalg.qr_multiply(x, y.T, mode='right')
+    _check_rank(r.diagonal(), x.shape[0])
+
+    b = linalg.solve_triangular(r, qty.T, check_finite=False)
+    r_inv = linalg.solve_triangular(r, eye(r.shape[0]), check_finite=False)
+
+    return b, r_inv
+
+
+def solve_cholesky(x, y):
+    """
+
+    Solves the least squares problem by forming the normal equations and
+    solving them using a Cholesky decomposition of dot(x.T, x). This is the
+    cheapest of the solvers but squares the condition number of `x`.
+
+    """
+
+    _check_shape(x)
+
+    return cholesky_from_gram(dot(x.T, x), dot(x.T, y), x.shape[0])
+
+
+def solve_svd(x, y):
+    """
+
+    Solves the least squares problem using a singular value decomposition
+    of `x`. This is the most expensive but most robust of the solvers.
+
+    """
+
+    _check_shape(x)
+
+    u, s, vt = linalg.svd(x, full_matrices=False, check_finite=False)
+    _check_rank(s, x.shape[0])
+
+    r_inv = vt.T / s
+    b = dot(r_inv, dot(u.T, y))
+
+    return b, r_inv
+
+
+def solve_normal(x, y):
+    """
+
+    Solves the least squares problem by explicitly inverting dot(x.T, x).
+    This is the original estimation path of the OLS wrapper and is kept
+    around mainly for comparison purposes.
+
+    """
+
+    _check_shape(x)
+
+    return inverse_from_gram(dot(x.T, x), dot(x.T, y), x.shape[0])
+
+
+def cholesky_from_gram(xtx, xty, nobs):
+    """
+
+    Solves the normal equations dot(xtx, b) = xty using a Cholesky
+    decomposition of `xtx`, where `nobs` is the number of observations
+    from which the cross-product matrices were accumulated.
+
+    """
+
+    try:
+        r = linalg.cholesky(xtx, lower=False, check_finite=False)
+
+    except (LinAlgError, ValueError):
+        raise LinAlgError(SINGULAR_MSG)
+
+    # The Cholesky factor matches the triangular factor from a QR
+    # decomposition of the design matrix, but it was computed from
+    # `xtx`, so the rank check is done at the precision of `xtx`.
+    _check_rank(r.diagonal() ** 2, nobs)
+
+    b = linalg.cho_solve((r, False), xty, check_finite=False)
+    r_inv = linalg.solve_triangular(r, eye(r.shape[0]), check_finite=False)
+
+    return b, r_inv
+
+
+def eigh_from_gram(xtx, xty, nobs):
+    """
+
+    Solves the normal equations dot(xtx, b) = xty using an eigenvalue
+    decomposition of `xtx`, whose eigenvalues are the squared singular
+    values of the design matrix from which `xtx` was accumulated.
+
+    """
+
+    w, v = linalg.eigh(xtx, check_finite=False)
+    _check_rank(w, nobs)
+
+    r_inv = v / sqrt(w)
+    b = dot(r_inv, dot(r_inv.T, xty))
+
+    return b, r_inv
+
+
+def inverse_from_gram(xtx, xty, nobs):
+    """
+
+    Solves the normal equations dot(xtx, b) = xty by explicitly inverting
+    `xtx`. The Cholesky factor of the inverse is returned as `r_inv`.
+
+    """
+
+    try:
+        inv_xx = linalg.inv(xtx)
+        r_inv = linalg.cholesky(inv_xx, lower=True, check_finite=False)
+
+    except (LinAlgError, ValueError):
+        raise LinAlgError(SINGULAR_MSG)
+
+    b = dot(inv_xx, xty)
+
+    return b, r_inv
+
+
+SOLVERS = {
+    'qr': solve_qr,
+    'cholesky': solve_cholesky,
+    'svd': solve_svd,
+    'normal': solve_normal,
+}
+
+# A QR decomposition cannot be computed from the cross-product matrix,
+# but its triangular factor is the same as the Cholesky factor of the
+# cross-product matrix, so 'qr' falls back onto the Cholesky solver.
+GRAM_SOLVERS = {
+    'qr': cholesky_from_gram,
+    'cholesky': cholesky_from_gram,
+    'svd': eigh_from_gram,
+    'normal': inverse_from_gram,
+}
+
+
+def get_solver(method):
+    """
+
+    Returns the solver corresponding to `method`. Throws a ValueError if
+    `method` is not one of 'qr', 'cholesky', 'svd', or 'normal'.
+
+    """
+
+    try:
+        return SOLVERS[method]
+
+    except (KeyError, TypeError):
+        raise ValueError("Invalid solver method. " +
+                         "Expected 'qr', 'cholesky', 'svd', or 'normal' " +
+                         "but got: '" + str(method) + "'")
+
+
+def cross_products(x, y):
+    """
+
+    Computes the cross-product matrices of the design matrix obtained by
+    prepending a constant column to `x` without actually forming that
+    design matrix. Returns the tuple `(xtx, xty, yty, ysum, nobs)` where
+    `yty` and `ysum` are the sum of squares and the sum of `y`.
+
+    """
+
+    nobs = x.shape[0]
+    x = x.reshape(nobs, -1)
+
+    xtx = empty((x.shape[1] + 1, x.shape[1] + 1))
+    xtx[0, 0] = nobs
+    xtx[0, 1:] = xtx[1:, 0] = x.sum(axis=0)
+    xtx[1:, 1:] = dot(x.T, x)
+
+    ysum = y.sum(axis=0)
+
+    xty = empty((x.shape[1] + 1,) + y.shape[1:])
+    xty[0] = ysum
+    xty[1:] = dot(x.T, y)
+
+    yty = np_sum(y * y, axis=0)
+
+    return xtx, xty, yty, ysum, nobs
+
+
+def inv_diagonal(r_inv):
+    """
+
+    Returns the diagonal of dot(r_inv, r_inv.T) without forming the product.
+
+    """
+
+    return np_sum(r_inv * r_inv, axis=1)
+
+
+def std_errors(r_inv, sse):
+    """
+
+    Returns the standard errors of the coefficients given the factor `r_inv`
+    of the inverted cross-product matrix and the residual variance `sse`.
+    If `sse` is an array with one residual variance per dependent variable,
+    the standard errors are returned as a matrix with one column for each.
+
+    """
+
+    return sqrt(multiply.outer(inv_diagonal(r_inv), sse))
@@ -0,0 +1,226 @@
+"""
+Columnar tables of the results of many OLS models and t-tests.
+
+Instead of one nested dictionary per result (see `to_dict`), the functions
+below gather the results of many objects into a NumPy structured array with
+one row per model, per coefficient, or per t-test, and one field per
+statistic. The table can be saved with `numpy.save` and loaded back with
+`numpy.load` (optionally memory-mapped) in a single read, or exported to
+Parquet with `to_parquet` if pyarrow is installed.
+
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from .ttest import ttest_batch
+
+
+def text_dtype(values):
+    """
+
+    Returns the NumPy dtype of fixed-width strings long enough for all of
+    `values`.
+
+    """
+
+    return 'U%d' % max([len(value) for value in values] + [1])
+
+
+def table(columns, names, dtypes):
+    """
+
+    Builds a structured array from the list of `columns`, whose fields are
+    named `names` and of the dtypes `dtypes`. String columns (whose dtype is
+    None) get the width of their longest entry.
+
+    """
+
+    dtypes = [text_dtype(column) if dtype is None else dtype
+              for column, dtype in zip(columns, dtypes)]
+
+    result = np.empty(len(columns[0]), dtype=list(zip(names, dtypes)))
+
+    for name, column in zip(names, columns):
+        result[name] = column
+
+    return result
+
+
+def responses(model):
+    """
+
+    Returns the names of the dependent variables of `model` along with a
+    function that selects the statistics of the j-th one, as in `summary`.
+
+    """
+
+    if model.nresp > 1:
+        return list(model.y_varnm), lambda values, j: np.asarray(values)[..., j]
+
+    return [model.y_varnm], lambda values, j: values
+
+
+def model_table(models):
+    """
+
+    Returns a structured array with one row per OLS model in `models` (or
+    per dependent variable, for models of several of them) and the following
+    fields:
+
+        model, dependent_var, method, cov_type, obs_count, var_count,
+        r_squared, r_squared_adj, f_stat, f_stat_p_val, durbin_watson,
+        log_likelihood, aic_stat, bic_stat
+
+    where `model` is the position of the model in `models`.
+
+    """
+
+    names = ('model', 'dependent_var', 'method', 'cov_type', 'obs_count',
+             'var_count', 'r_squared', 'r_squared_adj', 'f_stat',
+             'f_stat_p_val', 'durbin_watson', 'log_likelihood', 'aic_stat',
+             'bic_stat')
+    dtypes = ('i8', None, None, None, 'f8', 'i8') + ('f8',) * 8
+
+    rows = []
+
+    for i, model in enumerate(models):
+        y_varnms, col = responses(model)
+        ll, aic, bic = model.ll()
+        dw = model.dw()
+
+        for j, y_varnm in enumerate(y_varnms):
+            rows.append((i, y_varnm, model.method, model.cov_type,
+                         model.nobs, model.ncoef, col(model.R2, j),
+                         col(model.R2adj, j), col(model.F, j),
+                         col(model.Fpv, j), col(dw, j), col(ll, j),
+                         col(aic, j), col(bic, j)))
+
+    columns = [list(column) for column in zip(*rows)] or [[]] * len(names)
+
+    return table(columns, names, dtypes)
+
+
+def coefficient_table(models):
+    """
+
+    Returns a structured array with one row per coefficient of each OLS
+    model in `models` (and per dependent variable, for models of several of
+    them) and the following fields:
+
+        model, dependent_var, variable, estimate, std_error, t_stat, p_val
+
+    where `model` is the position of the model in `models`. The statistics
+    of each model are copied in as whole arrays, so the cost per model does
+    not depend on its number of coefficients.
+
+    """
+
+    names = ('model', 'dependent_var', 'variable', 'estimate', 'std_error',
+             't_stat', 'p_val')
+    dtypes = ('i8', None, None, 'f8', 'f8', 'f8', 'f8')
+
+    columns = [[] for _ in names]
+
+    for i, model in enumerate(models):
+        y_varnms, col = responses(model)
+        ncoef = len(model.x_varnm)
+
+        for j, y_varnm in enumerate(y_varnms):
+            columns[0].append(np.full(ncoef, i))
+            columns[1].extend([y_varnm] * ncoef)
+            columns[2].extend(model.x_varnm)
+
+            for k, values in enumerate((model.b, model.se, model.t,
+                                        model.p), 3):
+                columns[k].append(col(values, j))
+
+    for k in (0, 3, 4, 5, 6):
+        columns[k] = np.concatenate(columns[k]) if columns[k] else []
+
+    return table(columns, names, dtypes)
+
+
+def ttest_table(tests):
+    """
+
+    Returns a structured array with one row per t-test in `tests`, which
+    can contain single t-tests as well as batches of them (each of whose
+    t-tests gets its own row), and the following fields:
+
+        test, sig_test, data_size, alt_hyp, t_stat, p_val, p_adj, alpha,
+        reject_null, accept_alt
+
+    where `test` is the position in `tests` of the t-test (or of its batch).
+    `p_adj` is NaN and `alpha` is NaN (no alpha) where they are not set, and
+    the decisions are the same as those of the t-tests themselves.
+
+    """
+
+    names = ('test', 'sig_test', 'data_size', 'alt_hyp', 't_stat', 'p_val',
+             'p_adj', 'alpha', 'reject_null', 'accept_alt')
+    dtypes = ('i8', None, 'i8', None, 'f8', 'f8', 'f8', 'f8', '?', '?')
+
+    columns = [[] for _ in names[:8]]
+
+    for i, test in enumerate(tests):
+        if isinstance(test, ttest_batch):
+            count, sig_test = len(test), test.sig_test
+            size, t_stat, p_val = test.n, test.t_stat, test.p_val
+
+        else:
+            count, sig_test = 1, test.sig_test()
+            size, t_stat, p_val = [test.size], [test.t_stat], [test.p_val]
+
+        p_adj = test.p_adj if test.correction is not None else np.nan
+        alpha = test.alpha if test.alpha else np.nan
+
+        columns[0].append(np.full(count, i))
+        columns[1].extend([sig_test] * count)
+        columns[2].append(np.asarray(size))
+        columns[3].extend(np.broadcast_to(test.alt_hyp, (count,)))
+        columns[4].append(np.asarray(t_stat, dtype=float))
+        columns[5].append(np.asarray(p_val, dtype=float))
+        columns[6].append(np.broadcast_to(p_adj, (count,)))
+        columns[7].append(np.full(count, alpha))
+
+    for k in (0, 2, 4, 5, 6, 7):
+        columns[k] = np.concatenate(columns[k]) if columns[k] else \
+            np.empty(0)
+
+    t_stat, alt_hyp = columns[4], np.asarray(columns[3], dtype=str)
+
+    # The same decisions as `ttest.decisions`, with an alpha per t-test,
+    # NaN standing for no alpha.
+    p_val = np.where(np.isnan(columns[6]), columns[5], columns[6])
+    reject_null = (p_val < columns[7]) & (p_val != 0)
+    accept_alt = reject_null & ((alt_hyp == 'unequal') |
+                                ((alt_hyp == 'less') & (t_stat < 0)) |
+                                ((alt_hyp == 'greater') & (t_stat > 0)))
+
+    return table(columns + [reject_null, accept_alt], names, dtypes)
+
+
+def to_parquet(table, filename):
+    """
+
+    Writes out the structured array `table` into the Parquet file `filename`,
+    with one column per field. Throws an ImportError if pyarrow is not
+    installed.
+
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+
+    except ImportError:
+        raise ImportError("Exporting a table to Parquet requires pyarrow, " +
+                          "which is not installed")
+
+    names = list(table.dtype.names)
+    arrays = [pyarrow.array(table[name]) for name in names]
+
+    pyarrow.parquet.write_table(pyarrow.Table.from_arrays(arrays, names=names),
+                                filename)
@@ -1,12 +1,261 @@
-from __future__ import print_function
+from __future__ import division, print_function
 from time import localtime, strftime
-from json import dump
 
-import scipy.stats as stats
+import numpy as np
+from .blocks import block_bounds, is_mapped, open_mapped, read_block
+from .instrument import clock
+from .multitest import adjust_p_values, check_correction
+from .pvalues import t_two_sided
+from .resampling import resampled_p_value
+from .serialize import default_filename, dump
+
+
+def sample_stats(a, axis=-1, lengths=None):
+    """
+
+    Computes the size, mean, and (unbiased) variance of each of the samples
+    in `a` in a vectorized manner. Returns the three statistics as arrays.
+
+    Parameters
+    ----------
+    a : array_like or sequence of array_like
+        The samples of observations. If `a` is a matrix, its slices along
+        `axis` are considered to be the samples. If `a` is a sequence of
+        arrays of different lengths, each array is considered to be a sample.
+        If `lengths` is passed in, `a` is considered to be the concatenation
+        of the samples, whose lengths are given by `lengths`.
+
+    axis : int, optional
+        The axis of `a` along which the observations of each sample lie.
+        This is ignored if the samples have different lengths.
+
+    lengths : array_like, optional
+        The lengths of the samples concatenated in `a`.
+
+    """
+
+    if lengths is None and isinstance(a, (list, tuple)) and \
+       len(set(len(sample) for sample in a)) > 1:
+        lengths = [len(sample) for sample in a]
+        a = np.concatenate(a)
+
+    if lengths is None:
+        a = np.asarray(a, dtype=float)
+
+        n = np.full(np.delete(a.shape, axis), a.shape[axis])
+        mean = a.mean(axis=axis)
+        var = a.var(axis=axis, ddof=1)
+
+        return n, mean, var
+
+    a = np.asarray(a, dtype=float)
+    n = np.asarray(lengths)
+
+    if np.any(n < 1) or n.sum() != len(a):
+        raise ValueError("Invalid sample lengths. Expected positive " +
+                         "lengths adding up to the number of observations " +
+                         "(" + str(len(a)) + ")")
+
+    # The samples are contiguous segments of `a`, so their sums
+    # can all be computed at once with a single reduction.
+    starts = np.concatenate(([0], np.cumsum(n)[:-1]))
+    mean = np.add.reduceat(a, starts) / n
+
+    dev = a - np.repeat(mean, n)
+    var = np.add.reduceat(dev * dev, starts) / (n - 1)
+
+    return n, mean, var
+
+
+def data_stats(a, b=None):
+    """
+
+    Computes the size, mean, and (unbiased) variance of the sample `a`, or
+    of the differences `a - b` if `b` is passed in. Memory-mapped samples are
+    read in blocks whose statistics are merged (see the `blocks` module), so
+    they are never copied into memory as a whole.
+
+    """
+
+    if not (is_mapped(a) or is_mapped(b)):
+        a = np.asarray(a, dtype=float)
+
+        if b is not None:
+            a = a - np.asarray(b, dtype=float)
+
+        return len(a), a.mean(axis=0), a.var(axis=0, ddof=1)
+
+    acc = running_stats()
+    row_bytes = 8 if b is None else 16
+
+    for start, stop in block_bounds(len(a), row_bytes):
+        block = read_block(a, start, stop)
+
+        if b is not None:
+            block = block - read_block(b, start, stop)
+
+        acc.update(block)
+
+    return acc.n, acc.mean, acc.var
+
+
+def ttest_1samp_stats(n, mean, var, popmean):
+    """
+
+    Computes the t-statistics and degrees of freedom of 1-sample t-tests from
+    the sizes, means, and variances of the samples. Returns both as arrays.
+
+    """
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = (mean - popmean) / np.sqrt(var / n)
+
+    return t_stat, n - 1.0
+
+
+def ttest_ind_stats(n1, mean1, var1, n2, mean2, var2, equal_var=True):
+    """
+
+    Computes the t-statistics and degrees of freedom of independent 2-sample
+    t-tests from the sizes, means, and variances of the samples. If the
+    variances are not assumed to be equal, Welch's t-test is performed.
+    Returns both as arrays.
+
+    """
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if equal_var:
+            df = n1 + n2 - 2.0
+            svar = ((n1 - 1) * var1 + (n2 - 1) * var2) / df
+            denom = np.sqrt(svar * (1.0 / n1 + 1.0 / n2))
+
+        else:
+            vn1 = var1 / n1
+            vn2 = var2 / n2
+            df = np.square(vn1 + vn2) / (np.square(vn1) / (n1 - 1) +
+                                         np.square(vn2) / (n2 - 1))
+            denom = np.sqrt(vn1 + vn2)
+
+        t_stat = (mean1 - mean2) / denom
+
+    return t_stat, df
+
+
+def p_values(t_stat, df, alt_hyp):
+    """
+
+    Computes the p-values of t-tests from their t-statistics and degrees of
+    freedom. As with the single t-test classes, the two-sided p-value is
+    halved whenever the alternative hypothesis is not 'unequal'.
+
+    """
+
+    p_val = t_two_sided(t_stat, df)
+
+    return np.where(alt_hyp == 'unequal', p_val, p_val / 2.0)
+
+
+def decisions(t_stat, p_val, alt_hyp, alpha):
+    """
+
+    Determines whether the null hypothesis can be rejected and whether the
+    alternative hypothesis can be accepted for each of a batch of t-tests,
+    following the same logic as the single t-test classes. Returns both
+    decisions as boolean arrays.
+
+    """
+
+    if not alpha:
+        reject_null = np.zeros(np.shape(p_val), dtype=bool)
+
+    else:
+        reject_null = (p_val < alpha) & (p_val != 0)
+
+    accept_alt = reject_null & ((alt_hyp == 'unequal') |
+                                ((alt_hyp == 'less') & (t_stat < 0)) |
+                                ((alt_hyp == 'greater') & (t_stat > 0)))
+
+    return reject_null, accept_alt
+
+
+def draw_1samp(rng, size, method, a, popmean):
+    """
+
+    Returns the t-statistics of `size` resamples of the observations `a`
+    drawn with the generator `rng` under the null hypothesis of a 1-sample
+    t-test, i.e. that their mean is `popmean`. With the 'permutation' method,
+    the signs of the deviations of the observations from `popmean` are
+    flipped at random, which assumes that their distribution is symmetric.
+    With the 'bootstrap' method, the observations shifted to have a mean
+    of `popmean` are drawn with replacement.
+
+    """
+
+    n = len(a)
+
+    if method == 'permutation':
+        x = (a - popmean) * rng.choice((-1.0, 1.0), size=(size, n)) + popmean
+
+    else:
+        x = (a - a.mean() + popmean)[rng.integers(0, n, size=(size, n))]
+
+    return ttest_1samp_stats(n, x.mean(axis=1), x.var(axis=1, ddof=1),
+                             popmean)[0]
+
+
+def draw_ind(rng, size, method, a, b, equal_var):
+    """
+
+    Returns the t-statistics of `size` resamples of the observations `a` and
+    `b` drawn with the generator `rng` under the null hypothesis of an
+    independent 2-sample t-test. With the 'permutation' method, the pooled
+    observations are shuffled between the two samples. With the 'bootstrap'
+    method, each sample is shifted to the mean of the pooled observations
+    and drawn from with replacement.
+
+    """
+
+    n1, n2 = len(a), len(b)
+
+    if method == 'permutation':
+        x = rng.permuted(np.tile(np.concatenate((a, b)), (size, 1)), axis=1)
+        x1, x2 = x[:, :n1], x[:, n1:]
+
+    else:
+        mean = (a.sum() + b.sum()) / (n1 + n2)
+
+        x1 = (a - a.mean() + mean)[rng.integers(0, n1, size=(size, n1))]
+        x2 = (b - b.mean() + mean)[rng.integers(0, n2, size=(size, n2))]
+
+    return ttest_ind_stats(n1, x1.mean(axis=1), x1.var(axis=1, ddof=1),
+                           n2, x2.mean(axis=1), x2.var(axis=1, ddof=1),
+                           equal_var=equal_var)[0]
+
+
+def resample(test, draw, args):
+    """
+
+    Computes the p-value of the t-test `test` from the t-statistics of
+    resamples drawn by `draw` (see the `resampling` module) and saves it as
+    an attribute of `test`, along with the number of resamples drawn. Note
+    that this function is only meant to be called by the t-test classes.
+
+    """
+
+    test.p_val, test.resamples = resampled_p_value(
+        draw, (test.method,) + args, test.t_stat, test.size,
+        alt_hyp=test.alt_hyp, alpha=test.alpha,
+        n_resamples=test.n_resamples, seed=test.seed, workers=test.workers)
 
 
 class ttest_1samp(object):
-    def __init__(self, a, popmean, alt_hyp='unequal', alpha=None):
+    __slots__ = ('a', 'size', 'mean', 'var', 'popmean', 'alt_hyp', 'alpha',
+                 'method', 'n_resamples', 'seed', 'workers', 'resamples',
+                 't_stat', 'p_val', 'correction', 'p_adj')
+
+    def __init__(self, a, popmean, alt_hyp='unequal', alpha=None,
+                 keep_data=True, method='t', n_resamples=9999, seed=None,
+                 workers=1):
         """
 
         Initializes a 1-sample t-test for the mean of ONE group of observations.
@@ -14,7 +263,9 @@ class ttest_1samp(object):
         Parameters
         ----------
         a : array_like
-            An array-like object of observations
+            An array-like object of observations. A `numpy.memmap` or the
+            path to a .npy file can also be passed in, in which case the
+            observations are read in blocks instead of all at once.
 
         popmean : float
             The expected value of the mean in the null hypothesis, which is
@@ -34,17 +285,101 @@ class ttest_1samp(object):
             which we can feel comfortable rejecting the null hypothesis. Note
             that this does not mean that we can accept the alternative hypothesis.
 
+        keep_data : bool, optional
+            Indicates whether a reference to `a` should be kept (True) or
+            dropped (False) once the t-test is performed. The results of the
+            t-test remain available either way, and it can be performed again
+            from the size, mean, and variance of `a`, unless `method` is not
+            't'. The default is 'True'.
+
+        method : string, optional
+            How the p-value is computed. Allowed options are 't', 'permutation',
+            and 'bootstrap'. 't' compares the t-statistic to Student's
+            t-distribution. 'permutation' and 'bootstrap' compare it to the
+            t-statistics of resamples of `a` drawn under the null hypothesis
+            (see `draw_1samp`), which does not assume that the observations
+            are normally distributed. The default is 't'.
+
+        n_resamples : int, optional
+            The maximum number of resamples drawn when `method` is not 't'.
+            If `alpha` is set, the resampling stops early once a confidence
+            interval for the p-value lies entirely on one side of `alpha`.
+            The default is 9999.
+
+        seed : int, optional
+            The seed from which the random number generators of the resamples
+            are spawned, which makes the p-value reproducible.
+
+        workers : int, optional
+            The number of worker processes among which the resamples are
+            spread. The default is 1, i.e. no worker processes.
+
+        """
+
+        self.a = open_mapped(a)
+        self.size = len(self.a)
+        self.popmean = popmean
+
+        self.alt_hyp = alt_hyp
+        self.alpha = alpha
+
+        self.method = method
+        self.n_resamples = n_resamples
+        self.seed = seed
+        self.workers = workers
+        self.resamples = None
+        self.correction = self.p_adj = None
+
+        self.check_params()
+        self.test()
+
+        if not keep_data:
+            self.a = None
+
+    @classmethod
+    def from_stats(cls, mean, var, n, popmean, alt_hyp='unequal', alpha=None):
+        """
+
+        Initializes a 1-sample t-test for the mean of ONE group of observations
+        from the size, mean, and variance of the group instead of the actual
+        observations, which are then not needed at all.
+
+        Parameters
+        ----------
+        mean : float
+            The mean of the observations.
+
+        var : float
+            The (unbiased) sample variance of the observations, i.e. with
+            `n - 1` degrees of freedom.
+
+        n : int
+            The number of observations.
+
+        popmean, alt_hyp, alpha :
+            See the __init__ method.
+
         """
 
-        self.a = a
+        self = cls.__new__(cls)
+
+        self.a = None
+        self.size = n
+        self.mean, self.var = mean, var
         self.popmean = popmean
 
         self.alt_hyp = alt_hyp
         self.alpha = alpha
 
+        self.method = 't'
+        self.n_resamples = self.seed = self.workers = self.resamples = None
+        self.correction = self.p_adj = None
+
         self.check_params()
         self.test()
 
+        return self
+
     def check_params(self):
         """
 
@@ -60,6 +395,16 @@ class ttest_1samp(object):
                              "Expected 'less', 'unequal', or 'greater' " +
                              "but got: '" + self.alt_hyp + "'")
 
+        if self.method not in ('t', 'permutation', 'bootstrap'):
+            raise ValueError("Invalid method. " +
+                             "Expected 't', 'permutation', or 'bootstrap' " +
+                             "but got: '" + str(self.method) + "'")
+
+        if self.workers is not None and not self.workers >= 1:
+            raise ValueError("Invalid number of workers. " +
+                             "Expected a positive integer " +
+                             "but got: " + str(self.workers))
+
         if self.alpha:
             if type(self.alpha) not in (int, float):
                 raise ValueError("Invalid alpha data type. " +
@@ -79,10 +424,54 @@ class ttest_1samp(object):
 
         """
 
-        self.t_stat, self.p_val = stats.ttest_1samp(self.a, self.popmean)
+        stages = clock('ttest_1samp.test')
+
+        if self.a is None:
+            if self.method != 't':
+                raise ValueError("The t-test cannot be performed again " +
+                                 "with method '" + self.method + "' " +
+                                 "because its observations were dropped " +
+                                 "(keep_data=False)")
+
+            n, mean, var = self.size, self.mean, self.var
+
+        else:
+            n, mean, var = data_stats(self.a)
+
+            # Kept so that the t-test can be performed again from the
+            # statistics alone once the observations are dropped.
+            self.mean, self.var = mean, var
+
+        self.t_stat, df = ttest_1samp_stats(n, mean, var, self.popmean)
+        stages.lap('stats')
+
+        if self.method != 't':
+            resample(self, draw_1samp, (np.asarray(self.a, dtype=float),
+                                        self.popmean))
+            stages.lap('resample')
+
+        else:
+            self.p_val = t_two_sided(self.t_stat, df)
+
+            if self.alt_hyp != 'unequal':
+                self.p_val /= 2.0
+
+            stages.lap('p_value')
+
+        stages.done(size=self.size, method=self.method)
+
+    def sig_test(self):
+        """
+
+        Returns the name of the significance test performed, which depends on
+        how the p-value is computed.
+
+        """
+
+        if self.method == 't':
+            return "T-Test"
 
-        if self.alt_hyp != 'unequal':
-            self.p_val /= 2.0
+        return self.method.capitalize() + " T-Test"
 
     def summary(self):
         """
@@ -94,7 +483,7 @@ class ttest_1samp(object):
         """
 
         t = localtime()
-        size = len(self.a)
+        size = self.size
 
         assumptions = '   Independent Observations'
 
@@ -112,7 +501,7 @@ class ttest_1samp(object):
                 alternative = "Mean 1 > " + str(self.popmean)
 
         print("\n==============================================================================")
-        print("Significance Test: T-Test (" + sided + ")")
+        print("Significance Test: " + self.sig_test() + " (" + sided + ")")
         print("Date:", strftime("%a, %d %b %Y", t))
         print("Time:", strftime("%H:%M:%S", t))
 
@@ -127,16 +516,27 @@ class ttest_1samp(object):
 
         print("\nT-Statistic:", str(self.t_stat))
         print("P-Value:", str(self.p_val))
+
+        if self.correction is not None:
+            print("Adjusted P-Value (" + self.correction + "):",
+                  str(self.p_adj))
+
+        if self.method != 't':
+            print("Resamples:", str(self.resamples))
         print("Alpha:", str(self.alpha))
 
+        # The decision is based on the adjusted p-value if the t-test
+        # was corrected for multiple testing (see `ttest_results`).
+        p_val = self.p_val if self.correction is None else self.p_adj
+
         NULL = "\nReject Null Hypothesis: "
         ALT = "Accept Alternative Hypothesis: "
 
         YES = "Yes"
         NO = "No"
 
-        if (self.alpha and self.p_val >= self.alpha) or \
-           self.p_val == 0 or not self.alpha:
+        if (self.alpha and p_val >= self.alpha) or \
+           p_val == 0 or not self.alpha:
             print(NULL + NO)
             print(ALT + NO)
 
@@ -153,24 +553,16 @@ class ttest_1samp(object):
 
         print("==============================================================================")
 
-    def to_file(self, filename=None):
+    def to_dict(self):
         """
 
-        Summarizes the results of the t-test performed and saves the results
-        out into `filename`.
-
-        Parameters
-        ----------
-
-        filename : string, optional
-            The location of the file where the results will be stored. If no
-            filename is provided, a default filename will be generated, and the
-            results will be stored there.
+        Summarizes the results of the t-test performed and returns them as a
+        dictionary, which is what `to_file` saves out.
 
         """
 
         t = localtime()
-        size = len(self.a)
+        size = self.size
 
         assumptions = ['Independent Observations']
 
@@ -189,7 +581,7 @@ class ttest_1samp(object):
 
         data = {}
 
-        data['sig_test'] = "T-Test (" + sided + ")"
+        data['sig_test'] = self.sig_test() + " (" + sided + ")"
         data['date'] = strftime("%a, %d %b %Y", t)
         data['time'] = strftime("%H:%M:%S", t)
         data['assumptions'] = assumptions
@@ -197,13 +589,21 @@ class ttest_1samp(object):
         data['data_size'] = size
         data['pop_mean'] = self.popmean
 
-        data['null_hyp'] = "Mean 1 ==", self.popmean
+        data['null_hyp'] = "Mean 1 == " + str(self.popmean)
         data['alt_hyp'] = alternative
         data['t_stat'] = self.t_stat
         data['p_val'] = self.p_val
 
-        if (self.alpha and self.p_val >= self.alpha) or \
-           self.p_val == 0 or not self.alpha:
+        data['method'] = self.method
+        data['resamples'] = self.resamples
+
+        data['correction'] = self.correction
+        data['p_adj'] = self.p_adj
+
+        p_val = self.p_val if self.correction is None else self.p_adj
+
+        if (self.alpha and p_val >= self.alpha) or \
+           p_val == 0 or not self.alpha:
             data['reject_null'] = False
             data['accept_alt'] = False
 
@@ -218,13 +618,33 @@ class ttest_1samp(object):
             else:
                 data['accept_alt'] = False
 
-        filename = filename or strftime("%a_%d_%b_%Y_%H_%M_%S.json", t)
+        return data
+
+    def to_file(self, filename=None, format='json'):
+        """
+
+        Summarizes the results of the t-test performed and saves the results
+        out into `filename`.
+
+        Parameters
+        ----------
+
+        filename : string, optional
+            The location of the file where the results will be stored. If no
+            filename is provided, a default filename will be generated, and the
+            results will be stored there.
+
+        format : string, optional
+            The format of the file. Allowed options are 'json' and 'npz', the
+            latter being NumPy's binary format (see the `serialize` module).
+            The default is 'json'.
+
+        """
 
-        with open(filename, 'w') as target:
-            dump(data, target)
+        dump(self.to_dict(), filename or default_filename(format), format)
 
     def __str__(self):
-        return "1-Sample T-Test on Data of Size " + str(len(self.a)) + \
+        return "1-Sample T-Test on Data of Size " + str(self.size) + \
                ", Hypothesized Population Mean of " + str(self.popmean)
 
     __repr__ = __str__
@@ -232,8 +652,14 @@ class ttest_1samp(object):
     __unicode__ = __str__
 
 class ttest_2samp(object):
+    __slots__ = ('a', 'b', 'size', 'mean1', 'var1', 'n1', 'mean2', 'var2',
+                 'n2', 'test_type', 'equal_var', 'alt_hyp', 'alpha',
+                 'method', 'n_resamples', 'seed', 'workers', 'resamples',
+                 't_stat', 'p_val', 'correction', 'p_adj')
+
     def __init__(self, a, b, test_type='ind', equal_var=True,
-                 alt_hyp='unequal', alpha=None):
+                 alt_hyp='unequal', alpha=None, keep_data=True, method='t',
+                 n_resamples=9999, seed=None, workers=1):
         """
 
         Initializes a 2-sample t-test for the means of TWO groups of observations.
@@ -242,6 +668,8 @@ class ttest_2samp(object):
         ----------
         a, b: array_like
             Array-like objects of observations. They must have the same length.
+            As with `ttest_1samp`, memory-mapped arrays or paths to .npy files
+            can also be passed in.
 
         test_type : string, optional
             The type of 2-sample t-test that is to be performed on the samples.
@@ -269,10 +697,41 @@ class ttest_2samp(object):
             is that the mean of `a` is equal to the mean of `b`. Note that this
             does not mean that we can accept the alternative hypothesis.
 
+        keep_data : bool, optional
+            Indicates whether references to `a` and `b` should be kept (True)
+            or dropped (False) once the t-test is performed. The results of
+            the t-test remain available either way, and an independent t-test
+            can be performed again from the sizes, means, and variances of
+            `a` and `b`, unless `method` is not 't'. The default is 'True'.
+
+        method : string, optional
+            How the p-value is computed. Allowed options are 't', 'permutation',
+            and 'bootstrap'. 't' compares the t-statistic to Student's
+            t-distribution. 'permutation' and 'bootstrap' compare it to the
+            t-statistics of resamples of `a` and `b` drawn under the null
+            hypothesis (see `draw_ind`, and `draw_1samp` for the differences
+            of related samples), which does not assume that the observations
+            are normally distributed. The default is 't'.
+
+        n_resamples : int, optional
+            The maximum number of resamples drawn when `method` is not 't'.
+            If `alpha` is set, the resampling stops early once a confidence
+            interval for the p-value lies entirely on one side of `alpha`.
+            The default is 9999.
+
+        seed : int, optional
+            The seed from which the random number generators of the resamples
+            are spawned, which makes the p-value reproducible.
+
+        workers : int, optional
+            The number of worker processes among which the resamples are
+            spread. The default is 1, i.e. no worker processes.
+
         """
 
-        self.a = a
-        self.b = b
+        self.a = open_mapped(a)
+        self.b = open_mapped(b)
+        self.size = len(self.a)
 
         self.test_type = test_type
 
@@ -280,9 +739,68 @@ class ttest_2samp(object):
         self.alt_hyp = alt_hyp
         self.alpha = alpha
 
+        self.method = method
+        self.n_resamples = n_resamples
+        self.seed = seed
+        self.workers = workers
+        self.resamples = None
+        self.correction = self.p_adj = None
+
+        self.check_params()
+        self.test()
+
+        if not keep_data:
+            self.a = self.b = None
+
+    @classmethod
+    def from_stats(cls, mean1, var1, n1, mean2, var2, n2, equal_var=True,
+                   alt_hyp='unequal', alpha=None):
+        """
+
+        Initializes an independent 2-sample t-test for the means of TWO groups
+        of observations from the sizes, means, and variances of the groups
+        instead of the actual observations, which are then not needed at all.
+        Note that a related 2-sample t-test cannot be performed this way.
+
+        Parameters
+        ----------
+        mean1, mean2 : float
+            The means of the two groups of observations.
+
+        var1, var2 : float
+            The (unbiased) sample variances of the two groups of observations,
+            i.e. with `n1 - 1` and `n2 - 1` degrees of freedom.
+
+        n1, n2 : int
+            The number of observations in each group.
+
+        equal_var, alt_hyp, alpha :
+            See the __init__ method.
+
+        """
+
+        self = cls.__new__(cls)
+
+        self.a = self.b = None
+        self.size = n1
+        self.mean1, self.var1, self.n1 = mean1, var1, n1
+        self.mean2, self.var2, self.n2 = mean2, var2, n2
+
+        self.test_type = 'ind'
+
+        self.equal_var = equal_var
+        self.alt_hyp = alt_hyp
+        self.alpha = alpha
+
+        self.method = 't'
+        self.n_resamples = self.seed = self.workers = self.resamples = None
+        self.correction = self.p_adj = None
+
         self.check_params()
         self.test()
 
+        return self
+
     def check_params(self):
         """
 
@@ -303,6 +821,16 @@ class ttest_2samp(object):
                              "Expected 'less', 'unequal', or 'greater' " +
                              "but got: '" + self.alt_hyp + "'")
 
+        if self.method not in ('t', 'permutation', 'bootstrap'):
+            raise ValueError("Invalid method. " +
+                             "Expected 't', 'permutation', or 'bootstrap' " +
+                             "but got: '" + str(self.method) + "'")
+
+        if self.workers is not None and not self.workers >= 1:
+            raise ValueError("Invalid number of workers. " +
+                             "Expected a positive integer " +
+                             "but got: " + str(self.workers))
+
         if self.alpha:
             if type(self.alpha) not in (int, float):
                 raise ValueError("Invalid alpha data type. " +
@@ -322,15 +850,72 @@ class ttest_2samp(object):
 
         """
 
-        if self.test_type == 'ind':
-            self.t_stat, self.p_val = stats.ttest_ind(self.a, self.b,
-                                                      equal_var=self.equal_var)
+        stages = clock('ttest_2samp.test')
+
+        if self.a is None:
+            if self.method != 't' or self.test_type != 'ind':
+                raise ValueError("The t-test cannot be performed again " +
+                                 "with method '" + self.method + "' and " +
+                                 "type '" + self.test_type + "' " +
+                                 "because its observations were dropped " +
+                                 "(keep_data=False)")
+
+            self.t_stat, df = ttest_ind_stats(self.n1, self.mean1, self.var1,
+                                              self.n2, self.mean2, self.var2,
+                                              equal_var=self.equal_var)
+
+        elif self.test_type == 'ind':
+            stats_a, stats_b = data_stats(self.a), data_stats(self.b)
+
+            # Kept so that the t-test can be performed again from the
+            # statistics alone once the observations are dropped.
+            self.n1, self.mean1, self.var1 = stats_a
+            self.n2, self.mean2, self.var2 = stats_b
+
+            self.t_stat, df = ttest_ind_stats(*(stats_a + stats_b),
+                                              equal_var=self.equal_var)
 
         else:
-            self.t_stat, self.p_val = stats.ttest_rel(self.a, self.b)
+            n, mean, var = data_stats(self.a, self.b)
+            self.t_stat, df = ttest_1samp_stats(n, mean, var, 0.0)
 
-        if self.alt_hyp != 'unequal':
-            self.p_val /= 2.0
+        stages.lap('stats')
+
+        if self.method != 't':
+            a = np.asarray(self.a, dtype=float)
+            b = np.asarray(self.b, dtype=float)
+
+            if self.test_type == 'ind':
+                resample(self, draw_ind, (a, b, self.equal_var))
+
+            else:
+                resample(self, draw_1samp, (a - b, 0.0))
+
+            stages.lap('resample')
+
+        else:
+            self.p_val = t_two_sided(self.t_stat, df)
+
+            if self.alt_hyp != 'unequal':
+                self.p_val /= 2.0
+
+            stages.lap('p_value')
+
+        stages.done(size=self.size, method=self.method,
+                    test_type=self.test_type)
+
+    def sig_test(self):
+        """
+
+        Returns the name of the significance test performed, which depends on
+        how the p-value is computed.
+
+        """
+
+        if self.method == 't':
+            return "T-Test"
+
+        return self.method.capitalize() + " T-Test"
 
     def summary(self):
         """
@@ -342,7 +927,7 @@ class ttest_2samp(object):
         """
 
         t = localtime()
-        size = len(self.a)
+        size = self.size
 
         if self.test_type == 'ind':
             assumptions = '   Independent Samples'
@@ -366,7 +951,7 @@ class ttest_2samp(object):
                 alternative = "Mean 1 > Mean 2"
 
         print("\n==============================================================================")
-        print("Significance Test: T-Test (" + sided + ")")
+        print("Significance Test: " + self.sig_test() + " (" + sided + ")")
         print("Date:", strftime("%a, %d %b %Y", t))
         print("Time:", strftime("%H:%M:%S", t))
 
@@ -380,16 +965,27 @@ class ttest_2samp(object):
 
         print("\nT-Statistic:", str(self.t_stat))
         print("P-Value:", str(self.p_val))
+
+        if self.correction is not None:
+            print("Adjusted P-Value (" + self.correction + "):",
+                  str(self.p_adj))
+
+        if self.method != 't':
+            print("Resamples:", str(self.resamples))
         print("Alpha:", str(self.alpha))
 
+        # The decision is based on the adjusted p-value if the t-test
+        # was corrected for multiple testing (see `ttest_results`).
+        p_val = self.p_val if self.correction is None else self.p_adj
+
         NULL = "\nReject Null Hypothesis: "
         ALT = "Accept Alternative Hypothesis: "
 
         YES = "Yes"
         NO = "No"
 
-        if (self.alpha and self.p_val >= self.alpha) or \
-           self.p_val == 0 or not self.alpha:
+        if (self.alpha and p_val >= self.alpha) or \
+           p_val == 0 or not self.alpha:
             print(NULL + NO)
             print(ALT + NO)
 
@@ -406,24 +1002,16 @@ class ttest_2samp(object):
 
         print("==============================================================================")
 
-    def to_file(self, filename=None):
+    def to_dict(self):
         """
 
-        Summarizes the results of the t-test performed and saves the results
-        out into `filename`.
-
-        Parameters
-        ----------
-
-        filename : string, optional
-            The location of the file where the results will be stored. If no
-            filename is provided, a default filename will be generated, and the
-            results will be stored there.
+        Summarizes the results of the t-test performed and returns them as a
+        dictionary, which is what `to_file` saves out.
 
         """
 
         t = localtime()
-        size = len(self.a)
+        size = self.size
 
         if self.test_type == 'ind':
             assumptions = ['Independent Samples']
@@ -448,7 +1036,7 @@ class ttest_2samp(object):
 
         data = {}
 
-        data['sig_test'] = "T-Test (" + sided + ")"
+        data['sig_test'] = self.sig_test() + " (" + sided + ")"
         data['date'] = strftime("%a, %d %b %Y", t)
         data['time'] = strftime("%H:%M:%S", t)
         data['assumptions'] = assumptions
@@ -460,8 +1048,16 @@ class ttest_2samp(object):
         data['t_stat'] = self.t_stat
         data['p_val'] = self.p_val
 
-        if (self.alpha and self.p_val >= self.alpha) or \
-           self.p_val == 0 or not self.alpha:
+        data['method'] = self.method
+        data['resamples'] = self.resamples
+
+        data['correction'] = self.correction
+        data['p_adj'] = self.p_adj
+
+        p_val = self.p_val if self.correction is None else self.p_adj
+
+        if (self.alpha and p_val >= self.alpha) or \
+           p_val == 0 or not self.alpha:
             data['reject_null'] = False
             data['accept_alt'] = False
 
@@ -476,19 +1072,621 @@ class ttest_2samp(object):
             else:
                 data['accept_alt'] = False
 
-        filename = filename or strftime("%a_%d_%b_%Y_%H_%M_%S.json", t)
+        return data
+
+    def to_file(self, filename=None, format='json'):
+        """
+
+        Summarizes the results of the t-test performed and saves the results
+        out into `filename`.
+
+        Parameters
+        ----------
+
+        filename : string, optional
+            The location of the file where the results will be stored. If no
+            filename is provided, a default filename will be generated, and the
+            results will be stored there.
+
+        format : string, optional
+            The format of the file. Allowed options are 'json' and 'npz', the
+            latter being NumPy's binary format (see the `serialize` module).
+            The default is 'json'.
+
+        """
 
-        with open(filename, 'w') as target:
-            dump(data, target)
+        dump(self.to_dict(), filename or default_filename(format), format)
 
     def __str__(self):
-        return "2-Sample T-Test on Data of Size " + str(len(self.a))
+        return "2-Sample T-Test on Data of Size " + str(self.size)
 
     __repr__ = __str__
     __bytes__ = __str__
     __unicode__ = __str__
 
+class running_stats(object):
+    __slots__ = ('n', 'mean', 'm2')
+
+    def __init__(self):
+        """
+
+        Initializes an accumulator of the size, mean, and variance of a group
+        of observations that arrive over time (e.g. as a stream of events), so
+        that t-tests can be performed on the group at any moment without
+        having to keep the observations themselves.
+
+        The accumulated statistics are stored as attributes of the instance.
+        They are as follows:
+
+        n : number of observations
+
+        mean : mean of the observations
+
+        m2 : sum of the squared deviations of the observations from the mean
+
+        """
+
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def var(self):
+        """
+
+        The (unbiased) sample variance of the observations.
+
+        """
+
+        return self.m2 / (self.n - 1) if self.n > 1 else float('nan')
+
+    def update(self, x):
+        """
+
+        Adds one observation or a chunk of observations to the accumulator.
+        Single observations are added using Welford's algorithm, while the
+        statistics of a chunk are computed in a vectorized manner and then
+        merged in (see the `merge` method). Returns itself.
+
+        Parameters
+        ----------
+        x : float or array_like
+            The observation(s) to add.
+
+        """
+
+        if np.ndim(x) == 0:
+            self.n += 1
+
+            delta = x - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (x - self.mean)
+
+            return self
+
+        x = np.ravel(x)
+
+        if len(x) == 0:
+            return self
+
+        chunk = running_stats()
+        chunk.n = len(x)
+        chunk.mean = x.mean()
+        chunk.m2 = np.square(x - chunk.mean).sum()
+
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """
+
+        Merges the statistics accumulated by `other` (e.g. on another shard of
+        the observations) into this accumulator using the pairwise update
+        formulas of Chan et al., which remain numerically stable when both
+        accumulators hold many observations. Returns itself.
+
+        """
+
+        if other.n == 0:
+            return self
+
+        n = self.n + other.n
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+        return self
+
+    def check_size(self):
+        """
+
+        Checks that enough observations have been accumulated to estimate
+        their variance, which the t-tests need. Throws a ValueError if there
+        are fewer than two of them. Note that this method is only meant to be
+        called internally to the class and not externally.
+
+        """
+
+        if self.n < 2:
+            raise ValueError("Too few observations to perform a t-test. " +
+                             "Expected at least 2 " +
+                             "but got: " + str(self.n))
+
+    def ttest_1samp(self, popmean, alt_hyp='unequal', alpha=None):
+        """
+
+        Performs a 1-sample t-test on the observations accumulated so far.
+        See `ttest_1samp` for a description of the parameters.
+
+        """
+
+        self.check_size()
+
+        return ttest_1samp.from_stats(self.mean, self.var, self.n, popmean,
+                                      alt_hyp=alt_hyp, alpha=alpha)
+
+    def ttest_2samp(self, other, equal_var=True, alt_hyp='unequal',
+                    alpha=None):
+        """
+
+        Performs an independent 2-sample t-test on the observations accumulated
+        so far by this accumulator and by `other`. See `ttest_2samp` for a
+        description of the parameters.
+
+        """
+
+        self.check_size()
+        other.check_size()
+
+        return ttest_2samp.from_stats(self.mean, self.var, self.n,
+                                      other.mean, other.var, other.n,
+                                      equal_var=equal_var, alt_hyp=alt_hyp,
+                                      alpha=alpha)
+
+    def __str__(self):
+        return "Running Statistics on " + str(self.n) + " Observations"
+
+    __repr__ = __str__
+    __bytes__ = __str__
+    __unicode__ = __str__
+
+class ttest_batch(object):
+    """
+
+    Base class for batches of t-tests, whose results are stored in columnar
+    arrays with one entry per t-test. Subclasses must set the `n`, `t_stat`,
+    `p_val`, `alt_hyp`, and `alpha` attributes in their __init__ methods.
+    The p-values can then be corrected for multiple testing with `correct`.
+
+    """
+
+    sig_test = "T-Test"
+    assumptions = ['Independent Observations']
+
+    correction = None
+    p_adj = None
+
+    def check_params(self):
+        """
+
+        Checks the validity of the `alt_hyp` and `alpha` parameters passed into
+        the __init__ method. Throws a ValueError if either parameter is found to
+        be invalid. Note that this method is only meant to be called internally
+        to the class and not externally.
+
+        """
+
+        invalid = ~np.isin(self.alt_hyp, ('less', 'unequal', 'greater'))
+
+        if np.any(invalid):
+            raise ValueError("Invalid alternative hypothesis. " +
+                             "Expected 'less', 'unequal', or 'greater' " +
+                             "but got: '" + str(self.alt_hyp[invalid][0]) +
+                             "'")
+
+        if self.alpha:
+            if type(self.alpha) not in (int, float):
+                raise ValueError("Invalid alpha data type. " +
+                                 "Expected 'int' or 'float' " +
+                                 "but got: '" + type(self.alpha).__name__ + "'")
+
+            if self.alpha < 0 or self.alpha > 1:
+                raise ValueError("Invalid alpha data value. " +
+                                 "Expected somewhere in range [0, 1] " +
+                                 "but got a value of: " + str(self.alpha))
+
+    def correct(self, correction='fdr_bh'):
+        """
+
+        Corrects the p-values of the t-tests for multiple testing, after which
+        the decisions to reject the null hypotheses are based on the adjusted
+        p-values, which are saved as the `p_adj` attribute. Returns the batch
+        itself.
+
+        Parameters
+        ----------
+        correction : string, optional
+            The correction applied. Allowed options are 'holm', 'fdr_bh', and
+            'bonferroni' (see `multitest.adjust_p_values`). The default is
+            'fdr_bh'.
+
+        """
+
+        self.p_adj = adjust_p_values(self.p_val, correction)
+        self.correction = correction
+
+        return self
+
+    def decisions(self):
+        """
+
+        Returns two boolean arrays indicating for each t-test whether the null
+        hypothesis can be rejected and whether the alternative hypothesis can
+        be accepted.
+
+        """
+
+        p_val = self.p_val if self.correction is None else self.p_adj
+
+        return decisions(self.t_stat, p_val, self.alt_hyp, self.alpha)
+
+    def summary(self):
+        """
+
+        Summarizes the results of the t-tests performed and prints the results
+        out into STDOUT, which is generally the console or terminal on which
+        the code is being executed.
+
+        """
+
+        t = localtime()
+        reject_null, accept_alt = self.decisions()
+
+        print("\n==============================================================================")
+        print("Significance Test: " + self.sig_test + " (batch of " + str(len(self)) + ")")
+        print("Date:", strftime("%a, %d %b %Y", t))
+        print("Time:", strftime("%H:%M:%S", t))
+
+        print("\nAssumptions: ")
+        print("\n".join("   " + assumption for assumption in self.assumptions))
+
+        print("\nAlpha:", str(self.alpha))
+
+        if self.correction is None:
+            p_val, header = self.p_val, "p-value     "
+
+        else:
+            print("Correction:", self.correction)
+            p_val, header = self.p_adj, "adj. p      "
+
+        print("==============================================================================")
+        print("test      size       alt. hyp.   t-statistic     " + header + "reject  accept")
+        print("==============================================================================")
+        for i in range(len(self)):
+            print("%-8d  %-9d  %-10s  % -14.6f  % -10.6f  %-6s  %-6s" % (
+                i, self.n[i], self.alt_hyp[i], self.t_stat[i], p_val[i],
+                "Yes" if reject_null[i] else "No",
+                "Yes" if accept_alt[i] else "No"))
+        print("==============================================================================")
+
+    def to_dict(self):
+        """
+
+        Summarizes the results of the t-tests performed and returns them as a
+        dictionary, which is what `to_file` saves out.
+
+        """
+
+        t = localtime()
+        reject_null, accept_alt = self.decisions()
+
+        data = {}
+
+        data['sig_test'] = self.sig_test
+        data['date'] = strftime("%a, %d %b %Y", t)
+        data['time'] = strftime("%H:%M:%S", t)
+        data['assumptions'] = self.assumptions
+        data['alpha'] = self.alpha
+
+        data['data_size'] = self.n
+        data['alt_hyp'] = self.alt_hyp
+        data['t_stat'] = self.t_stat
+        data['p_val'] = self.p_val
+
+        data['correction'] = self.correction
+        data['p_adj'] = self.p_adj
+
+        data['reject_null'] = reject_null
+        data['accept_alt'] = accept_alt
+
+        return data
+
+    def to_file(self, filename=None, format='json'):
+        """
+
+        Summarizes the results of the t-tests performed and saves the results
+        out into `filename`.
+
+        Parameters
+        ----------
+
+        filename : string, optional
+            The location of the file where the results will be stored. If no
+            filename is provided, a default filename will be generated, and the
+            results will be stored there.
+
+        format : string, optional
+            The format of the file. Allowed options are 'json' and 'npz', the
+            latter being NumPy's binary format (see the `serialize` module).
+            The default is 'json'.
+
+        """
+
+        dump(self.to_dict(), filename or default_filename(format), format)
+
+    def __len__(self):
+        return len(self.t_stat)
+
+    def __str__(self):
+        return "Batch of " + str(len(self)) + " " + self.sig_test + "s"
+
+    __repr__ = __str__
+    __bytes__ = __str__
+    __unicode__ = __str__
+
+class ttest_results(ttest_batch):
+
+    def __init__(self, tests, correction='fdr_bh', alpha=None):
+        """
+
+        Collects the results of MANY single t-tests (`ttest_1samp` and
+        `ttest_2samp` objects) into columnar arrays and corrects their
+        p-values for multiple testing. The adjusted p-values and the
+        correction are also saved on each of the t-tests, so that the
+        decisions of their `summary`, `to_dict`, and `to_file` methods agree
+        with those of the collection.
+
+        Parameters
+        ----------
+        tests : sequence of ttest_1samp or ttest_2samp
+            The t-tests, which are all considered to be one family of tests.
+
+        correction : string, optional
+            The correction applied. Allowed options are 'holm', 'fdr_bh', and
+            'bonferroni' (see `multitest.adjust_p_values`). The default is
+            'fdr_bh'.
+
+        alpha : float, optional
+            The cutoff value for the adjusted p-values below which we can feel
+            comfortable rejecting the null hypotheses, which then replaces the
+            `alpha` of each of the t-tests. If it is not provided, the t-tests
+            must all have the same `alpha`, which is used instead.
+
+        """
+
+        self.tests = list(tests)
+
+        if alpha is None:
+            alphas = set(test.alpha for test in self.tests)
+
+            if len(alphas) > 1:
+                raise ValueError("The t-tests have different alphas, so " +
+                                 "an alpha for all of them must be passed in")
+
+            alpha = alphas.pop() if alphas else None
+
+        self.n = np.array([test.size for test in self.tests], dtype=int)
+        self.t_stat = np.array([test.t_stat for test in self.tests],
+                               dtype=float)
+        self.p_val = np.array([test.p_val for test in self.tests],
+                              dtype=float)
+        self.alt_hyp = np.array([test.alt_hyp for test in self.tests],
+                                dtype=str)
+        self.alpha = alpha
+
+        check_correction(correction)
+        self.check_params()
+        self.correct(correction)
+
+    def correct(self, correction='fdr_bh'):
+        """
+
+        Corrects the p-values of the t-tests for multiple testing as for any
+        batch of t-tests (see `ttest_batch.correct`), and saves the adjusted
+        p-values, the correction, and the alpha of the collection on each of
+        the t-tests. Returns the collection itself.
+
+        """
+
+        ttest_batch.correct(self, correction)
+
+        for test, p_adj in zip(self.tests, self.p_adj):
+            test.alpha = self.alpha
+            test.correction = correction
+            test.p_adj = float(p_adj)
+
+        return self
+
+    def __getitem__(self, i):
+        return self.tests[i]
+
+    def __str__(self):
+        return "Collection of " + str(len(self)) + " T-Tests (" + \
+               self.correction + " correction)"
+
+    __repr__ = __str__
+    __bytes__ = __str__
+    __unicode__ = __str__
+
+class ttest_1samp_batch(ttest_batch):
+    sig_test = "1-Sample T-Test"
+
+    def __init__(self, a, popmean, alt_hyp='unequal', alpha=None,
+                 axis=-1, lengths=None):
+        """
+
+        Initializes a batch of 1-sample t-tests for the means of MANY groups
+        of observations, which are all performed at once in a vectorized manner.
+
+        Parameters
+        ----------
+        a : array_like or sequence of array_like
+            The groups of observations. If `a` is a matrix, each of its slices
+            along `axis` is considered to be a group (by default, each row). A
+            sequence of arrays of different lengths can also be passed in, as
+            can the concatenation of the groups along with their `lengths`.
+
+        popmean : float or array_like
+            The expected value of the mean in the null hypothesis, either for
+            all of the groups or for each group separately.
+
+        alt_hyp : string or array_like, optional
+            The alternative hypothesis, either for all of the groups or for
+            each group separately. See `ttest_1samp` for the allowed options.
+            The default is 'unequal'.
+
+        alpha : float, optional
+            The cutoff value for the p-values computed during the t-tests below
+            which we can feel comfortable rejecting the null hypotheses.
+
+        axis : int, optional
+            The axis of `a` along which the observations of each group lie.
+            The default is -1.
+
+        lengths : array_like, optional
+            The lengths of the groups if `a` is their concatenation.
+
+        """
+
+        self.n, self.mean, self.var = sample_stats(a, axis=axis,
+                                                   lengths=lengths)
+        self.popmean = popmean
+
+        self.alt_hyp = np.broadcast_to(np.asarray(alt_hyp), self.n.shape)
+        self.alpha = alpha
+
+        self.check_params()
+        self.test()
+
+    def test(self):
+        """
+
+        Performs the actual t-tests and saves the computed t-statistics and
+        p-values as attributes of the class instance.
+
+        """
+
+        self.t_stat, self.df = ttest_1samp_stats(self.n, self.mean, self.var,
+                                                 self.popmean)
+        self.p_val = p_values(self.t_stat, self.df, self.alt_hyp)
+
+class ttest_2samp_batch(ttest_batch):
+    sig_test = "2-Sample T-Test"
+
+    def __init__(self, a, b, test_type='ind', equal_var=True,
+                 alt_hyp='unequal', alpha=None, axis=-1,
+                 lengths_a=None, lengths_b=None):
+        """
+
+        Initializes a batch of 2-sample t-tests for the means of MANY pairs of
+        groups of observations, which are all performed at once in a vectorized
+        manner.
+
+        Parameters
+        ----------
+        a, b : array_like or sequence of array_like
+            The groups of observations, which are paired up in order. If they
+            are matrices, each of their slices along `axis` is considered to be
+            a group (by default, each row). Sequences of arrays of different
+            lengths can also be passed in, as can the concatenations of the
+            groups along with their lengths (see `lengths_a` and `lengths_b`).
+
+        test_type : string, optional
+            The type of 2-sample t-tests to be performed. See `ttest_2samp`
+            for the allowed options. The default is 'ind'. For 'rel', the
+            paired groups must have the same lengths.
+
+        equal_var : bool, optional
+            Indicates whether the populations the paired groups are drawn from
+            have equal variances (True) or not (False). The default is 'True'.
+
+        alt_hyp : string or array_like, optional
+            The alternative hypothesis, either for all of the pairs or for each
+            pair separately. See `ttest_2samp` for the allowed options. The
+            default is 'unequal'.
+
+        alpha : float, optional
+            The cutoff value for the p-values computed during the t-tests below
+            which we can feel comfortable rejecting the null hypotheses.
+
+        axis : int, optional
+            The axis of `a` and `b` along which the observations of each group
+            lie. The default is -1.
+
+        lengths_a, lengths_b : array_like, optional
+            The lengths of the groups if `a` and `b` are their concatenations.
+
+        """
+
+        self.test_type = test_type
+        self.equal_var = equal_var
+
+        if self.test_type not in ('ind', 'rel'):
+            raise ValueError("Invalid t-test type. " +
+                             "Expected 'ind' or 'rel' " +
+                             "but got: '" + str(self.test_type) + "'")
+
+        if self.test_type == 'rel':
+            if isinstance(a, (list, tuple)):
+                diffs = [np.subtract(x, y) for x, y in zip(a, b)]
+
+            else:
+                diffs = np.subtract(a, b)
+
+            self.n, self.mean, self.var = sample_stats(diffs, axis=axis,
+                                                       lengths=lengths_a)
+            self.assumptions = ['Related Samples']
+
+        else:
+            self.n, self.mean, self.var = sample_stats(a, axis=axis,
+                                                       lengths=lengths_a)
+            self.n_b, self.mean_b, self.var_b = sample_stats(b, axis=axis,
+                                                             lengths=lengths_b)
+            self.assumptions = ['Independent Samples']
+
+            if self.equal_var:
+                self.assumptions = self.assumptions + ['Equal Variances']
+
+        self.alt_hyp = np.broadcast_to(np.asarray(alt_hyp), self.n.shape)
+        self.alpha = alpha
+
+        self.check_params()
+        self.test()
+
+    def test(self):
+        """
+
+        Performs the actual t-tests and saves the computed t-statistics and
+        p-values as attributes of the class instance.
+
+        """
+
+        if self.test_type == 'ind':
+            self.t_stat, self.df = ttest_ind_stats(self.n, self.mean, self.var,
+                                                   self.n_b, self.mean_b,
+                                                   self.var_b,
+                                                   equal_var=self.equal_var)
+
+        else:
+            self.t_stat, self.df = ttest_1samp_stats(self.n, self.mean,
+                                                     self.var, 0.0)
+
+        self.p_val = p_values(self.t_stat, self.df, self.alt_hyp)
+
 if __name__ == '__main__':
+    # The modules use relative imports, so the demo is run as a module
+    # from the root of the repository: python -m wrappers.ttest
     from numpy import array
 
     a = array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])